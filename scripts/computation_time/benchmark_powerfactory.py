@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+from statistics import median
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+from powerfactory_automation import PowerFactorySession, fake_powerfactory
+from powerfactory_automation.benchmark import (
+    benchmark_scenario,
+    environment_metadata,
+    load_benchmark_definition,
+    run_benchmark,
+    write_benchmark_results,
+    write_metadata,
+)
+from powerfactory_automation.ieee39_exports import benchmark_export_data
+
+# Times the scenarios of benchmark_scenarios.json with PowerFactory.
+# benchmark_rmspowersims.jl times the same scenarios with RMSPowerSims.jl, and
+# benchmark_report.py summarises both.
+#
+# Initialisation (ComInc) is timed separately from integration (ComSim).
+
+# input options
+use_fake_engine = False  # run against fake_powerfactory, i.e. to test the harness
+definition_path = Path(__file__).parent / "benchmark_scenarios.json"
+package_dir = Path(__file__).parent.parent.parent
+output_dir = package_dir / "data" / "computation_time_results"
+
+if __name__ == "__main__":
+    definition = load_benchmark_definition(definition_path)
+    app = fake_powerfactory.reset() if use_fake_engine else None
+    session = PowerFactorySession(app)
+    results_file = session.results_file("results_benchmark", benchmark_export_data)
+
+    rows = []
+    for scenario_name in definition["scenarios"]:
+        for mode in definition["modes"]:
+            scenario = benchmark_scenario(definition, scenario_name, mode)
+            timings = run_benchmark(
+                session, scenario, results_file, definition["n_runs"], definition["n_warmup"]
+            )
+            for i, run_timings in enumerate(timings, start=1):
+                rows.append(
+                    {
+                        "engine": "powerfactory",
+                        "scenario": scenario_name,
+                        "mode": mode,
+                        "run": i,
+                        "initialisation": run_timings["initialisation"],
+                        "simulation": run_timings["simulation"],
+                    }
+                )
+            t_sim = median(run_timings["simulation"] for run_timings in timings)
+            session.print_info(f"{scenario_name} ({mode}): median simulation time {t_sim:.4f} s")
+
+    write_benchmark_results(output_dir / "benchmark_powerfactory.csv", rows)
+    write_metadata(output_dir / "benchmark_powerfactory_metadata.json", environment_metadata(session))
@@ -0,0 +1,169 @@
+import csv
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+
+# Summarises the results of benchmark_rmspowersims.jl and benchmark_powerfactory.py.
+#
+# For each engine, scenario, mode and timing the median, interquartile range and a
+# bootstrap confidence interval of the median are reported. Medians are compared with a
+# stored baseline summary, and flagged as a regression (or improvement) if the confidence
+# interval lies entirely above (or below) the baseline median by more than tolerance.
+
+# input options
+package_dir = Path(__file__).parent.parent.parent
+results_dir = package_dir / "data" / "computation_time_results"
+engines = ["rmspowersims", "powerfactory"]
+metrics = ["initialisation", "simulation", "total"]
+baseline_path = results_dir / "benchmark_baseline.csv"
+summary_path = results_dir / "benchmark_summary.csv"
+update_baseline = False  # replace the baseline with this summary
+tolerance = 0.05  # relative change of the median ignored when flagging
+confidence = 0.95
+n_bootstrap = 2000
+fail_on_regression = True  # exit with status 1 if a regression is flagged
+
+SUMMARY_COLUMNS = [
+    "engine",
+    "scenario",
+    "mode",
+    "metric",
+    "n",
+    "median",
+    "q1",
+    "q3",
+    "iqr",
+    "ci_low",
+    "ci_high",
+    "baseline_median",
+    "change",
+    "flag",
+]
+
+
+# reads benchmark results to {(engine, scenario, mode): {metric: [times]}}
+def read_results(path):
+    groups = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            key = (row["engine"], row["scenario"], row["mode"])
+            times = groups.setdefault(key, {metric: [] for metric in metrics})
+            t_init = float(row["initialisation"])
+            t_sim = float(row["simulation"])
+            times["initialisation"].append(t_init)
+            times["simulation"].append(t_sim)
+            times["total"].append(t_init + t_sim)
+    return groups
+
+
+# percentile bootstrap confidence interval of the median
+def bootstrap_median_ci(times, confidence, n_bootstrap, seed=0):
+    rng = random.Random(seed)
+    medians = sorted(
+        statistics.median(rng.choices(times, k=len(times))) for i in range(n_bootstrap)
+    )
+    alpha = (1 - confidence) / 2
+    return medians[int(alpha * n_bootstrap)], medians[int((1 - alpha) * n_bootstrap) - 1]
+
+
+def summarise(times):
+    if len(times) > 1:
+        q1, q2, q3 = statistics.quantiles(times, n=4, method="inclusive")
+    else:
+        q1 = q3 = times[0]
+    ci_low, ci_high = bootstrap_median_ci(times, confidence, n_bootstrap)
+    return {
+        "n": len(times),
+        "median": statistics.median(times),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+# compares a summary with the baseline median of the same engine, scenario, mode and metric
+def compare(summary, baseline_median):
+    if baseline_median is None:
+        return {"baseline_median": "", "change": "", "flag": ""}
+    flag = ""
+    if summary["ci_low"] > baseline_median * (1 + tolerance):
+        flag = "regression"
+    elif summary["ci_high"] < baseline_median * (1 - tolerance):
+        flag = "improvement"
+    return {
+        "baseline_median": baseline_median,
+        "change": summary["median"] / baseline_median - 1,
+        "flag": flag,
+    }
+
+
+def read_baseline(path):
+    if not path.exists():
+        return {}
+    with open(path, newline="") as f:
+        return {
+            (row["engine"], row["scenario"], row["mode"], row["metric"]): float(row["median"])
+            for row in csv.DictReader(f)
+        }
+
+
+def write_summary(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    baseline = read_baseline(baseline_path)
+
+    rows = []
+    for engine in engines:
+        results_path = results_dir / f"benchmark_{engine}.csv"
+        if not results_path.exists():
+            print(f"No results for {engine} ({results_path.name})")
+            continue
+        metadata_path = results_dir / f"benchmark_{engine}_metadata.json"
+        if metadata_path.exists():
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+            print(f"{engine}: {metadata.get('cpu')}, {metadata.get('date')}, commit {metadata.get('git_commit', '')[:8]}")
+
+        for (engine_name, scenario, mode), times in read_results(results_path).items():
+            for metric in metrics:
+                summary = summarise(times[metric])
+                summary.update(compare(summary, baseline.get((engine_name, scenario, mode, metric))))
+                rows.append({"engine": engine_name, "scenario": scenario, "mode": mode, "metric": metric, **summary})
+
+    print()
+    print(f"{'engine':<14}{'scenario':<16}{'mode':<10}{'metric':<16}{'median':>10}{'iqr':>10}{'ci':>22}  flag")
+    for row in rows:
+        ci = f"[{row['ci_low']:.4f}, {row['ci_high']:.4f}]"
+        change = f" ({row['change']:+.1%})" if row["change"] != "" else ""
+        print(
+            f"{row['engine']:<14}{row['scenario']:<16}{row['mode']:<10}{row['metric']:<16}"
+            f"{row['median']:>10.4f}{row['iqr']:>10.4f}{ci:>22}  {row['flag']}{change}"
+        )
+
+    # ratio of integration times between the engines
+    medians = {
+        (row["engine"], row["scenario"], row["mode"]): row["median"]
+        for row in rows
+        if row["metric"] == "simulation"
+    }
+    print()
+    for (engine, scenario, mode), t_sim in medians.items():
+        t_pf = medians.get(("powerfactory", scenario, mode))
+        if engine == "rmspowersims" and t_pf:
+            print(f"{scenario} ({mode}): RMSPowerSims.jl / PowerFactory simulation time = {t_sim / t_pf:.2f}")
+
+    write_summary(summary_path, rows)
+    if update_baseline:
+        write_summary(baseline_path, rows)
+
+    if fail_on_regression and any(row["flag"] == "regression" for row in rows):
+        sys.exit(1)
@@ -0,0 +1,98 @@
+using RMSPowerSims, DataFrames, CSV, JSON, OrderedCollections, Dates, LinearAlgebra, Pkg, Statistics
+
+# Times the scenarios of benchmark_scenarios.json with RMSPowerSims.jl.
+# benchmark_powerfactory.py times the same scenarios with PowerFactory, and
+# benchmark_report.py summarises both.
+#
+# Initialisation (load flow, initial conditions and model building) is timed separately
+# from integration (run_RMS_simulation).
+
+package_dir = (@__DIR__) |> dirname |> dirname
+definition = JSON.parsefile(joinpath(@__DIR__, "benchmark_scenarios.json"); dicttype=OrderedDict)
+output_dir = joinpath(package_dir, "data", "computation_time_results")
+
+# translate disturbances of the scenario definition
+function make_disturbances(net, disturbance_data)
+    disturbances = Disturbance[]
+    for data in disturbance_data
+        if data["type"] == "LoadStep"
+            ind = data["rmspowersims"]
+            push!(disturbances, LoadStep(ind, data["t"], data["dP"] * net["load"]["$ind"]["pd"]))
+        elseif data["type"] == "ShortCircuit"
+            push!(disturbances, BusFault(data["rmspowersims"], data["t_fault"], restart_simulation=false))
+            push!(disturbances, ClearBusFault(data["rmspowersims"], data["t_clear"], restart_simulation=true))
+        else
+            error("Unknown disturbance type $(data["type"])")
+        end
+    end
+    return disturbances
+end
+
+# returns initialisation and integration time of a single run in seconds
+function time_run(net, disturbance_data, tspan, solver_kwargs)
+    t0 = time_ns()
+    run_net = deepcopy(net)
+    power_system_simulation = prepare_simulation(run_net)
+    power_system_simulation.disturbances = make_disturbances(run_net, disturbance_data)
+    t1 = time_ns()
+    run_RMS_simulation(power_system_simulation, tspan; solver_kwargs...)
+    t2 = time_ns()
+    return (t1 - t0) * 1e-9, (t2 - t1) * 1e-9
+end
+
+function environment_metadata()
+    deps = Pkg.dependencies()
+    git_commit = try
+        readchomp(`git -C $(package_dir) rev-parse HEAD`)
+    catch
+        ""
+    end
+    return OrderedDict(
+        "engine" => "rmspowersims",
+        "date" => string(now()),
+        "git_commit" => git_commit,
+        "cpu" => Sys.cpu_info()[1].model,
+        "cpu_threads" => Sys.CPU_THREADS,
+        "julia_threads" => Threads.nthreads(),
+        "blas_threads" => BLAS.get_num_threads(),
+        "os" => string(Sys.KERNEL),
+        "julia_version" => string(VERSION),
+        "packages" => OrderedDict(
+            info.name => string(info.version) for info in values(deps) if info.is_direct_dep && !isnothing(info.version)
+        ),
+    )
+end
+
+net = parse_network_json(joinpath(package_dir, "data", "example_test_systems", definition["network"]))
+tspan = Tuple(definition["tspan"])
+
+results = DataFrame(
+    engine=String[],
+    scenario=String[],
+    mode=String[],
+    run=Int64[],
+    initialisation=Float64[],
+    simulation=Float64[],
+)
+for (scenario, disturbance_data) in definition["scenarios"], (mode, mode_data) in definition["modes"]
+    solver_kwargs = Dict(Symbol(k) => v for (k, v) in mode_data["rmspowersims"])
+
+    # warm-up runs, includes compilation
+    for i in 1:definition["n_warmup"]
+        time_run(net, disturbance_data, tspan, solver_kwargs)
+    end
+
+    t_sims = Float64[]
+    for i in 1:definition["n_runs"]
+        (t_init, t_sim) = time_run(net, disturbance_data, tspan, solver_kwargs)
+        push!(results, ["rmspowersims", scenario, mode, i, t_init, t_sim])
+        push!(t_sims, t_sim)
+    end
+    println("$(scenario) ($(mode)): median simulation time $(round(median(t_sims), digits=4)) s")
+end
+
+# save results
+CSV.write(joinpath(output_dir, "benchmark_rmspowersims.csv"), results)
+open(joinpath(output_dir, "benchmark_rmspowersims_metadata.json"), "w") do io
+    JSON.print(io, environment_metadata(), 4)
+end
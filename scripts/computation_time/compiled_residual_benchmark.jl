@@ -0,0 +1,59 @@
+using RMSPowerSims, SparseArrays, Printf
+
+# Compares the generated residual and Jacobian functions of compile_residual! with the evaluation
+# of each component model, for the IEEE 39 bus system.
+#
+# The residuals and Jacobians of both are compared at the initial conditions, and the time per
+# call and the time of a short circuit simulation with each are reported.
+
+package_dir = (@__DIR__) |> dirname |> dirname
+n_evaluations = 10_000
+tspan = (0.0, 10.0)
+solver_kwargs = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+
+net = parse_network_json(joinpath(package_dir, "data", "example_test_systems", "ieee39.json"))
+power_system_simulation = prepare_simulation(net)
+power_system_model = power_system_simulation.power_system_model
+(u0, du0) = (power_system_simulation.u0, power_system_simulation.du0)
+
+# generate and compile the residual functions
+start_time = time_ns()
+compiled = compile_residual!(power_system_model)
+@printf("compile_residual!: %.2f s (%d components evaluated by update!)\n", (time_ns() - start_time) * 1e-9, length(compiled.interpreted))
+
+function time_calls(f, n_evaluations)
+    f()
+    start_time = time_ns()
+    for i in 1:n_evaluations
+        f()
+    end
+    return (time_ns() - start_time) * 1e-9 / n_evaluations
+end
+
+# residuals
+(out_components, out_compiled) = (zeros(length(u0)), zeros(length(u0)))
+t_components = time_calls(() -> RMSPowerSims.power_system_equations!(out_components, du0, u0, power_system_model, 0.0), n_evaluations)
+t_compiled = Base.invokelatest(time_calls, () -> compiled.residual(out_compiled, du0, u0, 0.0, compiled.interpreted), n_evaluations)
+@printf("residual: %.2f μs (components), %.2f μs (compiled), max difference %.3e\n", t_components * 1e6, t_compiled * 1e6, maximum(abs.(out_components .- out_compiled)))
+
+# Jacobians
+gamma = 100.0
+(J_components, J_compiled) = (copy(compiled.jacobian_pattern), copy(compiled.jacobian_pattern))
+t_components = time_calls(() -> RMSPowerSims.power_system_jacobian!(J_components, du0, u0, power_system_model, gamma, 0.0), n_evaluations ÷ 10)
+t_compiled = Base.invokelatest(time_calls, () -> compiled.jacobian(J_compiled, du0, u0, gamma, 0.0, compiled.interpreted), n_evaluations ÷ 10)
+@printf("jacobian: %.2f μs (components), %.2f μs (compiled), max difference %.3e\n", t_components * 1e6, t_compiled * 1e6, maximum(abs.(nonzeros(J_components) .- nonzeros(J_compiled))))
+delete!(power_system_model.auxiliary_data, "compiled_residual")
+
+# simulations
+power_system_simulation.disturbances = Disturbance[
+    BusFault(31, 1.0, restart_simulation=true),
+    ClearBusFault(31, 1.1, restart_simulation=true),
+]
+simulation_times = Dict()
+for residual in (:components, :compiled)
+    run_RMS_simulation(power_system_simulation, tspan; residual=residual, solver_kwargs...)
+    start_time = time_ns()
+    run_RMS_simulation(power_system_simulation, tspan; residual=residual, solver_kwargs...)
+    simulation_times[residual] = (time_ns() - start_time) * 1e-9
+end
+@printf("simulation: %.3f s (components), %.3f s (compiled)\n", simulation_times[:components], simulation_times[:compiled])
@@ -1,3 +0,0 @@
-include("$(@__DIR__)/computation_time_no_disturbance.jl")
-include("$(@__DIR__)/computation_time_load_step.jl")
-include("$(@__DIR__)/computation_time_short_circuit.jl")
@@ -0,0 +1,51 @@
+using RMSPowerSims, Printf, Random
+
+# Compares the scenarios per second of run_ensemble with separate run_RMS_simulation calls on
+# copies of the prepared simulation, for a Monte Carlo study of the ZIP load coefficients of the
+# IEEE 39 bus system with a load step.
+#
+# Start Julia with --threads to compare the threaded ensemble.
+
+package_dir = (@__DIR__) |> dirname |> dirname
+n_scenarios = 100
+tspan = (0.0, 10.0)
+solver_kwargs = (reltol=1e-6, abstol=1e-6, maxiters=100000, dtmax=0.01)
+
+net = parse_network_json(joinpath(package_dir, "data", "example_test_systems", "ieee39.json"))
+power_system_simulation = prepare_simulation(net)
+num_loads = length(net["load"])
+
+Random.seed!(1)
+scenarios = map(1:n_scenarios) do _
+    Kpz = rand(num_loads)
+    EnsembleScenario(
+        parameters=[(ZIPLoad, load_ind) => (Kpz=Kpz[load_ind], Kpi=0.0, Kpc=1.0 - Kpz[load_ind]) for load_ind in 1:num_loads],
+        disturbances=[LoadStep(4, 1.0, 0.5)],
+    )
+end
+
+function time_run(f)
+    f()
+    start_time = time_ns()
+    result = f()
+    return result, (time_ns() - start_time) * 1e-9
+end
+
+# Separate simulations of copies of the prepared simulation
+function run_separately()
+    for scenario in scenarios
+        member = RMSPowerSims.ensemble_member(power_system_simulation, scenario, tspan)
+        run_RMS_simulation(member, tspan; event_handling=:integrator, saveat=0.01, solver_kwargs...)
+    end
+end
+
+(_, t_separate) = time_run(run_separately)
+(results_batched, t_batched) = time_run(() -> run_ensemble(power_system_simulation, scenarios, tspan; ensemble=:batched, solver_kwargs...))
+(results_threads, t_threads) = time_run(() -> run_ensemble(power_system_simulation, scenarios, tspan; ensemble=:threads, solver_kwargs...))
+
+println()
+@printf("%-24s %12s %16s\n", "", "time (s)", "scenarios / s")
+@printf("%-24s %12.3f %16.1f\n", "run_RMS_simulation", t_separate, n_scenarios / t_separate)
+@printf("%-24s %12.3f %16.1f\n", "ensemble=:batched", t_batched, n_scenarios / t_batched)
+@printf("%-24s %12.3f %16.1f\n", "ensemble=:threads ($(Threads.nthreads()))", t_threads, n_scenarios / t_threads)
+@printf("max difference of batched and threaded results: %.3e\n", maximum(abs.(results_batched.u .- results_threads.u)))
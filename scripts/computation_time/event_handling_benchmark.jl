@@ -0,0 +1,44 @@
+using RMSPowerSims, Printf
+
+# Compares the two event handling options of run_RMS_simulation for a short circuit on the
+# IEEE 39 bus system.
+#
+# With event_handling=:stages, a new DAEProblem is built and solved for each disturbance with
+# restart_simulation = true. With event_handling=:integrator, all disturbances are applied
+# within a single integrator, which is re-initialised after each batch of disturbances.
+
+package_dir = (@__DIR__) |> dirname |> dirname
+n_runs = 5
+tspan = (0.0, 10.0)
+solver_kwargs = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+
+net = parse_network_json(joinpath(package_dir, "data", "example_test_systems", "ieee39.json"))
+power_system_simulation = prepare_simulation(net)
+power_system_simulation.disturbances = Disturbance[
+    BusFault(31, 1.0, restart_simulation=true),
+    ClearBusFault(31, 1.1, restart_simulation=true),
+]
+
+final_state(soln) = soln isa AbstractVector ? soln[end].u[end] : soln.u[end]
+
+# run once to compile, then take the fastest of n_runs
+function time_simulation(power_system_simulation, event_handling)
+    soln = run_RMS_simulation(power_system_simulation, tspan; event_handling=event_handling, solver_kwargs...)
+    run_time = Inf
+    for i in 1:n_runs
+        start_time = time_ns()
+        soln = run_RMS_simulation(power_system_simulation, tspan; event_handling=event_handling, solver_kwargs...)
+        run_time = min(run_time, (time_ns() - start_time) * 1e-9)
+    end
+    return soln, run_time
+end
+
+(soln_stages, t_stages) = time_simulation(power_system_simulation, :stages)
+(soln_events, t_events) = time_simulation(power_system_simulation, :integrator)
+
+recalculation = RMSPowerSims.state_recalculation(power_system_simulation.power_system_model)
+println()
+@printf("event_handling=:stages:     %.3f s\n", t_stages)
+@printf("event_handling=:integrator: %.3f s (%.2fx)\n", t_events, t_stages / t_events)
+@printf("max difference of final states: %.3e\n", maximum(abs.(final_state(soln_stages) .- final_state(soln_events))))
+@printf("mean state recalculation time: %.3f ms\n", 1e3 * sum(recalculation.timings.algebraic_time) / size(recalculation.timings, 1))
@@ -2,19 +2,19 @@ using Plots, DataFrames, CSV
 using StatsBase, StatsPlots
 package_dir = (@__DIR__) |> dirname |> dirname
 
-# load data
-no_disturbance_time_df = CSV.read(joinpath(package_dir, "data", "computation_time_results", "computation_time_no_disturbance.csv"), DataFrame)
-short_circuit_time_df = CSV.read(joinpath(package_dir, "data", "computation_time_results", "computation_time_short_circuit.csv"), DataFrame)
-load_step_time_df = CSV.read(joinpath(package_dir, "data", "computation_time_results", "computation_time_load_step.csv"), DataFrame)
-powerfactory_no_disturbance_time_df = CSV.read(joinpath(package_dir, "data", "computation_time_results", "powerfactory_no_disturbance.csv"), DataFrame)
-powerfactory_short_circuit_time_df = CSV.read(joinpath(package_dir, "data", "computation_time_results", "powerfactory_short_circuit.csv"), DataFrame)
-powerfactory_load_step_time_df = CSV.read(joinpath(package_dir, "data", "computation_time_results", "powerfactory_load_step.csv"), DataFrame)
-
+# load data, written by benchmark_rmspowersims.jl and benchmark_powerfactory.py
+results_dir = joinpath(package_dir, "data", "computation_time_results")
+benchmark_df = vcat(
+    CSV.read(joinpath(results_dir, "benchmark_rmspowersims.csv"), DataFrame),
+    CSV.read(joinpath(results_dir, "benchmark_powerfactory.csv"), DataFrame),
+)
 
-function time_plot(data, data_pf; kwargs...)
+# integration times of a scenario for each engine and mode
+function time_plot(df, scenario; metric=:simulation, kwargs...)
+    times(engine, mode) = df[(df.engine.==engine).&(df.scenario.==scenario).&(df.mode.==mode), metric]
     return violin(
         ["RMSPowerSims\n(Fixed)" "PowerFactory\n(Fixed)" "RMSPowerSims\n(Adaptive)" "PowerFactory\n(Adaptive)"],
-        [data.fixed data_pf.fixed data.adaptive data_pf.adaptive];
+        [times("rmspowersims", "fixed") times("powerfactory", "fixed") times("rmspowersims", "adaptive") times("powerfactory", "adaptive")];
         kwargs...
     )
 end
@@ -40,8 +40,8 @@ log_kwargs = [
 ]
 yt_load_step = 0.1:0.1:0.9
 pl_load_step_log = time_plot(
-    load_step_time_df,
-    powerfactory_load_step_time_df;
+    benchmark_df,
+    "load_step";
     plot_kwargs...,
     log_kwargs...,
     yticks=(yt_load_step, yt_load_step),
@@ -55,8 +55,8 @@ yt_short_circuit = [
     5.0,
 ]
 pl_short_circuit_log = time_plot(
-    short_circuit_time_df,
-    powerfactory_short_circuit_time_df;
+    benchmark_df,
+    "short_circuit";
     plot_kwargs...,
     log_kwargs...,
     yticks=(yt_short_circuit, yt_short_circuit),
@@ -69,13 +69,13 @@ savefig(pl_short_circuit_log, joinpath(out_dir, "computation_time_short_circuit_
 ##
 # Create boxplot for no disturbance scenario
 pl_load_step = time_plot(
-    load_step_time_df,
-    powerfactory_load_step_time_df;
+    benchmark_df,
+    "load_step";
     plot_kwargs...,
 )
 pl_short_circuit = time_plot(
-    short_circuit_time_df,
-    powerfactory_short_circuit_time_df;
+    benchmark_df,
+    "short_circuit";
     plot_kwargs...,
 )
 savefig(pl_load_step, joinpath(out_dir, "computation_time_load_step.png"))
@@ -0,0 +1,56 @@
+import csv
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+from powerfactory_automation import (
+    PowerFactorySession,
+    export_results,
+    extract_results,
+    fake_powerfactory,
+    short_circuit,
+)
+from powerfactory_automation.ieee39_exports import benchmark_export_data
+
+# Compares moving results out of PowerFactory through ComRes csv files with reading
+# the ElmRes object directly into numpy arrays.
+# Runs against the fake powerfactory module, so no PowerFactory licence is required.
+
+# input options
+sim_time = 20.0  # 2000 steps with the default 10 ms output step
+call_latency = 0.0  # emulated round trip time of an API call (s)
+
+
+# reads a ComRes csv export back into numpy arrays
+def parse_csv_export(results_path):
+    with open(results_path, newline="") as f:
+        rows = csv.reader(f)
+        next(rows)  # elements
+        next(rows)  # variables
+        return np.array([[float(value) for value in row] for row in rows])
+
+
+if __name__ == "__main__":
+    app = fake_powerfactory.reset(call_latency=call_latency)
+    session = PowerFactorySession(app)
+    results_file = session.results_file("results_short_circuit", benchmark_export_data)
+    session.run(short_circuit("Bus 31", 0.1, 0.2, sim_time=sim_time), results_file)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        # csv round trip
+        tstart = perf_counter()
+        header_path, results_path = export_results(session, results_file, output_dir, "csv")
+        values = parse_csv_export(results_path)
+        t_csv = perf_counter() - tstart
+        print(f"csv export and parse: {t_csv * 1e3:.1f} ms ({values.shape[0]} rows, {values.shape[1]} columns)")
+
+        # direct extraction
+        for formats in (("npz",), ("bin",)):
+            tstart = perf_counter()
+            extract_results(session, results_file, output_dir, formats[0], formats)
+            t_extract = perf_counter() - tstart
+            print(f"direct extraction to {formats[0]}: {t_extract * 1e3:.1f} ms")
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+from powerfactory_automation import PowerFactorySession, fake_powerfactory, short_circuit
+from powerfactory_automation.ieee39_exports import benchmark_export_data
+
+# Measures the time and number of API calls spent in the automation harness itself.
+# Runs against the fake powerfactory module, so no PowerFactory licence is required.
+
+# input options
+n_runs = 100
+call_latency = 0.0  # emulated round trip time of an API call (s)
+
+if __name__ == "__main__":
+    app = fake_powerfactory.reset(call_latency=call_latency)
+    session = PowerFactorySession(app)
+
+    # results file setup, the second call finds the results file unchanged
+    setup_calls = []
+    for i in range(2):
+        calls_before = app.api_calls
+        results_file = session.results_file("results_short_circuit", benchmark_export_data)
+        setup_calls.append(app.api_calls - calls_before)
+    calls_setup = app.api_calls
+
+    # repeated runs
+    scenario = short_circuit("Bus 31", 0.1, 0.2, sim_time=0.0)
+    tstart = perf_counter()
+    for i in range(n_runs):
+        session.run(scenario, results_file, calculate_load_flow=False)
+    t_runs = perf_counter() - tstart
+    calls_runs = app.api_calls - calls_setup
+
+    for timing, calls in zip(session.setup_timings, setup_calls):
+        print(
+            f"results file setup ({timing['action']}): {timing['time'] * 1e3:.3f} ms, {calls} API calls"
+        )
+    print(
+        f"per run overhead: {t_runs / n_runs * 1e3:.3f} ms, {calls_runs / n_runs:.1f} API calls"
+    )
@@ -0,0 +1,51 @@
+using RMSPowerSims, Printf
+
+# Reports the allocations and time of evaluating the residuals of the IEEE 39 bus system.
+#
+# The equations of each component model are evaluated on the buffers of its
+# ComponentModelData, and a full call to power_system_equations! evaluates the component
+# groups of the PowerSystemModel. That neither allocates is checked by test/runtests.jl.
+
+package_dir = (@__DIR__) |> dirname |> dirname
+n_evaluations = 10_000
+
+# allocations of the component model equations, evaluated on the component buffers
+#   separated from component_allocations so that the model type is known when compiling
+function kernel_allocations(out_buf, du_buf, u_buf, model, t)
+    RMSPowerSims.update!(out_buf, du_buf, u_buf, model, t)
+    return @allocated RMSPowerSims.update!(out_buf, du_buf, u_buf, model, t)
+end
+component_allocations(component_model, t) = kernel_allocations(
+    component_model.out_buf, component_model.du_buf, component_model.u_buf, component_model.model, t
+)
+
+# allocations of a full residual evaluation, including gathering and scattering variables
+function residual_allocations(out, du, u, p, t)
+    RMSPowerSims.power_system_equations!(out, du, u, p, t)
+    return @allocated RMSPowerSims.power_system_equations!(out, du, u, p, t)
+end
+
+function time_residual(out, du, u, p, t, n_evaluations)
+    t0 = time_ns()
+    for i in 1:n_evaluations
+        RMSPowerSims.power_system_equations!(out, du, u, p, t)
+    end
+    return (time_ns() - t0) * 1e-9 / n_evaluations
+end
+
+net = parse_network_json(joinpath(package_dir, "data", "example_test_systems", "ieee39.json"))
+power_system_simulation = prepare_simulation(net)
+power_system_model = power_system_simulation.power_system_model
+(u0, du0) = (power_system_simulation.u0, power_system_simulation.du0)
+out = zeros(length(u0))
+
+# gather the initial state into the component buffers
+RMSPowerSims.power_system_equations!(out, du0, u0, power_system_model, 0.0)
+
+@printf("component allocations: %d bytes\n", sum(component_model -> component_allocations(component_model, 0.0), power_system_model.component_list))
+@printf("power_system_equations! allocations: %d bytes\n", residual_allocations(out, du0, u0, power_system_model, 0.0))
+
+t_residual = time_residual(out, du0, u0, power_system_model, 0.0, n_evaluations)
+println("component groups: ", join(["$(eltype(group.models)) ($(length(group.models)))" for group in power_system_model.component_groups], ", "))
+@printf("power_system_equations!: %.2f μs per call\n", t_residual * 1e6)
+@printf("max residual at initial conditions: %.3e\n", maximum(abs.(out)))
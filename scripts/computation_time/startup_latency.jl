@@ -0,0 +1,59 @@
+using CSV, DataFrames, TOML, Printf
+
+# Measures the time to first result of RMSPowerSims in fresh Julia processes, and appends the
+# results to startup_latency.csv so that they can be compared across releases.
+#
+# Each process loads the package, prepares the IEEE 39 bus system and simulates a short circuit.
+# The precompilation workload (src/general/PrecompileWorkload.jl) should make these times
+# largely independent of compilation.
+
+package_dir = (@__DIR__) |> dirname |> dirname
+results_file = joinpath(@__DIR__, "startup_latency.csv")
+n_processes = 3
+
+# run in each process, with the package directory as its argument
+workload = raw"""
+start_time = time_ns()
+using RMSPowerSims
+t_using = (time_ns() - start_time) * 1e-9
+
+net = parse_network_json(joinpath(ARGS[1], "data", "example_test_systems", "ieee39.json"))
+power_system_simulation = redirect_stdout(() -> prepare_simulation(net), devnull)
+t_prepare = (time_ns() - start_time) * 1e-9
+
+power_system_simulation.disturbances = Disturbance[
+    BusFault(31, 1.0, restart_simulation=true),
+    ClearBusFault(31, 1.1, restart_simulation=true),
+]
+soln = redirect_stdout(() -> run_RMS_simulation(power_system_simulation, (0.0, 5.0); dtmax=0.01), devnull)
+add_simulation_results!(net, soln)
+t_first_result = (time_ns() - start_time) * 1e-9
+
+println("startup latency: ", t_using, ",", t_prepare, ",", t_first_result)
+"""
+
+function startup_latency(package_dir)
+    output = read(`$(Base.julia_cmd()) --project=$package_dir -e $workload $package_dir`, String)
+    line = last(filter(startswith("startup latency: "), split(output, '\n')))
+    return parse.(Float64, split(split(line, ": ")[2], ','))
+end
+
+# precompile the package (if required) before timing
+run(`$(Base.julia_cmd()) --project=$package_dir -e "using RMSPowerSims"`)
+
+latencies = [startup_latency(package_dir) for i in 1:n_processes]
+(t_using, t_prepare, t_first_result) = [minimum(latency[k] for latency in latencies) for k in 1:3]
+
+results = DataFrame(
+    :date => [Libc.strftime("%Y-%m-%d", time())],
+    :version => [TOML.parsefile(joinpath(package_dir, "Project.toml"))["version"]],
+    :julia_version => [string(VERSION)],
+    :t_using => [t_using],
+    :t_prepare => [t_prepare],
+    :t_first_result => [t_first_result],
+)
+CSV.write(results_file, results; append=isfile(results_file))
+
+@printf("using RMSPowerSims:      %.2f s\n", t_using)
+@printf("prepare_simulation:      %.2f s\n", t_prepare)
+@printf("first simulation result: %.2f s\n", t_first_result)
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from powerfactory_automation import (
+    PowerFactorySession,
+    export_results,
+    extract_results,
+    fake_powerfactory,
+    short_circuit,
+)
+
+# Writes the PowerFactory results used by test/runtests.jl to test the results readers:
+# the ComRes csv export (header_pf_results.csv, pf_results.csv) and the binary results of
+# write_binary (header_pf_results_bin.csv, pf_results_bin.bin) of the same simulation.
+# Runs against the fake powerfactory module, so no PowerFactory licence is required.
+
+# input options
+sim_time = 0.5  # 51 steps with a 10 ms output step
+package_dir = Path(__file__).parent.parent
+output_dir = package_dir / "test" / "data" / "powerfactory_results"
+
+# a few variables of each class, including variables with several sets ("m:Psum:bus1")
+export_data = {
+    "ElmSym": {"elms": "*.ElmSym", "vars": ["s:speed", "s:phi", "s:speed:dt"]},
+    "ElmTerm": {"elms": "*.ElmTerm", "vars": ["m:u1", "m:phiu"]},
+    "ElmLod": {"elms": "*.ElmLod", "vars": ["m:Psum:bus1", "m:Qsum:bus1"]},
+    "IEEET1": {"elms": "*AVR*.ElmDsl", "vars": ["s:xe", "s:xr"]},
+}
+
+if __name__ == "__main__":
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    app = fake_powerfactory.reset(n_buses=3, n_gens=2, n_loads=2)
+    session = PowerFactorySession(app)
+    results_file = session.results_file("pf_results", export_data)
+    session.run(
+        short_circuit("Bus 02", 0.1, 0.2, sim_time=sim_time, com_inc_parameters={"dtgrd": 10}),
+        results_file,
+    )
+
+    export_results(session, results_file, output_dir, "pf_results")
+    extract_results(session, results_file, output_dir, "pf_results_bin", formats=("bin",))
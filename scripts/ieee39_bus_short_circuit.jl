@@ -32,50 +32,7 @@ add_simulation_results!(net, soln)
 
 ## Plot results
 
-# functions to parse PowerFactory results
-function parse_pf_header(fp_header::String)
-    df = DataFrame(
-        :col => Vector{String}(undef, 0),
-        :elm => Vector{String}(undef, 0),
-        :var => Vector{String}(undef, 0),
-    )
-
-    open(fp_header) do file
-        elm = "time"
-        for (idx, line) in enumerate(eachline(file))
-            idx <= 2 ? continue : nothing   # skip preamble
-            if startswith(line, "\\") || startswith(line, "'") # get elm from elm data lines
-                elm_with_class = split(line, "\\")[end]
-                elm = split(elm_with_class, ".")[1]
-            else
-                cells = split(line, ",")[1:2]
-                push!(df, [
-                    cells[1],   # column
-                    elm,
-                    cells[2],   # var
-                ])
-            end
-        end
-    end
-
-    return df
-end
-function parse_pf_rms(fp::String, header_df::DataFrame)
-    df = CSV.File(fp, header=1:2) |> DataFrame
-    header_df.var = [join(split(var, ":")[2:end], "_") for var in header_df.var] # remove variable set
-    # header_df.var = [split(var, ":")[2] for var in header_df.var] # remove variable set
-    nms = ["$(row.elm)_$(row.var)" for row in eachrow(header_df)] # join elm and variable
-    nms[1] = "time" # first column is time
-    rename!(df, nms)
-    return df
-end
-function parse_pf_rms(folder_path::String, file_name::String)
-    fp_header = joinpath(folder_path, "header_$(file_name).csv")
-    fp_file = joinpath(folder_path, "$(file_name).csv")
-    header_df = parse_pf_header(fp_header)
-    df = parse_pf_rms(fp_file, header_df)
-    return df
-end
+# functions to plot PowerFactory results
 function plot_pf!(df::DataFrame, var::String; kwargs...)
     plot!(df.time, df[:, var], label=var, lw=2; kwargs...)
 end
@@ -83,7 +40,11 @@ function plot_pf!(f::Function, df::DataFrame, var::String; kwargs...)
     return plot!(df.time, f.(df[:, var]), label=var, lw=2; kwargs...)
 end
 
-powerfactory_results = parse_pf_rms(joinpath(dirname(@__DIR__), "data", "ieee39_verification", "powerfactory_timeseries_results"), "Short_Circuit_Bus_31")
+powerfactory_results = read_pf_results(
+    joinpath(dirname(@__DIR__), "data", "ieee39_verification", "powerfactory_timeseries_results"),
+    "Short_Circuit_Bus_31";
+    columns=["time", "G 02_P1", "Bus 31_u", "G 09_P1", "Bus 38_u"],
+)
 
 pl_Pg_G02 = plot(
     net["t_vec"], net["gen"]["2"]["sol"]["Pg"],
@@ -1,4 +1,4 @@
-using RMSPowerSims, DataFrames, CSV, Plots, Measures
+using RMSPowerSims, Plots, Measures
 
 ## Run simulation
 
@@ -31,58 +31,14 @@ add_simulation_results!(net, soln)
 
 # Plot results
 
-# functions to parse PowerFactory results
-function parse_pf_header(fp_header::String)
-    df = DataFrame(
-        :col => Vector{String}(undef, 0),
-        :elm => Vector{String}(undef, 0),
-        :var => Vector{String}(undef, 0),
-    )
-
-    open(fp_header) do file
-        elm = "time"
-        for (idx, line) in enumerate(eachline(file))
-            idx <= 2 ? continue : nothing   # skip preamble
-            if startswith(line, "\\") || startswith(line, "'") # get elm from elm data lines
-                elm_with_class = split(line, "\\")[end]
-                elm = split(elm_with_class, ".")[1]
-            else
-                cells = split(line, ",")[1:2]
-                push!(df, [
-                    cells[1],   # column
-                    elm,
-                    cells[2],   # var
-                ])
-            end
-        end
-    end
-
-    return df
-end
-function parse_pf_rms(fp::String, header_df::DataFrame)
-    df = CSV.File(fp, header=1:2) |> DataFrame
-    header_df.var = [join(split(var, ":")[2:end], "_") for var in header_df.var] # remove variable set
-    # header_df.var = [split(var, ":")[2] for var in header_df.var] # remove variable set
-    nms = ["$(row.elm)_$(row.var)" for row in eachrow(header_df)] # join elm and variable
-    nms[1] = "time" # first column is time
-    rename!(df, nms)
-    return df
-end
-function parse_pf_rms(folder_path::String, file_name::String)
-    fp_header = joinpath(folder_path, "header_$(file_name).csv")
-    fp_file = joinpath(folder_path, "$(file_name).csv")
-    header_df = parse_pf_header(fp_header)
-    df = parse_pf_rms(fp_file, header_df)
-    return df
+# results extracted from PowerFactory by run_short_circuit_and_load_step_powerfactory.py
+#   the binary results are not committed, run the script in PowerFactory (with the IEEE 39 bus
+#   verification project active) to write them to data/ieee39_verification
+results_dir = joinpath(dirname(dirname(@__DIR__)), "data", "ieee39_verification")
+if !isfile(joinpath(results_dir, "short_circuit_and_load_step_results.bin"))
+    error("PowerFactory results not found in $results_dir, run scripts/ieee39_verification/run_short_circuit_and_load_step_powerfactory.py in PowerFactory to generate them")
 end
-function plot_pf!(df::DataFrame, var::String; kwargs...)
-    plot!(df.time, df[:, var], label=var, lw=2; kwargs...)
-end
-function plot_pf!(f::Function, df::DataFrame, var::String; kwargs...)
-    return plot!(df.time, f.(df[:, var]), label=var, lw=2; kwargs...)
-end
-
-powerfactory_results = parse_pf_rms(joinpath(dirname(@__DIR__), "data", "ieee39_verification", "powerfactory_timeseries_results"), "short_circuit_and_load_step_results")
+powerfactory_results = open_pf_binary(results_dir, "short_circuit_and_load_step_results")
 ##
 plot_kwargs = [
     :xlabel => "Time (s)",
@@ -107,7 +63,7 @@ pl_Pg_G02 = plot(
     plot_kwargs...,
 )
 plot!(
-    powerfactory_results.time, 0.01 .* powerfactory_results[:, "G 02_P1"],
+    powerfactory_results["time"], 0.01 .* powerfactory_results["G 02_P1"],
     lw=2, label="PowerFactory", style=:dash,
 )
 pl_V_bus_31 = plot(
@@ -117,7 +73,7 @@ pl_V_bus_31 = plot(
     plot_kwargs...,
 )
 plot!(
-    powerfactory_results.time, powerfactory_results[:, "Bus 31_u1"],
+    powerfactory_results["time"], powerfactory_results["Bus 31_u1"],
     lw=2, label="PowerFactory", style=:dash
 )
 
@@ -128,7 +84,7 @@ pl_Pg_G09 = plot(
     plot_kwargs...,
 )
 plot!(
-    powerfactory_results.time, 0.01 .* powerfactory_results[:, "G 09_P1"],
+    powerfactory_results["time"], 0.01 .* powerfactory_results["G 09_P1"],
     lw=2, label="PowerFactory", style=:dash
 )
 
@@ -139,7 +95,7 @@ pl_V_bus_38 = plot(
     plot_kwargs...,
 )
 plot!(
-    powerfactory_results.time, powerfactory_results[:, "Bus 38_u1"],
+    powerfactory_results["time"], powerfactory_results["Bus 38_u1"],
     lw=2, label="PowerFactory", style=:dash
 )
 
@@ -150,7 +106,7 @@ plot_Pd_load_16 = plot(
     plot_kwargs...,
 )
 plot!(
-    powerfactory_results.time, 0.01 .* powerfactory_results[:, "Load 16_Psum_bus1"],
+    powerfactory_results["time"], 0.01 .* powerfactory_results["Load 16_Psum_bus1"],
     lw=2, label="PowerFactory", style=:dash
 )
 
@@ -0,0 +1,32 @@
+# Shared PowerFactory automation used by the benchmark and verification scripts.
+#
+# The scripts add the scripts directory to sys.path and import from this package.
+# See fake_powerfactory.py for running the harness without PowerFactory.
+from .events import (
+    EventSpec,
+    apply_events,
+    make_event,
+    make_event_EvtLod,
+    make_event_EvtShc,
+)
+from .export import export_results
+from .extract import (
+    ResultsArrays,
+    extract_results,
+    read_npz,
+    read_results,
+    write_binary,
+    write_npz,
+)
+from .farm import ScenarioFarm, ScenarioResult, write_farm_results
+from .results_schema import ExportSpec, configure_results_file
+from .scenarios import (
+    LoadStep,
+    Scenario,
+    ShortCircuit,
+    contingency_scenarios,
+    load_step,
+    no_disturbance,
+    short_circuit,
+)
+from .session import PowerFactorySession
@@ -0,0 +1,86 @@
+import csv
+import datetime
+import json
+import os
+import platform
+import subprocess
+from pathlib import Path
+
+from .scenarios import LoadStep, Scenario, ShortCircuit
+
+# columns of the benchmark results, shared with benchmark_rmspowersims.jl
+RESULT_COLUMNS = ["engine", "scenario", "mode", "run", "initialisation", "simulation"]
+
+
+# reads the scenario definition shared by the PowerFactory and RMSPowerSims.jl benchmarks
+def load_benchmark_definition(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# makes the PowerFactory scenario of a benchmark scenario and mode
+#   load steps are given as a fraction of the load's demand, EvtLod uses percent
+def benchmark_scenario(definition, scenario_name, mode):
+    disturbances = []
+    for data in definition["scenarios"][scenario_name]:
+        if data["type"] == "LoadStep":
+            disturbances.append(LoadStep(data["powerfactory"], data["t"], 100 * data["dP"]))
+        elif data["type"] == "ShortCircuit":
+            disturbances.append(ShortCircuit(data["powerfactory"], data["t_fault"], data["t_clear"]))
+        else:
+            raise ValueError(f"Unknown disturbance type {data['type']}")
+    t_start, t_stop = definition["tspan"]
+    return Scenario(
+        f"{scenario_name}_{mode}",
+        disturbances,
+        sim_time=t_stop - t_start,
+        com_inc_parameters=definition["modes"][mode]["powerfactory"],
+    )
+
+
+# times repeated runs of a scenario, warm-up runs are discarded
+#   returns the timings of PowerFactorySession.run for each run
+#   the load flow is not calculated, only the initialisation and simulation are timed
+def run_benchmark(session, scenario, results_file, n_runs, n_warmup=1):
+    for i in range(n_warmup):
+        session.run(scenario, results_file, calculate_load_flow=False)
+    return [
+        session.run(scenario, results_file, calculate_load_flow=False) for i in range(n_runs)
+    ]
+
+
+# description of the machine and software the benchmark ran on
+def environment_metadata(session):
+    try:
+        git_commit = subprocess.run(
+            ["git", "-C", str(Path(__file__).parent), "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        git_commit = ""
+    get_version = getattr(session.app, "GetVersion", None)
+    return {
+        "engine": "powerfactory",
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit,
+        "cpu": platform.processor() or platform.machine(),
+        "cpu_threads": os.cpu_count(),
+        "os": platform.platform(),
+        "python_version": platform.python_version(),
+        "powerfactory_version": get_version() if get_version is not None else "",
+    }
+
+
+# saves benchmark results in the format of benchmark_rmspowersims.jl
+#   rows: dicts with the keys of RESULT_COLUMNS
+def write_benchmark_results(output_path, rows):
+    with open(output_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_metadata(output_path, metadata):
+    with open(output_path, "w") as f:
+        json.dump(metadata, f, indent=4)
@@ -0,0 +1,64 @@
+from collections import namedtuple
+
+# definition of a single PowerFactory event
+#   name: loc_name of the event object inside the IntEvt
+#   event_class: PowerFactory class of the event, i.e. "EvtShc" or "EvtLod"
+#   target: PowerFactory object the event acts on
+#   parameters: attributes set on the event object
+EventSpec = namedtuple("EventSpec", ["name", "event_class", "target", "parameters"])
+
+
+# creates or updates an event object in the events file
+def make_event(events_file, event_spec, existing_event=None):
+    event = existing_event
+    if event is None:
+        event = events_file.CreateObject(event_spec.event_class)
+        event.loc_name = event_spec.name
+
+    # Set target
+    event.SetAttribute("p_target", event_spec.target)
+
+    # Set event parameters
+    for param, value in event_spec.parameters.items():
+        event.SetAttribute(param, value)
+
+    return event
+
+
+# makes short circuit event
+def make_event_EvtShc(events_file, bus, event_parameters, event_name=None):
+    if event_name is None:
+        event_name = f"Short Circuit Event - {bus.loc_name}"
+    return make_event(
+        events_file, EventSpec(event_name, "EvtShc", bus, event_parameters)
+    )
+
+
+# makes load step event
+def make_event_EvtLod(events_file, load, event_parameters, event_name=None):
+    if event_name is None:
+        event_name = f"Load Event - {load.loc_name}"
+    return make_event(
+        events_file, EventSpec(event_name, "EvtLod", load, event_parameters)
+    )
+
+
+# synchronises the contents of an events file with a list of event definitions
+#   events that already exist with the same name and class are updated in place,
+#   missing events are created and events that are no longer required are deleted
+def apply_events(events_file, event_specs):
+    existing_events = {
+        (event.loc_name, event.GetClassName()): event
+        for event in events_file.GetContents()
+    }
+
+    events = []
+    for event_spec in event_specs:
+        key = (event_spec.name, event_spec.event_class)
+        events.append(make_event(events_file, event_spec, existing_events.pop(key, None)))
+
+    # Delete events that are not part of the scenario
+    for event in existing_events.values():
+        event.Delete()
+
+    return events
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+
+# exports results and header files of an ElmRes object through ComRes
+def export_results(session, results_file, output_dir, output_name):
+    output_dir = Path(output_dir)
+
+    # Configure ComRes
+    com_res = session.get_command("*.ComRes")
+    com_res.SetAttribute("pResult", results_file)
+    com_res.SetAttribute("iopt_exp", 6)  # set export to csv file
+
+    # Export header
+    com_res.SetAttribute("iopt_vars", 1)  # export header
+    header_path = output_dir / f"header_{output_name}.csv"
+    com_res.SetAttribute("f_name", str(header_path))
+    com_res.Execute()
+
+    # Export values
+    com_res.SetAttribute("iopt_vars", 0)  # export values
+    results_path = output_dir / f"{output_name}.csv"
+    com_res.SetAttribute("f_name", str(results_path))
+    com_res.Execute()
+
+    return header_path, results_path
@@ -0,0 +1,140 @@
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+
+# results of an ElmRes object held in memory
+#   time: time of each row
+#   values: one column per (element, variable), each column contiguous
+#   elements, classes, variables: element loc_name, class and variable of each column
+class ResultsArrays(
+    namedtuple("ResultsArrays", ["time", "values", "elements", "classes", "variables"])
+):
+    __slots__ = ()
+
+    # column names as in RMSPowerSims.read_pf_results, i.e. "Bus 31_u1" for m:u1 of Bus 31
+    @property
+    def names(self):
+        return [
+            f"{elm}_{'_'.join(var.split(':')[1:])}"
+            for elm, var in zip(self.elements, self.variables)
+        ]
+
+    # values of the column with the given name
+    def column(self, name):
+        return self.values[:, self.names.index(name)]
+
+
+# reads the results of an ElmRes object straight into numpy arrays
+#   the values of each column are copied in a single call through an IntVec buffer,
+#   falling back to GetValue for each row if GetColumnValues is not available
+def read_results(session, results_file):
+    results_file.Load()
+    try:
+        n_rows = results_file.GetNumberOfRows()
+        n_cols = results_file.GetNumberOfColumns()
+
+        # column map
+        elements, classes, variables = [], [], []
+        for col in range(n_cols):
+            elm = results_file.GetObject(col)
+            elements.append(elm.loc_name)
+            classes.append(elm.GetClassName())
+            variables.append(results_file.GetVariable(col))
+
+        # preallocate with contiguous columns, column -1 is time
+        time = np.empty(n_rows)
+        values = np.empty((n_rows, n_cols), order="F")
+        buffer = _column_buffer(session, results_file)
+        _read_column(results_file, -1, time, buffer)
+        for col in range(n_cols):
+            _read_column(results_file, col, values[:, col], buffer)
+    finally:
+        results_file.Release()
+
+    return ResultsArrays(time, values, elements, classes, variables)
+
+
+# IntVec used to copy columns out of ElmRes objects, None if unsupported
+def _column_buffer(session, results_file):
+    if not hasattr(results_file, "GetColumnValues"):
+        return None
+    return session.get_or_create("rms_column_buffer", "IntVec")
+
+
+def _read_column(results_file, col, out, buffer):
+    if buffer is not None and results_file.GetColumnValues(buffer, col) == 0:
+        out[:] = buffer.V
+        return
+    for row in range(len(out)):
+        ierr, value = results_file.GetValue(row, col)
+        out[row] = value
+
+
+# writes results to a compressed .npz file
+def write_npz(path, results):
+    np.savez_compressed(
+        path,
+        time=results.time,
+        values=results.values,
+        elements=np.array(results.elements),
+        classes=np.array(results.classes),
+        variables=np.array(results.variables),
+    )
+
+
+# reads results written by write_npz
+def read_npz(path):
+    with np.load(path) as data:
+        return ResultsArrays(
+            data["time"],
+            np.asfortranarray(data["values"]),
+            list(data["elements"]),
+            list(data["classes"]),
+            list(data["variables"]),
+        )
+
+
+# writes results as Float64 columns (<output_name>.bin) with a PowerFactory format
+# header (header_<output_name>.csv), as read by RMSPowerSims.open_pf_binary
+def write_binary(output_dir, output_name, results):
+    output_dir = Path(output_dir)
+    header_path = output_dir / f"header_{output_name}.csv"
+    binary_path = output_dir / f"{output_name}.bin"
+
+    with open(header_path, "w") as f:
+        f.write("powerfactory_automation:\n")
+        f.write(f"'{output_name}':\n")
+        f.write('1,b:tnow,s,"Time"\n')
+        elm = None
+        for col, (name, class_name, var) in enumerate(
+            zip(results.elements, results.classes, results.variables), start=2
+        ):
+            if (name, class_name) != elm:
+                elm = (name, class_name)
+                f.write(f"'\\{name}.{class_name}':\n")
+            f.write(f'{col},{var},,"{var}"\n')
+
+    # time column followed by each values column
+    with open(binary_path, "wb") as f:
+        results.time.astype("<f8").tofile(f)
+        np.asfortranarray(results.values, dtype="<f8").T.tofile(f)
+
+    return header_path, binary_path
+
+
+# reads an ElmRes object and writes it to disk without a CSV round trip
+#   formats: any of "npz" and "bin", returns the paths written for each format
+def extract_results(session, results_file, output_dir, output_name, formats=("npz",)):
+    output_dir = Path(output_dir)
+    results = read_results(session, results_file)
+
+    paths = {}
+    if "npz" in formats:
+        paths["npz"] = output_dir / f"{output_name}.npz"
+        write_npz(paths["npz"], results)
+    if "bin" in formats:
+        paths["bin"] = write_binary(output_dir, output_name, results)
+
+    return paths
@@ -0,0 +1,438 @@
+# Stand-in for the PowerFactory python module.
+#
+# Emulates the small part of the PowerFactory API used by powerfactory_automation so
+# that the automation harness can be tested, and its overhead benchmarked, without a
+# PowerFactory installation or licence. No power system calculations are performed.
+#
+# Usage:
+#     from powerfactory_automation import fake_powerfactory
+#     fake_powerfactory.install()  # "import powerfactory" now returns this module
+#     app = fake_powerfactory.GetApplication()
+#
+# Every API call is counted in app.api_calls and can be slowed down with call_latency
+# (seconds) to emulate the cost of a round trip to the PowerFactory engine.
+#
+# Simulations fill results files with synthetic values, which can be read through the
+# ElmRes API or exported to csv with ComRes.
+#
+# GetApplicationExt returns a new application for each engine process, as used by
+# farm.ScenarioFarm. Simulations terminate the process with probability crash_probability
+# to emulate engine crashes.
+import fnmatch
+import math
+import os
+import random
+import sys
+import time
+from functools import wraps
+
+
+# counts an API call and applies the emulated round-trip latency
+def _api(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        app = self._app if isinstance(self, DataObject) else self
+        if app is not None:
+            app.api_calls += 1
+            if app.call_latency > 0:
+                time.sleep(app.call_latency)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+###########################################################
+# data objects
+###########################################################
+class DataObject:
+    def __init__(self, app, class_name, loc_name, parent=None, **attributes):
+        object.__setattr__(self, "_app", app)
+        object.__setattr__(self, "_class_name", class_name)
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_contents", [])
+        object.__setattr__(self, "_attributes", {"loc_name": loc_name, **attributes})
+        object.__setattr__(self, "_deleted", False)
+        if parent is not None:
+            parent._contents.append(self)
+
+    # attribute access, i.e. obj.loc_name
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"{self._class_name} object has no attribute '{name}'"
+            ) from None
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            self._attributes[name] = value
+
+    def __repr__(self):
+        return f"<{self._attributes['loc_name']}.{self._class_name}>"
+
+    @_api
+    def GetClassName(self):
+        return self._class_name
+
+    @_api
+    def GetParent(self):
+        return self._parent
+
+    @_api
+    def GetFullName(self):
+        return _full_name(self)
+
+    @_api
+    def GetAttribute(self, name):
+        return self._attributes.get(name)
+
+    @_api
+    def SetAttribute(self, name, value):
+        self._attributes[name] = value
+
+    @_api
+    def GetContents(self, pattern="*", recursive=0):
+        return _search(self, pattern, recursive)
+
+    @_api
+    def CreateObject(self, class_name, loc_name=None):
+        if loc_name is None:
+            loc_name = class_name
+        return _object_class(class_name)(self._app, class_name, loc_name, self)
+
+    @_api
+    def Delete(self):
+        if self._parent is not None and self in self._parent._contents:
+            self._parent._contents.remove(self)
+        self._deleted = True
+        return 0
+
+    @_api
+    def Execute(self):
+        return self._execute()
+
+    @_api
+    def AddCopy(self, obj, loc_name=None):
+        return _copy(obj, self, loc_name)
+
+    # commands override _execute
+    def _execute(self):
+        return 0
+
+
+def _copy(obj, parent, loc_name=None):
+    attributes = dict(obj._attributes)
+    attributes["loc_name"] = loc_name if loc_name is not None else obj._attributes["loc_name"]
+    copy = _object_class(obj._class_name)(obj._app, obj._class_name, parent=parent, **attributes)
+    for child in list(obj._contents):
+        _copy(child, copy)
+    return copy
+
+
+def _full_name(obj):
+    names = []
+    while obj is not None:
+        names.append(f"{obj._attributes['loc_name']}.{obj._class_name}")
+        obj = obj._parent
+    return "\\" + "\\".join(reversed(names))
+
+
+def _matches(obj, pattern):
+    if "." in pattern:
+        name_pattern, class_pattern = pattern.rsplit(".", 1)
+    else:
+        name_pattern, class_pattern = pattern, "*"
+    return fnmatch.fnmatchcase(
+        obj._attributes["loc_name"], name_pattern
+    ) and fnmatch.fnmatchcase(obj._class_name, class_pattern)
+
+
+def _search(obj, pattern, recursive):
+    found = []
+    for child in obj._contents:
+        if _matches(child, pattern):
+            found.append(child)
+        if recursive:
+            found.extend(_search(child, pattern, recursive))
+    return found
+
+
+class ElmRes(DataObject):
+    def __init__(self, app, class_name, loc_name, parent=None, **attributes):
+        super().__init__(app, class_name, loc_name, parent, **attributes)
+        self._time = []
+        self._loaded = None
+
+    @_api
+    def AddVariable(self, elm, var):
+        monitor = next(
+            (m for m in self._contents if m._class_name == "IntMon" and m._attributes.get("obj_id") is elm),
+            None,
+        )
+        if monitor is None:
+            monitor = IntMon(self._app, "IntMon", elm._attributes["loc_name"], self, obj_id=elm, vars=[])
+        if var not in monitor._attributes["vars"]:
+            monitor._attributes["vars"] = monitor._attributes["vars"] + [var]
+        return 0
+
+    # (element, variable) of each result column, column 0 is time
+    def _columns(self):
+        columns = [(None, "b:tnow")]
+        for monitor in self._contents:
+            if monitor._class_name == "IntMon" and monitor._attributes.get("obj_id") is not None:
+                columns.extend(
+                    (monitor._attributes["obj_id"], var)
+                    for var in monitor._attributes.get("vars", [])
+                )
+        return columns
+
+    # synthetic value of a column at time t
+    @staticmethod
+    def _value(t, col):
+        return 1.0 + 0.05 * math.sin(2.0 * math.pi * (0.5 + 0.01 * col) * t + col)
+
+    # values of each result column, column 0 is time
+    def _data(self):
+        n_cols = len(self._columns())
+        return [list(self._time)] + [
+            [self._value(t, col) for t in self._time] for col in range(n_cols - 1)
+        ]
+
+    # columns are indexed as in PowerFactory, -1 is time
+    @_api
+    def Load(self):
+        self._loaded = (self._columns(), self._data())
+        return 0
+
+    @_api
+    def Release(self):
+        self._loaded = None
+        return 0
+
+    @_api
+    def GetNumberOfRows(self):
+        return len(self._loaded[1][0])
+
+    @_api
+    def GetNumberOfColumns(self):
+        return len(self._loaded[0]) - 1
+
+    @_api
+    def GetObject(self, col):
+        return self._loaded[0][col + 1][0]
+
+    @_api
+    def GetVariable(self, col):
+        return self._loaded[0][col + 1][1]
+
+    @_api
+    def GetValue(self, row, col):
+        return [0, self._loaded[1][col + 1][row]]
+
+    @_api
+    def GetColumnValues(self, data_vector, col):
+        data_vector._attributes["V"] = list(self._loaded[1][col + 1])
+        return 0
+
+
+class IntMon(DataObject):
+    pass
+
+
+class ComLdf(DataObject):
+    def _execute(self):
+        self._app._load_flow_calculated = True
+        return 0
+
+
+class ComInc(DataObject):
+    def _execute(self):
+        if self._attributes.get("p_resvar") is None:
+            return 1
+        self._app._initialised = self
+        return 0
+
+
+class ComSim(DataObject):
+    def _execute(self):
+        if random.random() < self._app.crash_probability:
+            os._exit(3)
+        com_inc = self._app._initialised
+        if com_inc is None:
+            return 1
+        results_file = com_inc._attributes["p_resvar"]
+        tstop = self._attributes.get("tstop", 10.0)
+        dt = com_inc._attributes.get("dtgrd", 10) * 1e-3  # dtgrd is given in ms
+        n_steps = int(math.floor(tstop / dt + 1e-9)) + 1
+        results_file._time = [i * dt for i in range(n_steps)]
+        return 0
+
+
+class IntVec(DataObject):
+    def __init__(self, app, class_name, loc_name, parent=None, **attributes):
+        attributes.setdefault("V", [])
+        super().__init__(app, class_name, loc_name, parent, **attributes)
+
+
+# activating a project makes its grid and study case the active ones
+class IntPrj(DataObject):
+    @_api
+    def Activate(self):
+        app = self._app
+        app._project = self
+        app._grid = _search(self, "*.ElmNet", True)[0]
+        app._study_case = _search(self, "*.IntCase", True)[0]
+        app._initialised = None
+        return 0
+
+    @_api
+    def Deactivate(self):
+        return 0
+
+
+# writes the header (iopt_vars=1) or values (iopt_vars=0) of pResult to f_name as csv
+class ComRes(DataObject):
+    def _execute(self):
+        results_file = self._attributes.get("pResult")
+        if results_file is None or self._attributes.get("iopt_exp") != 6:
+            return 1
+        columns = results_file._columns()
+        with open(self._attributes["f_name"], "w") as f:
+            if self._attributes.get("iopt_vars") == 1:
+                f.write(f"{_full_name(self)}:\n")
+                f.write(f"'{_full_name(results_file)}':\n")
+                elm = None
+                for col, (obj, var) in enumerate(columns, start=1):
+                    if obj is not None and obj is not elm:
+                        elm = obj
+                        f.write(f"'{_full_name(obj)}':\n")
+                    f.write(f'{col},{var},,"{var}"\n')
+            else:
+                names = ["All calculations"] + [obj._attributes["loc_name"] for obj, var in columns[1:]]
+                f.write(",".join(names) + "\n")
+                f.write(",".join(var for obj, var in columns) + "\n")
+                for row in zip(*results_file._data()):
+                    f.write(",".join(repr(value) for value in row) + "\n")
+        return 0
+
+
+_object_classes = {
+    "ElmRes": ElmRes,
+    "IntMon": IntMon,
+    "ComLdf": ComLdf,
+    "ComInc": ComInc,
+    "ComSim": ComSim,
+    "ComRes": ComRes,
+    "IntVec": IntVec,
+    "IntPrj": IntPrj,
+}
+
+
+def _object_class(class_name):
+    return _object_classes.get(class_name, DataObject)
+
+
+###########################################################
+# application
+###########################################################
+class Application:
+    def __init__(self, n_buses=39, n_gens=10, n_loads=19, call_latency=0.0, crash_probability=0.0):
+        self.api_calls = 0
+        self.call_latency = call_latency
+        self.crash_probability = crash_probability
+        self.messages = []
+        self._initialised = None
+        self._load_flow_calculated = False
+
+        # project structure
+        self._user = DataObject(self, "IntUser", "fake_user")
+        self._project = IntPrj(self, "IntPrj", "fake_project", self._user)
+        network_model = DataObject(self, "IntPrjfolder", "Network Model", self._project)
+        network_data = DataObject(self, "IntPrjfolder", "Network Data", network_model)
+        self._grid = DataObject(self, "ElmNet", "Grid", network_data)
+        study_cases = DataObject(self, "IntPrjfolder", "Study Cases", self._project)
+        self._study_case = DataObject(self, "IntCase", "Study Case", study_cases)
+
+        # network elements, named as in the IEEE 39 bus PowerFactory model
+        for i in range(1, n_buses + 1):
+            DataObject(self, "ElmTerm", f"Bus {i:02d}", self._grid)
+        for i in range(1, n_loads + 1):
+            DataObject(self, "ElmLod", f"Load {i:02d}", self._grid)
+        for i in range(1, n_gens + 1):
+            DataObject(self, "ElmSym", f"G {i:02d}", self._grid)
+            if i > 1:
+                plant = DataObject(self, "ElmComp", f"Power Plant {i:02d}", self._grid)
+                DataObject(self, "ElmDsl", f"AVR {i:02d}", plant)
+                DataObject(self, "ElmDsl", f"GOV {i:02d}", plant)
+
+    @_api
+    def GetActiveStudyCase(self):
+        return self._study_case
+
+    @_api
+    def GetActiveProject(self):
+        return self._project
+
+    @_api
+    def GetCurrentUser(self):
+        return self._user
+
+    @_api
+    def ActivateProject(self, name):
+        found = _search(self._user, f"{name}.IntPrj", False)
+        if not found:
+            return 1
+        return found[0].Activate()
+
+    @_api
+    def GetCalcRelevantObjects(self, pattern="*", include_out_of_service=1):
+        return _search(self._grid, pattern, True)
+
+    # returns the first object of the study case matching pattern, creating it if absent
+    @_api
+    def GetFromStudyCase(self, pattern):
+        found = _search(self._study_case, pattern if "." in pattern else f"*.{pattern}", False)
+        if found:
+            return found[0]
+        class_name = pattern.rsplit(".", 1)[-1]
+        return _object_class(class_name)(self, class_name, class_name, self._study_case)
+
+    @_api
+    def PrintInfo(self, message):
+        self.messages.append(message)
+
+    @_api
+    def ClearOutputWindow(self):
+        self.messages.clear()
+
+
+_application = None
+
+
+def GetApplication(*args, **kwargs):
+    global _application
+    if _application is None:
+        _application = Application()
+    return _application
+
+
+# engine mode, each process creates its own application
+def GetApplicationExt(*args, **kwargs):
+    return reset(**kwargs)
+
+
+# replaces the application returned by GetApplication, i.e. to change the network size
+def reset(**kwargs):
+    global _application
+    _application = Application(**kwargs)
+    return _application
+
+
+# makes "import powerfactory" return this module
+def install():
+    sys.modules["powerfactory"] = sys.modules[__name__]
@@ -0,0 +1,261 @@
+import csv
+import importlib
+import multiprocessing as mp
+import sys
+import traceback
+from collections import deque, namedtuple
+from multiprocessing.connection import wait
+from time import perf_counter
+
+from .extract import extract_results
+from .session import PowerFactorySession
+
+# outcome of a scenario run by a ScenarioFarm
+#   status: "ok", "failed" (the run raised an exception) or "crashed" (the worker process
+#       died on every attempt)
+#   worker: index of the worker that ran the last attempt
+#   attempts: number of times the scenario was started
+#   timings: times returned by PowerFactorySession.run plus the worker's wall time
+#   paths: files written by extract_results, empty if no output_dir is given
+ScenarioResult = namedtuple(
+    "ScenarioResult",
+    ["name", "status", "worker", "attempts", "timings", "paths", "error"],
+)
+
+
+# settings passed to each worker process
+WorkerConfig = namedtuple(
+    "WorkerConfig",
+    [
+        "engine",
+        "engine_path",
+        "engine_kwargs",
+        "project_name",
+        "export_data",
+        "results_file_name",
+        "output_dir",
+        "formats",
+        "calculate_load_flow",
+    ],
+)
+
+
+###########################################################
+# worker process
+###########################################################
+
+
+# starts a PowerFactory engine, activates a copy of the project and runs the scenarios
+# received on conn until None is received
+#   each worker has its own pipe, so a crashing engine cannot block the other workers
+def _worker(worker_id, config, conn):
+    try:
+        if config.engine_path is not None:
+            sys.path.insert(0, str(config.engine_path))
+        engine = importlib.import_module(config.engine)
+        app = engine.GetApplicationExt(**config.engine_kwargs)
+
+        # each worker works on its own copy of the project
+        if config.project_name is not None:
+            app.ActivateProject(config.project_name)
+        project = app.GetActiveProject()
+        user = app.GetCurrentUser()
+        project_copy = user.AddCopy(project, f"{project.loc_name} - worker {worker_id}")
+        project_copy.Activate()
+
+        session = PowerFactorySession(app)
+        results_file = session.results_file(config.results_file_name, config.export_data)
+    except Exception:
+        conn.send(("setup_failed", traceback.format_exc()))
+        return
+    conn.send(("ready", None))
+
+    try:
+        for index, scenario in iter(conn.recv, None):
+            tstart = perf_counter()
+            try:
+                timings = session.run(scenario, results_file, config.calculate_load_flow)
+                paths = {}
+                if config.output_dir is not None:
+                    paths = extract_results(
+                        session, results_file, config.output_dir, scenario.name, config.formats
+                    )
+                timings["wall"] = perf_counter() - tstart
+                conn.send(("done", (index, timings, paths)))
+            except Exception:
+                conn.send(("failed", (index, traceback.format_exc())))
+    finally:
+        project_copy.Deactivate()
+        project_copy.Delete()
+
+
+###########################################################
+# scheduler
+###########################################################
+
+
+# runs scenarios on n_workers PowerFactory engine processes
+#   each worker activates its own copy of the project, so scenarios never share state
+#   a scenario whose worker crashes is restarted on a new worker, up to max_retries times
+#   a worker that crashes while starting is restarted up to max_retries times, after which
+#       the run is stopped
+#   engine: module providing GetApplicationExt, i.e. "powerfactory" or
+#       "powerfactory_automation.fake_powerfactory"
+#   engine_path: directory added to sys.path of the workers to import engine
+#   engine_kwargs: keyword arguments of GetApplicationExt
+#   project_name: project to copy, the active project if None
+#   output_dir: directory for extracted results, results are not extracted if None
+#   join_timeout: time (s) to wait for a worker process to exit before it is terminated
+#   calculate_load_flow: whether the load flow is calculated before the initial conditions of
+#       each scenario, see PowerFactorySession.run
+class ScenarioFarm:
+    def __init__(
+        self,
+        n_workers,
+        export_data,
+        engine="powerfactory",
+        engine_path=None,
+        engine_kwargs=None,
+        project_name=None,
+        results_file_name="farm_results",
+        output_dir=None,
+        formats=("npz",),
+        calculate_load_flow=True,
+        max_retries=2,
+        join_timeout=60,
+    ):
+        self.n_workers = n_workers
+        self.max_retries = max_retries
+        self.join_timeout = join_timeout
+        self.config = WorkerConfig(
+            engine,
+            engine_path,
+            dict(engine_kwargs or {}),
+            project_name,
+            export_data,
+            results_file_name,
+            output_dir,
+            tuple(formats),
+            calculate_load_flow,
+        )
+        # PowerFactory runs on windows, where processes are always spawned
+        self._context = mp.get_context("spawn")
+
+    def _start_worker(self, worker_id):
+        conn, worker_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker,
+            args=(worker_id, self.config, worker_conn),
+            daemon=True,
+        )
+        process.start()
+        worker_conn.close()
+        return {"process": process, "conn": conn, "task": None, "ready": False}
+
+    # waits for a worker process to exit, terminating it after join_timeout
+    def _stop_worker(self, worker):
+        worker["process"].join(timeout=self.join_timeout)
+        if worker["process"].is_alive():
+            worker["process"].terminate()
+            worker["process"].join()
+
+    # runs the scenarios and returns a ScenarioResult for each, in the order given
+    def run(self, scenarios):
+        scenarios = list(scenarios)
+        pending = deque(range(len(scenarios)))
+        attempts = [0] * len(scenarios)
+        results = [None] * len(scenarios)
+        n_done = 0
+
+        workers = [self._start_worker(i) for i in range(min(self.n_workers, len(scenarios)))]
+        # consecutive start-up crashes of each worker
+        startup_failures = [0] * len(workers)
+        try:
+            while n_done < len(scenarios):
+                # hand out scenarios to idle workers
+                for worker in workers:
+                    if worker["ready"] and worker["task"] is None and pending:
+                        index = pending.popleft()
+                        worker["task"] = index
+                        attempts[index] += 1
+                        worker["conn"].send((index, scenarios[index]))
+
+                # wait for a message or a worker to exit
+                ready = wait([worker["conn"] for worker in workers])
+                for worker_id, worker in enumerate(workers):
+                    if worker["conn"] not in ready:
+                        continue
+                    try:
+                        kind, data = worker["conn"].recv()
+                    except EOFError:
+                        kind, data = "crashed", None
+
+                    if kind == "setup_failed":
+                        raise RuntimeError(f"Worker {worker_id} failed to start:\n{data}")
+                    elif kind == "ready":
+                        worker["ready"] = True
+                        startup_failures[worker_id] = 0
+                    elif kind == "done":
+                        index, timings, paths = data
+                        results[index] = ScenarioResult(
+                            scenarios[index].name, "ok", worker_id, attempts[index], timings, paths, None
+                        )
+                        worker["task"] = None
+                        n_done += 1
+                    elif kind == "failed":
+                        index, error = data
+                        results[index] = ScenarioResult(
+                            scenarios[index].name, "failed", worker_id, attempts[index], {}, {}, error
+                        )
+                        worker["task"] = None
+                        n_done += 1
+                    else:
+                        # restart the crashed worker and retry its scenario
+                        self._stop_worker(worker)
+                        if not worker["ready"]:
+                            startup_failures[worker_id] += 1
+                            if startup_failures[worker_id] > self.max_retries:
+                                raise RuntimeError(
+                                    f"Worker {worker_id} crashed while starting "
+                                    f"{startup_failures[worker_id]} times, exit code "
+                                    f"{worker['process'].exitcode}"
+                                )
+                        index = worker["task"]
+                        if index is not None and attempts[index] > self.max_retries:
+                            results[index] = ScenarioResult(
+                                scenarios[index].name,
+                                "crashed",
+                                worker_id,
+                                attempts[index],
+                                {},
+                                {},
+                                f"Worker exited with code {worker['process'].exitcode}",
+                            )
+                            n_done += 1
+                        elif index is not None:
+                            pending.appendleft(index)
+                        worker["conn"].close()
+                        workers[worker_id] = self._start_worker(worker_id)
+        finally:
+            for worker in workers:
+                try:
+                    worker["conn"].send(None)
+                except OSError:
+                    pass
+            for worker in workers:
+                self._stop_worker(worker)
+
+        return results
+
+
+# saves the results of ScenarioFarm.run to csv
+def write_farm_results(output_path, results):
+    timing_keys = ["load_flow", "initialisation", "simulation", "wall"]
+    with open(output_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "status", "worker", "attempts"] + timing_keys)
+        for result in results:
+            writer.writerow(
+                [result.name, result.status, result.worker, result.attempts]
+                + [result.timings.get(key, "") for key in timing_keys]
+            )
@@ -0,0 +1,105 @@
+# Elements and variables exported from the IEEE 39 bus PowerFactory model.
+#
+# Elements are given as GetCalcRelevantObjects patterns so that they are only looked
+# up once a PowerFactorySession is available, not when this module is imported.
+
+# variables recorded by the computation time benchmarks
+benchmark_export_data = {
+    "ElmSym": {
+        "elms": "*.ElmSym",
+        "vars": [
+            "s:psi1d",
+            "s:psifd",
+            "s:psi1q",
+            "s:psi2q",
+            "s:speed",
+            "s:phi",
+            "s:psi1d:dt",
+            "s:psifd:dt",
+            "s:psi1q:dt",
+            "s:psi2q:dt",
+            "s:speed:dt",
+            "s:phi:dt",
+        ],
+    },
+    "ElmTerm": {
+        "elms": "*.ElmTerm",
+        "vars": ["m:u1", "m:phiu"],
+    },
+    "ElmLod": {
+        "elms": "*.ElmLod",
+        "vars": ["m:Psum:bus1", "m:Qsum:bus1"],
+    },
+    "IEEET1": {
+        "elms": "*AVR*.ElmDsl",
+        "vars": [
+            "s:xe",
+            "s:xr",
+            "s:xf",
+            "s:xa",
+            "s:xe:dt",
+            "s:xr:dt",
+            "s:xf:dt",
+            "s:xa:dt",
+        ],
+    },
+    "TGOV1": {
+        "elms": "*GOV*.ElmDsl",
+        "vars": ["s:pt", "s:x1", "s:pt:dt", "s:x1:dt"],
+    },
+}
+
+# variables recorded for the verification against RMSPowerSims.jl
+verification_export_data = {
+    "ElmSym": {
+        "elms": "*.ElmSym",
+        "vars": [
+            "s:xmt",
+            "s:P1",
+            "s:Q1",
+            "s:psi1d",
+            "s:psifd",
+            "s:psi1q",
+            "s:psi2q",
+            "s:speed",
+            "s:phi",
+            "s:psi1d:dt",
+            "s:psifd:dt",
+            "s:psi1q:dt",
+            "s:psi2q:dt",
+            "s:speed:dt",
+            "s:phi:dt",
+            "c:id",
+            "c:iq",
+        ],
+    },
+    "ElmTerm": {
+        "elms": "*.ElmTerm",
+        "vars": ["m:u1", "m:phiu"],
+    },
+    "ElmLod": {
+        "elms": "*.ElmLod",
+        "vars": ["m:Psum:bus1", "m:Qsum:bus1"],
+    },
+    "IEEET1": {
+        "elms": "*AVR*.ElmDsl",
+        "vars": [
+            "c:Vc",
+            "c:Vr",
+            "s:vf",
+            "s:uerrs",
+            "s:xe",
+            "s:xr",
+            "s:xf",
+            "s:xa",
+            "s:xe:dt",
+            "s:xr:dt",
+            "s:xf:dt",
+            "s:xa:dt",
+        ],
+    },
+    "TGOV1": {
+        "elms": "*GOV*.ElmDsl",
+        "vars": ["s:pt", "s:x1", "s:pt:dt", "s:x1:dt", "s:yi2"],
+    },
+}
@@ -0,0 +1,115 @@
+import hashlib
+import json
+from time import perf_counter
+
+# variable sets accepted by ElmRes, i.e. "s:" for signals and "m:" for calculation quantities
+VARIABLE_SETS = ("b", "c", "e", "m", "n", "r", "s", "t")
+
+# marker stored in the desc attribute of ElmRes objects configured by this module
+SCHEMA_MARKER = "powerfactory_automation results schema"
+
+
+# declarative definition of the variables exported per element class
+#   export_data: {set_name: {"elms": pattern or list of objects, "vars": [...]}}
+#   the definition is validated once and identified by a hash of its contents
+class ExportSpec:
+    def __init__(self, export_data):
+        self.sets = {}
+        for set_name, set_data in export_data.items():
+            if "elms" not in set_data or "vars" not in set_data:
+                raise ValueError(f"Export set {set_name} must define 'elms' and 'vars'")
+            variables = list(set_data["vars"])
+            if not variables:
+                raise ValueError(f"Export set {set_name} has no variables")
+            for var in variables:
+                if not isinstance(var, str) or var.split(":", 1)[0] not in VARIABLE_SETS:
+                    raise ValueError(
+                        f"Invalid variable {var!r} in export set {set_name}, expected e.g. 's:speed'"
+                    )
+            if len(set(variables)) != len(variables):
+                raise ValueError(f"Export set {set_name} contains duplicate variables")
+            self.sets[set_name] = {"elms": set_data["elms"], "vars": variables}
+
+        # elements given as lists of objects are identified by the element set hash
+        canonical = {
+            set_name: {
+                "elms": set_data["elms"] if isinstance(set_data["elms"], str) else None,
+                "vars": set_data["vars"],
+            }
+            for set_name, set_data in self.sets.items()
+        }
+        self.hash = hashlib.sha256(
+            json.dumps(canonical, sort_keys=True).encode()
+        ).hexdigest()
+
+    def __repr__(self):
+        return f"ExportSpec({list(self.sets)}, hash={self.hash[:12]})"
+
+
+# maps each element to the variables that should be recorded for it
+def _requested_variables(session, spec):
+    requested = {}
+    for set_name, set_data in spec.sets.items():
+        for elm in session.resolve_elements(set_data["elms"]):
+            variables = requested.setdefault(session.full_name(elm), (elm, []))[1]
+            variables.extend(var for var in set_data["vars"] if var not in variables)
+    return requested
+
+
+def _element_set_hash(requested):
+    names = sorted(requested)
+    return hashlib.sha256("\n".join(names).encode()).hexdigest()
+
+
+# configures an ElmRes object with the variables of an ExportSpec
+#   if the ElmRes was configured with the same spec and element set it is kept as is,
+#   otherwise only the monitors (IntMon objects) of changed elements are modified
+#   each monitor receives its full variable list in a single call
+def configure_results_file(session, results_file, spec):
+    tstart = perf_counter()
+    requested = _requested_variables(session, spec)
+    element_set_hash = _element_set_hash(requested)
+    signature = [SCHEMA_MARKER, spec.hash, element_set_hash]
+
+    timing = {
+        "results_file": results_file.loc_name,
+        "action": "kept",
+        "added": 0,
+        "updated": 0,
+        "removed": 0,
+    }
+
+    if results_file.GetAttribute("desc") != signature:
+        timing["action"] = "updated"
+
+        # Index existing monitors by element
+        monitors = {}
+        for monitor in results_file.GetContents("*.IntMon"):
+            elm = monitor.GetAttribute("obj_id")
+            key = elm.GetFullName() if elm is not None else None
+            if key not in requested or key in monitors:
+                monitor.Delete()
+                timing["removed"] += 1
+            else:
+                monitors[key] = monitor
+
+        # Add or update monitors of requested elements
+        for key, (elm, variables) in requested.items():
+            monitor = monitors.get(key)
+            if monitor is None:
+                monitor = results_file.CreateObject("IntMon", elm.loc_name)
+                monitor.SetAttribute("obj_id", elm)
+                monitor.SetAttribute("vars", variables)
+                timing["added"] += 1
+            elif list(monitor.GetAttribute("vars")) != variables:
+                monitor.SetAttribute("vars", variables)
+                timing["updated"] += 1
+
+        results_file.SetAttribute("desc", signature)
+        session.print_info(
+            f"Results file {timing['results_file']}: added {timing['added']}, updated {timing['updated']} and removed {timing['removed']} monitored elements"
+        )
+
+    timing["time"] = perf_counter() - tstart
+    session.setup_timings.append(timing)
+    return results_file
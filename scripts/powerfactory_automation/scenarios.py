@@ -0,0 +1,120 @@
+from .events import EventSpec
+
+
+# 3-phase short circuit at a terminal, optionally cleared at t_clear
+class ShortCircuit:
+    def __init__(self, bus_name, t_fault, t_clear=None):
+        self.bus_name = bus_name
+        self.t_fault = t_fault
+        self.t_clear = t_clear
+
+    def event_specs(self, session):
+        bus = session.get_object(f"*{self.bus_name}.ElmTerm")
+        event_specs = [
+            EventSpec(
+                f"Short Circuit - {bus.loc_name}",
+                "EvtShc",
+                bus,
+                {
+                    "time": self.t_fault,
+                    "i_shc": 0,  # 3 phase short circuit
+                },
+            )
+        ]
+        if self.t_clear is not None:
+            event_specs.append(
+                EventSpec(
+                    f"Short Circuit Clearance - {bus.loc_name}",
+                    "EvtShc",
+                    bus,
+                    {
+                        "time": self.t_clear,
+                        "i_shc": 4,  # clear 3 phase short circuit
+                    },
+                )
+            )
+        return event_specs
+
+    def __repr__(self):
+        return f"ShortCircuit({self.bus_name!r}, {self.t_fault}, {self.t_clear})"
+
+
+# step change in the demand of a load
+#   dP and dQ are given in percent of the load's demand, as used by EvtLod
+class LoadStep:
+    def __init__(self, load_name, t_step, dP, dQ=0):
+        self.load_name = load_name
+        self.t_step = t_step
+        self.dP = dP
+        self.dQ = dQ
+
+    def event_specs(self, session):
+        load = session.get_object(f"*{self.load_name}.ElmLod")
+        return [
+            EventSpec(
+                f"Load Event - {load.loc_name}",
+                "EvtLod",
+                load,
+                {"time": self.t_step, "dP": self.dP, "dQ": self.dQ},
+            )
+        ]
+
+    def __repr__(self):
+        return f"LoadStep({self.load_name!r}, {self.t_step}, {self.dP}, {self.dQ})"
+
+
+# a simulation run: a list of disturbances plus ComInc/ComSim settings
+#   a scenario without disturbances is a no disturbance run
+class Scenario:
+    def __init__(
+        self,
+        name,
+        disturbances=(),
+        sim_time=10.0,
+        com_inc_parameters=None,
+        com_sim_parameters=None,
+    ):
+        self.name = name
+        self.disturbances = list(disturbances)
+        self.sim_time = sim_time
+        self.com_inc_parameters = dict(com_inc_parameters or {})
+        self.com_sim_parameters = dict(com_sim_parameters or {})
+
+    def event_specs(self, session):
+        event_specs = []
+        for disturbance in self.disturbances:
+            event_specs.extend(disturbance.event_specs(session))
+        return event_specs
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, {self.disturbances}, sim_time={self.sim_time})"
+
+
+def no_disturbance(name="no_disturbance", **kwargs):
+    return Scenario(name, [], **kwargs)
+
+
+def short_circuit(bus_name, t_fault, t_clear=None, name=None, **kwargs):
+    if name is None:
+        name = f"short_circuit_{bus_name}"
+    return Scenario(name, [ShortCircuit(bus_name, t_fault, t_clear)], **kwargs)
+
+
+def load_step(load_name, t_step, dP, dQ=0, name=None, **kwargs):
+    if name is None:
+        name = f"load_step_{load_name}"
+    return Scenario(name, [LoadStep(load_name, t_step, dP, dQ)], **kwargs)
+
+
+# short circuits at each bus for each clearing time, i.e. for a contingency study
+#   disturbances: further disturbances applied in every scenario, i.e. a LoadStep
+def contingency_scenarios(bus_names, t_fault, clearing_times, disturbances=(), **kwargs):
+    return [
+        Scenario(
+            f"short_circuit_{bus_name}_{t_clear}",
+            [ShortCircuit(bus_name, t_fault, t_clear)] + list(disturbances),
+            **kwargs,
+        )
+        for bus_name in bus_names
+        for t_clear in clearing_times
+    ]
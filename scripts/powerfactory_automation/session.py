@@ -0,0 +1,166 @@
+from time import perf_counter
+
+from .events import apply_events
+from .results_schema import ExportSpec, configure_results_file
+
+
+# wrapper around a PowerFactory application that looks up objects once and reuses
+# the ElmRes and IntEvt objects of the active study case between runs
+class PowerFactorySession:
+    def __init__(self, app=None, study_case=None):
+        if app is None:
+            import powerfactory
+
+            app = powerfactory.GetApplication()
+        self.app = app
+        self.study_case = study_case if study_case is not None else app.GetActiveStudyCase()
+
+        # caches of PowerFactory objects
+        self._objects = {}
+        self._commands = {}
+        self._full_names = {}
+        self._results_files = {}
+        self._events_files = {}
+
+        # timings of results file setup, see results_schema.configure_results_file
+        self.setup_timings = []
+
+    def print_info(self, message):
+        self.app.PrintInfo(message)
+
+    ###########################################################
+    # object lookup
+    ###########################################################
+
+    # returns the calculation relevant objects matching pattern, i.e. "*.ElmSym"
+    def get_objects(self, pattern, include_out_of_service=0):
+        key = (pattern, include_out_of_service)
+        if key not in self._objects:
+            self._objects[key] = list(
+                self.app.GetCalcRelevantObjects(pattern, include_out_of_service)
+            )
+        return self._objects[key]
+
+    # returns the first calculation relevant object matching pattern
+    def get_object(self, pattern):
+        objects = self.get_objects(pattern)
+        if not objects:
+            raise LookupError(f"No calculation relevant object matches '{pattern}'")
+        return objects[0]
+
+    # returns a command object of the study case, i.e. "*.ComInc"
+    def get_command(self, pattern):
+        if pattern not in self._commands:
+            self._commands[pattern] = self.app.GetFromStudyCase(pattern)
+        return self._commands[pattern]
+
+    # returns the full name of an object, used to identify elements between sessions
+    def full_name(self, obj):
+        key = id(obj)
+        if key not in self._full_names:
+            self._full_names[key] = (obj, obj.GetFullName())
+        return self._full_names[key][1]
+
+    # element definitions in export_data are either a pattern or a list of objects
+    def resolve_elements(self, elms):
+        if isinstance(elms, str):
+            return self.get_objects(elms)
+        return list(elms)
+
+    # clears the cached objects, required if the network model is modified
+    def clear_cache(self):
+        self._objects.clear()
+        self._commands.clear()
+        self._full_names.clear()
+        self._results_files.clear()
+        self._events_files.clear()
+
+    # returns the object of the study case with the given name and class, i.e. an IntVec
+    #   used as a buffer, creating it if required
+    def get_or_create(self, name, class_name):
+        search = self.study_case.GetContents(f"{name}.{class_name}")
+        if search:
+            return search[0]
+        obj = self.study_case.CreateObject(class_name)
+        obj.loc_name = name
+        return obj
+
+    ###########################################################
+    # ElmRes and IntEvt objects
+    ###########################################################
+
+    # returns an ElmRes object configured with the elements and variables in export_data
+    #   export_data: an ExportSpec or {set_name: {"elms": pattern or list of objects, "vars": [...]}}
+    #   the ElmRes is only modified if export_data or the element set has changed
+    def results_file(self, name, export_data):
+        spec = export_data if isinstance(export_data, ExportSpec) else ExportSpec(export_data)
+        if name not in self._results_files:
+            self._results_files[name] = self.get_or_create(name, "ElmRes")
+        return configure_results_file(self, self._results_files[name], spec)
+
+    # returns the IntEvt object with the given name, creating it if required
+    def events_file(self, name):
+        if name not in self._events_files:
+            self._events_files[name] = self.get_or_create(name, "IntEvt")
+        return self._events_files[name]
+
+    ###########################################################
+    # simulation
+    ###########################################################
+
+    # configures the events, ComInc and ComSim objects for a scenario
+    def prepare(self, scenario, results_file, events_file_name="rms_events"):
+        events_file = self.events_file(events_file_name)
+        apply_events(events_file, scenario.event_specs(self))
+
+        # configure ComInc
+        com_inc = self.get_command("*.ComInc")
+        com_inc.SetAttribute("p_event", events_file)
+        com_inc.SetAttribute("p_resvar", results_file)
+        for param, value in scenario.com_inc_parameters.items():
+            com_inc.SetAttribute(param, value)
+
+        # configure ComSim
+        com_sim = self.get_command("*.ComSim")
+        com_sim.SetAttribute("tstop", scenario.sim_time)
+        for param, value in scenario.com_sim_parameters.items():
+            com_sim.SetAttribute(param, value)
+
+        return events_file
+
+    # calculates the load flow
+    def calculate_load_flow(self):
+        if self.get_command("*.ComLdf").Execute() != 0:
+            raise RuntimeError("ComLdf failed")
+
+    # calculates initial conditions of a prepared scenario
+    def initialise(self):
+        if self.get_command("*.ComInc").Execute() != 0:
+            raise RuntimeError("ComInc failed")
+
+    # runs the RMS simulation of a prepared scenario
+    def simulate(self):
+        if self.get_command("*.ComSim").Execute() != 0:
+            raise RuntimeError("ComSim failed")
+
+    # prepares and runs a scenario, returns the time taken by each step
+    #   the load flow is calculated before the initial conditions, as in the original scripts,
+    #   unless calculate_load_flow is False (i.e. for benchmarks that time ComInc and ComSim only)
+    def run(self, scenario, results_file, calculate_load_flow=True):
+        self.prepare(scenario, results_file)
+
+        timings = {}
+        if calculate_load_flow:
+            tstart = perf_counter()
+            self.calculate_load_flow()
+            timings["load_flow"] = perf_counter() - tstart
+
+        tstart = perf_counter()
+        self.initialise()
+        timings["initialisation"] = perf_counter() - tstart
+
+        tstart = perf_counter()
+        self.simulate()
+        timings["simulation"] = perf_counter() - tstart
+
+        return timings
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from powerfactory_automation import (
+    LoadStep,
+    ScenarioFarm,
+    contingency_scenarios,
+    write_farm_results,
+)
+from powerfactory_automation.ieee39_exports import verification_export_data
+
+# Runs short circuits at every bus of the IEEE 39 bus system for a range of clearing
+# times, distributed over several PowerFactory engine processes.
+
+# input options
+n_workers = 4
+bus_names = [f"Bus {i:02d}" for i in range(1, 40)]
+t_fault = 0.1
+clearing_times = [0.15, 0.2, 0.25, 0.3]
+sim_time = 10.0
+use_fake_engine = True  # run against fake_powerfactory, no PowerFactory licence required
+package_dir = Path(__file__).parent.parent
+output_dir = package_dir / "data" / "contingency_results"
+
+if __name__ == "__main__":
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    scenarios = contingency_scenarios(
+        bus_names,
+        t_fault,
+        clearing_times,
+        disturbances=[LoadStep("Load 16", 1.5, 20)],
+        sim_time=sim_time,
+        com_inc_parameters={"iopt_adapt": 0, "dtgrd": 10},
+    )
+
+    farm = ScenarioFarm(
+        n_workers,
+        verification_export_data,
+        engine="powerfactory_automation.fake_powerfactory" if use_fake_engine else "powerfactory",
+        output_dir=output_dir,
+    )
+    results = farm.run(scenarios)
+
+    write_farm_results(output_dir / "contingency_timings.csv", results)
+    for status in ("ok", "failed", "crashed"):
+        print(f"{status}: {sum(result.status == status for result in results)}")
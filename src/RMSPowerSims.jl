@@ -3,12 +3,19 @@ module RMSPowerSims
 using CSV
 using DataFrames
 using DifferentialEquations
+using ForwardDiff
 using JSON
 using Ipopt
+using LinearAlgebra
+using Mmap
 using NLsolve
 using OrderedCollections
 using Plots
 using PowerModels
+using PrecompileTools
+using Serialization
+using SHA
+using SparseArrays
 using Sundials
 
 
@@ -23,29 +30,53 @@ include("component_models/loads/ZIPLoad.jl")
 include("component_models/Blocks.jl")
 include("component_models/COIReferenceFrequency.jl")
 include("component_models/NodeModels.jl")
+include("component_models/NetworkModel.jl")
+include("component_models/KronReduction.jl")
 
 include("general/SolutionHandling.jl")
+include("general/OutputRecording.jl")
+include("general/PowerFactoryResults.jl")
 include("general/CalculateInitialConditions.jl")
+include("general/LoadFlow.jl")
 include("general/LoadOrSaveNetwork.jl")
 include("general/VariableMapping.jl")
 include("general/GenericFunctions.jl")
 include("general/Plotting.jl")
 include("general/PreparePowerSystemSimulation.jl")
+include("general/SimulationCache.jl")
 include("general/RunRMSSimulation.jl")
+include("general/EventHandling.jl")
+include("general/Scenarios.jl")
+include("general/Ensembles.jl")
+include("general/SystemJacobian.jl")
+include("general/CompiledResidual.jl")
 include("general/RecalculateSystemState.jl")
+include("general/Profiling.jl")
 
 include("disturbances/BusFault.jl")
 include("disturbances/ClearBusFault.jl")
 include("disturbances/LoadStep.jl")
 
+include("general/PrecompileWorkload.jl")
+
 export plot_res, plot_res!, plot_res_dev_init, plot_res_dev_init!
-export prepare_simulation
-export run_RMS_simulation
-export add_simulation_results!
+export prepare_simulation, SimulationCache, invalidate_cache!, clear_cache!
+export solve_load_flow!
+export run_RMS_simulation, EventBatch
+export SimulationProfile, component_timings, save_profile, merge_profile!
+export compile_residual!, clear_compiled_residuals!, CompiledResidual
+export run_scenarios, scenario_copy
+export run_ensemble, EnsembleScenario, EnsembleResults, set_parameters!
+export add_simulation_results!, SimulationResults, result_variable
+export OutputSpecification, coi_frequency
 export ComponentModel
-export NodeModel, GeneratorModel, ControllerModel, LoadModel, AVRModel, GovernorModel
+export KronReduction, add_network_reduction!, reconstruct_bus_voltages
+export NodeModel, NetworkModel, GeneratorModel, ControllerModel, LoadModel, AVRModel, GovernorModel
 export SixthOrderModel, IEEET1, TGOV1, ConstantExcitation, ConstantMechanicalPower, ZIPLoad
 export Disturbance
 export BusFault, ClearBusFault, LoadStep
 export parse_network_json
+export VariableRegistry, save_variable_registry, load_variable_registry
+export read_pf_header, read_pf_results, foreach_pf_chunk, convert_pf_results, open_pf_binary
+export ResultsStreamWriter
 end
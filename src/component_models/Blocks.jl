@@ -20,20 +20,16 @@ Implementation details are derived from "Recommended Practice for Excitation Sys
 ``y_{min} ≤ y ≤ y_{max}``
 """
 function first_order_nonwindup(y, dy, u_in, T, y_min, y_max)
-    if y >= y_max # at max saturation
-        if u_in <= y # needed to return from saturated state
-            derivative_equation = dy - (u_in - y) / T
-        else
-            derivative_equation = dy
-        end
-    elseif y <= y_min # at min saturation
-        if u_in <= y # needed to return from saturated state
-            derivative_equation = dy - (u_in - y) / T
-        else
-            derivative_equation = dy
-        end
-    else # not saturated
-        derivative_equation = dy - (u_in - y) / T
-    end
-    return derivative_equation
-end
\ No newline at end of file
+    # at max or min saturation, unless returning from the saturated state (u_in <= y)
+    saturated = ((y >= y_max) | (y <= y_min)) & (u_in > y)
+    return conditional_value(saturated, dy, dy - (u_in - y) / T)
+end
+
+"""
+    conditional_value(condition, a, b)
+
+Returns `a` if `condition` is true, and otherwise `b`.
+
+Both `a` and `b` are evaluated. Component models select between expressions with `conditional_value` rather than `if` statements, so that their equations can be traced by `compile_residual!`.
+"""
+conditional_value(condition::Bool, a, b) = ifelse(condition, a, b)
\ No newline at end of file
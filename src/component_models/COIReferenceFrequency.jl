@@ -8,8 +8,8 @@ Type definition for the center of inertia reference frequency.
 - `M_vec`: Vector of inertia constants of each generator.
 """
 struct COIReferenceFrequency <: ComponentModel
-    Mt
-    M_vec
+    Mt::Float64
+    M_vec::Vector{Float64}
 end
 
 # info functions
@@ -48,10 +48,15 @@ function update!(out, du, u, model::COIReferenceFrequency, t)
 
     # Extract variables from input vector 'u' and 'du'
     ω_coi = u[1]
-    ω = u[2:end]
+
+    # Inertia weighted sum of generator speeds (ω = u[2:end])
+    Mω = zero(eltype(u))
+    for i in eachindex(M_vec)
+        Mω += M_vec[i] * u[i+1]
+    end
 
     # Equations
-    out[1] = -ω_coi + (1 / Mt) * sum([M_vec[i] * ω[i] for i in eachindex(ω)])
+    out[1] = -ω_coi + (1 / Mt) * Mω
 end
 
 function make_dynamic_model(net::Dict{String,Any}, nothing, ::Type{COIReferenceFrequency})
@@ -71,16 +76,17 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     nothing,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{COIReferenceFrequency},
 )
-    # Get indexes of ω for each generator
+    # Get indexes of ω_coi and of ω for each generator
+    ω_coi_ind = find_variable_index(var_list, "ω_coi")
     ω_inds = find_all_variable_indexes(var_list, "ω")
 
-    # Define index pointers (ω_coi is defined as always 1)
-    inds_out = [1]
+    # Define index pointers (u = [ω_coi; ω])
+    inds_out = [ω_coi_ind]
     inds_du = []
-    inds_u = ω_inds
+    inds_u = [ω_coi_ind; ω_inds]
 
     return inds_out, inds_du, inds_u
 end
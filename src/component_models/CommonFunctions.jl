@@ -71,23 +71,10 @@ Calculates the initial conditions for a component model.
 """
 function generate_ic!() end
 
-"""
-    algebraic_equations!(F, vars, states, model::ComponentModel)
-
-Implementation of the algebraic equations that define a component model. Used during recalculation of system state.
-
-# Arguments
-- `F`: The output vector that contains the residuals of the algebraic equations.
-- `vars`: The algebraic variables of the component model.
-- `states`: The state variables relevant to calculation of the component model algebraic variables.
-- `model`: An instance of the component model.
-"""
-function algebraic_equations!() end
-
 """
     calculate_state_derivatives!(du, u, model::ComponentModel, inds_du, inds_u)
 
-Calculates the derivatives of the state variables of a component model and updates the derivative vector.
+Calculates the derivatives of the state variables of a component model and updates the derivative vector. Used during recalculation of system state, after the algebraic variables have been recalculated from the equations implemented by `update!`.
 
 # Arguments
 - `du`: The derivative vector.
@@ -0,0 +1,209 @@
+###########################################################################
+# Passive buses
+###########################################################################
+"""
+    add_network_reduction!(net::Dict{String,Any})
+
+Selects the passive buses of the network (buses without generators or loads) for elimination by Kron reduction, by listing them in `net["eliminated_buses"]`.
+
+The variables of the eliminated buses are then removed from the simulation variables (see `retained_buses`), and the network equations are those of the retained buses with the reduced admittance matrix (see `KronReduction`). Called by `prepare_simulation` with `reduce_network=true`.
+"""
+function add_network_reduction!(net::Dict{String,Any})
+    num_buses = length(keys(net["bus"]))
+    net["eliminated_buses"] = Int64[
+        bus_ind for bus_ind = 1:num_buses
+        if isempty(get_gens_connected_to_bus(net, bus_ind)) && isempty(get_loads_connected_to_bus(net, bus_ind))
+    ]
+    return net["eliminated_buses"]
+end
+
+"""
+    retained_buses(net::Dict{String,Any})
+
+Returns the indexes of the buses whose voltages are simulation variables, i.e. all buses except those eliminated by a network reduction (see `add_network_reduction!`).
+"""
+function retained_buses(net::Dict{String,Any})
+    num_buses = length(keys(net["bus"]))
+    return haskey(net, "eliminated_buses") ? setdiff(1:num_buses, net["eliminated_buses"]) : collect(1:num_buses)
+end
+
+###########################################################################
+# Reduced admittance matrix
+###########################################################################
+function KronReduction(net::Dict{String,Any})
+    haskey(net, "Y") ? nothing : add_admittance_matrix!(net)
+    Y = SparseMatrixCSC{ComplexF64,Int64}(net["Y"])
+    num_buses = size(Y, 1)
+    retained = retained_buses(net)
+    bus_position = zeros(Int64, num_buses)
+    bus_position[retained] = 1:length(retained)
+
+    # Clusters of connected eliminated buses, by depth first search over the connections
+    connections = abs.(Y) + abs.(transpose(Y))
+    cluster_of = zeros(Int64, num_buses)
+    (clusters, neighbours) = (Vector{Int64}[], Vector{Int64}[])
+    for bus_ind in net["eliminated_buses"]
+        cluster_of[bus_ind] != 0 && continue
+        push!(clusters, Int64[])
+        push!(neighbours, Int64[])
+        c = length(clusters)
+        cluster_of[bus_ind] = c
+        stack = [bus_ind]
+        while !isempty(stack)
+            i = pop!(stack)
+            push!(clusters[c], i)
+            for j in rowvals(connections)[nzrange(connections, i)]
+                if bus_position[j] != 0
+                    push!(neighbours[c], j)
+                elseif cluster_of[j] == 0
+                    cluster_of[j] = c
+                    push!(stack, j)
+                end
+            end
+        end
+        sort!(clusters[c])
+        sort!(unique!(neighbours[c]))
+    end
+    contributions = [cluster_contribution(Y, clusters[c], neighbours[c]) for c in eachindex(clusters)]
+
+    # Reduced admittance matrix, with an entry for every pair of the adjacent buses of each cluster
+    (rows, cols, values) = (Int64[], Int64[], ComplexF64[])
+    for col in retained, k in nzrange(Y, col)
+        row = rowvals(Y)[k]
+        if bus_position[row] != 0
+            push!(rows, bus_position[row])
+            push!(cols, bus_position[col])
+            push!(values, nonzeros(Y)[k])
+        end
+    end
+    for c in eachindex(clusters), (a, row) in enumerate(neighbours[c]), (b, col) in enumerate(neighbours[c])
+        push!(rows, bus_position[row])
+        push!(cols, bus_position[col])
+        push!(values, contributions[c][a, b])
+    end
+    # Stored by rows (the columns of its transpose), as in NetworkModel
+    Y_rows = sparse(cols, rows, values, length(retained), length(retained))
+
+    # Stored entry of each pair of adjacent buses of each cluster
+    entries = [
+        [
+            nzrange(Y_rows, bus_position[row])[searchsortedfirst(view(rowvals(Y_rows), nzrange(Y_rows, bus_position[row])), bus_position[col])]
+            for row in neighbours[c], col in neighbours[c]
+        ]
+        for c in eachindex(clusters)
+    ]
+
+    return KronReduction(
+        Y,
+        retained,
+        bus_position,
+        clusters,
+        neighbours,
+        cluster_of,
+        Y_rows.colptr,
+        rowvals(Y_rows),
+        entries,
+        nonzeros(Y_rows),
+        contributions,
+        zeros(Bool, num_buses),
+    )
+end
+
+# Contribution of a cluster to the admittances between its adjacent buses, -Y_NC Y_CC^-1 Y_CN
+#   cluster contains the buses of the cluster that are not short-circuited
+function cluster_contribution(Y, cluster, neighbours)
+    isempty(cluster) && return zeros(ComplexF64, length(neighbours), length(neighbours))
+    return -Matrix(Y[neighbours, cluster]) * (Matrix(Y[cluster, cluster]) \ Matrix(Y[cluster, neighbours]))
+end
+
+unfaulted_buses(reduction::KronReduction, c) = filter(bus_ind -> !reduction.faulted[bus_ind], reduction.clusters[c])
+
+"""
+    set_bus_fault!(model::NetworkModel, bus_ind, faulted::Bool)
+
+Applies (`faulted = true`) or clears a short circuit at a bus of a `NetworkModel`.
+
+A retained bus is flagged in `faulted`. For a bus eliminated by a `KronReduction`, the contribution of its cluster is recalculated without the faulted buses (whose voltage is zero), and the admittances of the entries between the adjacent buses of the cluster are updated. Only the cluster of the bus is recalculated, so applying or clearing the fault does not depend on the size of the network.
+"""
+function set_bus_fault!(model::NetworkModel, bus_ind, faulted::Bool)
+    reduction = model.reduction
+    if isnothing(reduction)
+        model.faulted[bus_ind] = faulted
+        return model
+    elseif reduction.bus_position[bus_ind] != 0
+        model.faulted[reduction.bus_position[bus_ind]] = faulted
+        return model
+    end
+
+    reduction.faulted[bus_ind] = faulted
+    c = reduction.cluster_of[bus_ind]
+    contribution = cluster_contribution(reduction.Y, unfaulted_buses(reduction, c), reduction.neighbours[c])
+    for (k, idx) in enumerate(reduction.entries[c])
+        reduction.Y_values[idx] += contribution[k] - reduction.contributions[c][k]
+        model.Y_mag[idx] = abs(reduction.Y_values[idx])
+        model.α[idx] = angle(reduction.Y_values[idx])
+    end
+    reduction.contributions[c] = contribution
+    return model
+end
+
+# Copy of the data modified by faults, for scenario_copy
+Base.copy(reduction::KronReduction) = KronReduction(
+    reduction.Y,
+    reduction.retained_buses,
+    reduction.bus_position,
+    reduction.clusters,
+    reduction.neighbours,
+    reduction.cluster_of,
+    reduction.row_ptr,
+    reduction.connected_bus,
+    reduction.entries,
+    copy(reduction.Y_values),
+    copy(reduction.contributions),
+    copy(reduction.faulted),
+)
+
+###########################################################################
+# Eliminated bus voltages
+###########################################################################
+"""
+    eliminated_bus_voltages!(V, θ, reduction::KronReduction)
+
+Calculates the voltage magnitudes `V` and angles `θ` of the eliminated buses from those of the retained buses (indexed by bus), `V_C = -Y_CC^-1 Y_CN V_N` for each cluster. The voltages of faulted eliminated buses are zero.
+"""
+function eliminated_bus_voltages!(V, θ, reduction::KronReduction)
+    for c in eachindex(reduction.clusters)
+        (cluster, neighbours) = (unfaulted_buses(reduction, c), reduction.neighbours[c])
+        for bus_ind in reduction.clusters[c]
+            (V[bus_ind], θ[bus_ind]) = (0.0, 0.0)
+        end
+        isempty(cluster) && continue
+
+        V_neighbours = V[neighbours] .* cis.(θ[neighbours])
+        V_cluster = -(Matrix(reduction.Y[cluster, cluster]) \ (Matrix(reduction.Y[cluster, neighbours]) * V_neighbours))
+        V[cluster] = abs.(V_cluster)
+        θ[cluster] = angle.(V_cluster)
+    end
+    return V, θ
+end
+
+"""
+    reconstruct_bus_voltages(power_system_model::PowerSystemModel, u)
+
+Returns the voltage magnitudes and angles `(V, θ)` of all buses (indexed by bus), including the buses eliminated by the `KronReduction` of the network model, for the variables `u` and the current faults of the power system model.
+"""
+function reconstruct_bus_voltages(power_system_model::PowerSystemModel, u)
+    network = power_system_model.component_list[findfirst(n -> n.model isa NetworkModel, power_system_model.component_list)]
+    (model, inds_u) = (network.model, network.inds_u)
+    reduction = model.reduction
+    bus_inds = isnothing(reduction) ? (1:model.n_buses) : reduction.retained_buses
+
+    num_buses = isnothing(reduction) ? model.n_buses : length(reduction.bus_position)
+    (V, θ) = (zeros(num_buses), zeros(num_buses))
+    for (p, bus_ind) in enumerate(bus_inds)
+        V[bus_ind] = u[inds_u[p]]
+        θ[bus_ind] = u[inds_u[model.n_buses+p]]
+    end
+    isnothing(reduction) ? nothing : eliminated_bus_voltages!(V, θ, reduction)
+    return V, θ
+end
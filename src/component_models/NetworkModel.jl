@@ -0,0 +1,251 @@
+"""
+    NetworkModel <: ComponentModel
+
+Type definition for the network equations of all nodes in a power system, evaluated as a single sparse kernel.
+
+The admittance matrix is stored in compressed sparse row form, so that the connections of each node are contiguous.
+
+# Fields
+- `n_buses`: Number of buses in the network
+- `row_ptr`: The connections of bus `b` are stored at `row_ptr[b]:row_ptr[b+1]-1`
+- `connected_bus`: Index of the connected bus of each connection
+- `Y_mag`: Magnitude of the admittance of each connection (p.u. on system base)
+- `α`: Angle of the admittance of each connection (rad)
+- `injection_bus`: Bus of each power injection (generators followed by loads)
+- `injection_sign`: Sign of each power injection, 1 for generators and -1 for loads
+- `faulted`: Indicates whether each bus is short-circuited by a `BusFault`
+- `reduction`: The `KronReduction` of the passive buses of the network, or `nothing`. If the network is reduced, the buses of the model are the retained buses, and the admittance matrix is the reduced admittance matrix.
+
+# Note
+- Buses are indexed in the order of the rows of the admittance matrix, which is assumed to match the bus indexes of the network data dictionary (as for `NodeModel`), or of the retained buses of a reduced network.
+- Faults are applied and cleared with `set_bus_fault!`.
+"""
+struct NetworkModel <: ComponentModel
+    n_buses::Int64
+    row_ptr::Vector{Int64}
+    connected_bus::Vector{Int64}
+    Y_mag::Vector{Float64}
+    α::Vector{Float64}
+    injection_bus::Vector{Int64}
+    injection_sign::Vector{Float64}
+    faulted::Vector{Bool}
+    reduction::Union{Nothing,KronReduction}
+end
+
+# Constructor without network reduction
+NetworkModel(n_buses, row_ptr, connected_bus, Y_mag, α, injection_bus, injection_sign, faulted) =
+    NetworkModel(n_buses, row_ptr, connected_bus, Y_mag, α, injection_bus, injection_sign, faulted, nothing)
+
+variables(::Type{NetworkModel}) = ["V", "θ"]
+differential_variables(::Type{NetworkModel}) = []
+
+"""
+    update!(out, du, u, model::NetworkModel, t)
+
+Implements the algebraic equations for all nodes in a power system.
+
+The equations of each node are those of `NodeModel`. The sums over connected buses are evaluated by a single loop over the stored entries of the sparse admittance matrix.
+
+# Variables
+### Algebraic Variables
+- `V_b`: Voltage magnitude of each bus (p.u. on system base)
+- `θ_b`: Voltage angle of each bus (rad)
+
+### External Variables
+- `Pg_i`, `Qg_i` : Active and reactive power output of each generator (p.u. on system base)
+- `Pd_i`, `Qd_i` : Active and reactive power demand of each load (p.u. on system base)
+
+# Equations
+
+For each bus `i`
+
+`` 0 = \\sum_{k \\in gens_i}P_{gk} - \\sum_{k \\in loads_i}P_{dk} - \\sum_{k \\in connections_i} |V_i| |V_k| Y_{mag,ik} cos(\\theta_i - \\theta_k - \\alpha_{ik})
+``
+
+`` 0 = \\sum_{k \\in gens_i}Q_{gk} - \\sum_{k \\in loads_i}Q_{dk} - \\sum_{k \\in connections_i} |V_i| |V_k| Y_{mag,ik} sin(\\theta_i - \\theta_k - \\alpha_{ik})
+``
+
+For a bus `i` that is short-circuited by a `BusFault`, the equations are replaced by those of `BusFaultModel`
+
+``V_i = 0``
+
+``θ_i = 0``
+"""
+function update!(out, du, u, model::NetworkModel, t)
+    network_equations!(out, u, model)
+end
+
+# Equations of all nodes
+#   u = [V; θ; P injections; Q injections], out = [P balance; Q balance]
+function network_equations!(out, u, model::NetworkModel)
+    # Extract parameters directly from the model
+    n_buses, row_ptr, connected_bus, Y_mag, α = model.n_buses, model.row_ptr, model.connected_bus, model.Y_mag, model.α
+    injection_bus, injection_sign, faulted = model.injection_bus, model.injection_sign, model.faulted
+    n_injections = length(injection_bus)
+
+    # Power injected by generators and drawn by loads
+    for b = 1:2*n_buses
+        out[b] = 0.0
+    end
+    for j = 1:n_injections
+        b = injection_bus[j]
+        out[b] += injection_sign[j] * u[2*n_buses+j]
+        out[n_buses+b] += injection_sign[j] * u[2*n_buses+n_injections+j]
+    end
+
+    # Power flowing into the network
+    for b = 1:n_buses
+        if faulted[b]
+            out[b] = u[b]
+            out[n_buses+b] = u[n_buses+b]
+            continue
+        end
+
+        (V_b, θ_b) = (u[b], u[n_buses+b])
+        P = 0.0
+        Q = 0.0
+        for idx = row_ptr[b]:row_ptr[b+1]-1
+            k = connected_bus[idx]
+            (s, c) = sincos(θ_b - u[n_buses+k] - α[idx])
+            P += u[k] * Y_mag[idx] * c
+            Q += u[k] * Y_mag[idx] * s
+        end
+        out[b] -= V_b * P
+        out[n_buses+b] -= V_b * Q
+    end
+end
+
+function make_dynamic_model(net::Dict{String,Any}, nothing, ::Type{NetworkModel})
+    if haskey(net, "eliminated_buses")
+        # Reduced admittance matrix of the retained buses, stored by rows
+        reduction = KronReduction(net)
+        (row_ptr, connected_bus, Y_values) = (reduction.row_ptr, reduction.connected_bus, reduction.Y_values)
+        bus_position = reduction.bus_position
+    else
+        # Store admittance matrix by rows (the columns of its transpose)
+        reduction = nothing
+        Y_rows = sparse(transpose(net["Y"]))
+        (row_ptr, connected_bus, Y_values) = (Y_rows.colptr, rowvals(Y_rows), nonzeros(Y_rows))
+        bus_position = 1:size(Y_rows, 2)
+    end
+    n_buses = length(row_ptr) - 1
+
+    # Generator injections, followed by load demands
+    num_gens = length(keys(net["gen"]))
+    num_loads = length(keys(net["load"]))
+    injection_bus = [
+        [bus_position[net["gen"]["$gen_ind"]["gen_bus"]] for gen_ind = 1:num_gens]
+        [bus_position[net["load"]["$load_ind"]["load_bus"]] for load_ind = 1:num_loads]
+    ]
+    injection_sign = [ones(num_gens); -ones(num_loads)]
+
+    return NetworkModel(
+        n_buses,
+        row_ptr,
+        connected_bus,
+        abs.(Y_values),
+        angle.(Y_values),
+        injection_bus,
+        injection_sign,
+        zeros(Bool, n_buses),
+        reduction,
+    )
+end
+
+function make_pointers_to_simulation_variables(
+    net::Dict{String,Any},
+    nothing,
+    var_list::AbstractVector{String},
+    ::Type{NetworkModel},
+)
+    # Extract bus voltage indexes (of the retained buses, if the network is reduced)
+    bus_inds = retained_buses(net)
+    num_gens = length(keys(net["gen"]))
+    num_loads = length(keys(net["load"]))
+    V_inds = find_variable_indexes(var_list, ["V_$bus_ind" for bus_ind in bus_inds])
+    θ_inds = find_variable_indexes(var_list, ["θ_$bus_ind" for bus_ind in bus_inds])
+
+    # Output vector indexes (one active and one reactive power balance per bus)
+    inds_out = [V_inds; θ_inds]
+    inds_du = []
+
+    # Input vector indexes, in the order of NetworkModel.injection_bus
+    inds_u = [
+        V_inds
+        θ_inds
+        find_variable_indexes(var_list, ["Pg_$gen_ind" for gen_ind = 1:num_gens])
+        find_variable_indexes(var_list, ["Pd_$load_ind" for load_ind = 1:num_loads])
+        find_variable_indexes(var_list, ["Qg_$gen_ind" for gen_ind = 1:num_gens])
+        find_variable_indexes(var_list, ["Qd_$load_ind" for load_ind = 1:num_loads])
+    ]
+
+    return inds_out, inds_du, inds_u
+end
+
+#######################################################################
+# JACOBIAN
+#######################################################################
+# Sparsity pattern: each bus depends on the voltages of its connected buses and its injections
+function add_sparsity!(rows, cols, component_model::ComponentModelData, model::NetworkModel)
+    (inds_out, inds_u) = (component_model.inds_out, component_model.inds_u)
+    (n_buses, n_injections) = (model.n_buses, length(model.injection_bus))
+
+    for b = 1:n_buses
+        for idx = model.row_ptr[b]:model.row_ptr[b+1]-1
+            k = model.connected_bus[idx]
+            for row in (inds_out[b], inds_out[n_buses+b]), col in (inds_u[k], inds_u[n_buses+k])
+                push!(rows, row)
+                push!(cols, col)
+            end
+        end
+    end
+    for j = 1:n_injections
+        b = model.injection_bus[j]
+        push!(rows, inds_out[b], inds_out[n_buses+b])
+        push!(cols, inds_u[2*n_buses+j], inds_u[2*n_buses+n_injections+j])
+    end
+end
+
+# Analytic Jacobian of the network equations (the network equations contain no derivatives)
+function add_component_jacobian!(J, du, u, component_model::ComponentModelData, model::NetworkModel, gamma, t)
+    (inds_out, inds_u) = (component_model.inds_out, component_model.inds_u)
+    (n_buses, n_injections) = (model.n_buses, length(model.injection_bus))
+    V(k) = u[inds_u[k]]
+    θ(k) = u[inds_u[n_buses+k]]
+
+    for b = 1:n_buses
+        (row_P, row_Q) = (inds_out[b], inds_out[n_buses+b])
+        (col_V_b, col_θ_b) = (inds_u[b], inds_u[n_buses+b])
+        if model.faulted[b]
+            add_to_jacobian!(J, row_P, col_V_b, 1.0)
+            add_to_jacobian!(J, row_Q, col_θ_b, 1.0)
+            continue
+        end
+
+        V_b = V(b)
+        (P, Q) = (0.0, 0.0)
+        for idx = model.row_ptr[b]:model.row_ptr[b+1]-1
+            k = model.connected_bus[idx]
+            (s, c) = model.Y_mag[idx] .* sincos(θ(b) - θ(k) - model.α[idx])
+            P += V(k) * c
+            Q += V(k) * s
+            (col_V, col_θ) = (inds_u[k], inds_u[n_buses+k])
+
+            add_to_jacobian!(J, row_P, col_V, -V_b * c)
+            add_to_jacobian!(J, row_Q, col_V, -V_b * s)
+            add_to_jacobian!(J, row_P, col_θ, -V_b * V(k) * s)
+            add_to_jacobian!(J, row_Q, col_θ, V_b * V(k) * c)
+            add_to_jacobian!(J, row_P, col_θ_b, V_b * V(k) * s)
+            add_to_jacobian!(J, row_Q, col_θ_b, -V_b * V(k) * c)
+        end
+        add_to_jacobian!(J, row_P, col_V_b, -P)
+        add_to_jacobian!(J, row_Q, col_V_b, -Q)
+    end
+
+    for j = 1:n_injections
+        b = model.injection_bus[j]
+        model.faulted[b] && continue
+        add_to_jacobian!(J, inds_out[b], inds_u[2*n_buses+j], model.injection_sign[j])
+        add_to_jacobian!(J, inds_out[n_buses+b], inds_u[2*n_buses+n_injections+j], model.injection_sign[j])
+    end
+end
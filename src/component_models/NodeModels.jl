@@ -72,50 +72,67 @@ variables(::Type{NodeModel{G,L}}) where {G,L} = variables(NodeModel)
 differential_variables(::Type{NodeModel}) = []
 differential_variables(::Type{NodeModel{G,L}}) where {G,L} = differential_variables(NodeModel)
 
-function update!(out, du, u, model::NodeModel{NoGen,NoLoad}, t)
+# Active and reactive power flowing from the node into the network
+#   u starts with the V and θ of the connected nodes, as ordered in make_pointers_to_simulation_variables
+function network_power_flows(u, model::NodeModel)
     # Extract parameters directly from the model
-    i, n_connections, Y_mag, α, n_gens, n_loads = model.local_i, model.n_connections, model.Y_mag, model.α, model.n_gens, model.n_loads
+    i, n_connections, Y_mag, α = model.local_i, model.n_connections, model.Y_mag, model.α
+
+    # Sum over connected nodes without allocating
+    (V_i, θ_i) = (u[i], u[n_connections+i])
+    P = zero(eltype(u))
+    Q = zero(eltype(u))
+    for k = 1:n_connections
+        (s, c) = sincos(θ_i - u[n_connections+k] - α[k])
+        P += u[k] * Y_mag[k] * c
+        Q += u[k] * Y_mag[k] * s
+    end
+    return V_i * P, V_i * Q
+end
+
+# Sum of n consecutive entries of u, starting at u[first_ind]
+function sum_consecutive(u, first_ind, n)
+    total = zero(eltype(u))
+    for j = first_ind:first_ind+n-1
+        total += u[j]
+    end
+    return total
+end
 
-    # Extract variables
-    (V, θ) = (u[1:n_connections], u[n_connections+1:2*n_connections])
+function update!(out, du, u, model::NodeModel{NoGen,NoLoad}, t)
+    # Power flowing into the network
+    (P, Q) = network_power_flows(u, model)
 
-    # Extract variables from input vector 'u' and 'du'
-    out[1] =
-        V[i] * sum([V[k] * Y_mag[k] * cos(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
-    out[2] =
-        V[i] * sum([V[k] * Y_mag[k] * sin(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
+    out[1] = P
+    out[2] = Q
 end
 function update!(out, du, u, model::NodeModel{HasGen,NoLoad}, t)
     # Extract parameters directly from the model
-    i, n_connections, Y_mag, α, n_gens, n_loads = model.local_i, model.n_connections, model.Y_mag, model.α, model.n_gens, model.n_loads
-
-    # Extract variables
-    (V, θ) = (u[1:n_connections], u[n_connections+1:2*n_connections])
-    (Pg, Qg) = (u[2*n_connections+1:2*n_connections+n_gens], u[2*n_connections+n_gens+1:2*n_connections+2*n_gens])
-
-    # Extract variables from input vector 'u' and 'du'
-    out[1] =
-        sum(Pg) -
-        V[i] * sum([V[k] * Y_mag[k] * cos(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
-    out[2] =
-        sum(Qg) -
-        V[i] * sum([V[k] * Y_mag[k] * sin(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
+    n_connections, n_gens = model.n_connections, model.n_gens
+
+    # Power flowing into the network
+    (P, Q) = network_power_flows(u, model)
+
+    # Generator injections
+    Pg = sum_consecutive(u, 2 * n_connections + 1, n_gens)
+    Qg = sum_consecutive(u, 2 * n_connections + n_gens + 1, n_gens)
+
+    out[1] = Pg - P
+    out[2] = Qg - Q
 end
 function update!(out, du, u, model::NodeModel{NoGen,HasLoad}, t)
     # Extract parameters directly from the model
-    i, n_connections, Y_mag, α, n_gens, n_loads = model.local_i, model.n_connections, model.Y_mag, model.α, model.n_gens, model.n_loads
-
-    # Extract variables
-    (V, θ) = (u[1:n_connections], u[n_connections+1:2*n_connections])
-    (Pd, Qd) = (u[2*n_connections+1:2*n_connections+n_loads], u[2*n_connections+n_loads+1:2*n_connections+2*n_loads])
-
-    # Extract variables from input vector 'u' and 'du'
-    out[1] =
-        -sum(Pd) -
-        V[i] * sum([V[k] * Y_mag[k] * cos(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
-    out[2] =
-        -sum(Qd) -
-        V[i] * sum([V[k] * Y_mag[k] * sin(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
+    n_connections, n_loads = model.n_connections, model.n_loads
+
+    # Power flowing into the network
+    (P, Q) = network_power_flows(u, model)
+
+    # Load demands
+    Pd = sum_consecutive(u, 2 * n_connections + 1, n_loads)
+    Qd = sum_consecutive(u, 2 * n_connections + n_loads + 1, n_loads)
+
+    out[1] = -Pd - P
+    out[2] = -Qd - Q
 end
 
 """
@@ -146,20 +163,19 @@ Model based on P. W. Sauer and M. A. Pai, "Power System Dynamics and Stability",
 """
 function update!(out, du, u, model::NodeModel{HasGen,HasLoad}, t)
     # Extract parameters directly from the model
-    i, n_connections, Y_mag, α, n_gens, n_loads = model.local_i, model.n_connections, model.Y_mag, model.α, model.n_gens, model.n_loads
-
-    # Extract variables
-    (V, θ) = (u[1:n_connections], u[n_connections+1:2*n_connections])
-    (Pg, Qg) = (u[2*n_connections+1:2*n_connections+n_gens], u[2*n_connections+n_gens+1:2*n_connections+2*n_gens])
-    (Pd, Qd) = (u[2*n_connections+2*n_gens+1:2*n_connections+2*n_gens+n_loads], u[2*n_connections+2*n_gens+n_loads+1:2*n_connections+2*n_gens+2*n_loads])
-
-    # Extract variables from input vector 'u' and 'du'
-    out[1] =
-        sum(Pg) - sum(Pd) -
-        V[i] * sum([V[k] * Y_mag[k] * cos(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
-    out[2] =
-        sum(Qg) - sum(Qd) -
-        V[i] * sum([V[k] * Y_mag[k] * sin(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
+    n_connections, n_gens, n_loads = model.n_connections, model.n_gens, model.n_loads
+
+    # Power flowing into the network
+    (P, Q) = network_power_flows(u, model)
+
+    # Generator injections and load demands
+    Pg = sum_consecutive(u, 2 * n_connections + 1, n_gens)
+    Qg = sum_consecutive(u, 2 * n_connections + n_gens + 1, n_gens)
+    Pd = sum_consecutive(u, 2 * n_connections + 2 * n_gens + 1, n_loads)
+    Qd = sum_consecutive(u, 2 * n_connections + 2 * n_gens + n_loads + 1, n_loads)
+
+    out[1] = Pg - Pd - P
+    out[2] = Qg - Qd - Q
 end
 
 function make_dynamic_model(net::Dict{String,Any}, bus_ind::Int64, ::Type{NodeModel})
@@ -168,10 +184,9 @@ function make_dynamic_model(net::Dict{String,Any}, bus_ind::Int64, ::Type{NodeMo
     i = bus["index"]
 
     # Extract admittances of connected branches
-    Y_row = net["Y"][i, :]
-    non_zero_indices = findall(x -> x != 0, Y_row)
-    Y_mag_row = abs.(Y_row[non_zero_indices])
-    α_row = angle.(Y_row[non_zero_indices])
+    (non_zero_indices, Y_row) = admittance_row(net["Y"], i)
+    Y_mag_row = abs.(Y_row)
+    α_row = angle.(Y_row)
 
     # Get index of bus in reduced list and number of connections
     local_i = findfirst(isequal(i), non_zero_indices)
@@ -193,7 +208,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     bus_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{NodeModel},
 )
     # Extract output vector indexes
@@ -202,8 +217,7 @@ function make_pointers_to_simulation_variables(
     inds_out = [V_inds[bus_ind], θ_inds[bus_ind]]
 
     # Extract connected buses
-    Y_row = net["Y"][bus_ind, :]
-    non_zero_indices = findall(x -> x != 0, Y_row)
+    (non_zero_indices, Y_row) = admittance_row(net["Y"], bus_ind)
 
     # Extract connected generators and loads
     gen_inds = get_gens_connected_to_bus(net, bus_ind)
@@ -221,30 +235,3 @@ function make_pointers_to_simulation_variables(
 
     return inds_out, inds_u
 end
-
-function algebraic_equations!(F, vars, states, model::NodeModel)
-    # Extract parameters directly from the model
-    i, n_connections, Y_mag, α, n_gens, n_loads = model.local_i, model.n_connections, model.Y_mag, model.α, model.n_gens, model.n_loads
-
-    # Extract variables
-    (V, θ) = (vars[1:n_connections], vars[n_connections+1:2*n_connections])
-    if n_gens > 0
-        (Pg, Qg) = (vars[2*n_connections+1:2*n_connections+n_gens], vars[2*n_connections+n_gens+1:2*n_connections+2*n_gens])
-    else
-        (Pg, Qg) = ([0], [0])
-    end
-
-    if n_loads > 0
-        (Pd, Qd) = (vars[2*n_connections+2*n_gens+1:2*n_connections+2*n_gens+n_loads], vars[2*n_connections+2*n_gens+n_loads+1:2*n_connections+2*n_gens+2*n_loads])
-    else
-        (Pd, Qd) = ([0], [0])
-    end
-
-    # Define equations
-    F[1] =
-        sum(Pg) - sum(Pd) -
-        V[i] * sum([V[k] * Y_mag[k] * cos(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
-    F[2] =
-        sum(Qg) - sum(Qd) -
-        V[i] * sum([V[k] * Y_mag[k] * sin(θ[i] - θ[k] - α[k]) for k = 1:n_connections])
-end
@@ -7,7 +7,7 @@ Type definition for constant excitation of a synchronous machine.
 - `Efd0`: Value of the field voltage.
 """
 struct ConstantExcitation <: ControllerModel
-    Efd0
+    Efd0::Float64
 end
 
 variables(::Type{ConstantExcitation}) = ["Efd"]
@@ -46,7 +46,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     gen_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{ConstantExcitation},
 )
     # Extract generator and bus_ind
@@ -81,19 +81,4 @@ function generate_ic!(net, gen_ind, ::Type{ConstantExcitation})
         :names => pad_with_element_index("Efd", gen_ind),
         :values => [net["gen"]["$gen_ind"]["dynamic_model"]["parameters"]["Efd0"]],
     )
-end
-
-#######################################################################
-# RECALCULATE STATE
-#######################################################################
-#######################################################################
-function algebraic_equations!(F, vars, states, model::ConstantExcitation)
-    # Extract parameters directly from the model
-    Efd0 = model.Efd0
-
-    # Extract variables from input vector 'u'
-    Efd = vars[1]
-
-    # ZIPModelLoad equations
-    F[1] = -Efd + Efd0
 end
\ No newline at end of file
@@ -55,7 +55,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     gen_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{ConstantMechanicalPower},
 )
     # Extract generator and bus_ind
@@ -96,17 +96,3 @@ function generate_ic!(net, gen_ind, ::Type{ConstantMechanicalPower})
         :values => [net["gen"]["$gen_ind"]["dynamic_model"]["parameters"]["Tm0"]],
     )
 end
-
-#######################################################################
-# RECALCULATE STATE
-#######################################################################
-function algebraic_equations!(F, vars, states, model::ConstantMechanicalPower)
-    # Extract parameters directly from the model
-    Pm0 = model.Pm0
-    # Extract algebraic variables
-    Tm = vars[1]
-    # Extract state variables
-    ω = states[1]
-    # Differential Equations
-    F[1] = Tm - Pm0 / ω
-end
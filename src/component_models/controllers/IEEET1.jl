@@ -1,5 +1,5 @@
 """
-    IEEET1 <: AVRModel
+    IEEET1{F<:Function} <: AVRModel
 
 Type definition for IEEET1 AVR model.
 
@@ -12,32 +12,34 @@ Type definition for IEEET1 AVR model.
 - `Ka`: Amplifier gain (p.u.)
 - `Kf`: Filter gain (p.u.)
 - `Vref`: Reference voltage (p.u.)
-- `Se`::Function: Saturation function
+- `Se::F`: Saturation function
 - `Vrmin`: Minimum regulator voltage (p.u.)
 - `Vrmax`: Maximum regulator voltage (p.u.)
 - `Vb_gen`: Generator base voltage (kV)
 - `Vb_sys`: System base voltage (kV)
 
 """
-struct IEEET1 <: AVRModel
-    Te
-    Ta
-    Tf
-    Tr
-    Ke
-    Ka
-    Kf
-    Vref
-    Se::Function
-    Vrmin
-    Vrmax
-    Vb_gen
-    Vb_sys
+struct IEEET1{F<:Function} <: AVRModel
+    Te::Float64
+    Ta::Float64
+    Tf::Float64
+    Tr::Float64
+    Ke::Float64
+    Ka::Float64
+    Kf::Float64
+    Vref::Float64
+    Se::F
+    Vrmin::Float64
+    Vrmax::Float64
+    Vb_gen::Float64
+    Vb_sys::Float64
 end
 
 # info functions
 variables(::Type{IEEET1}) = ["Efd", "Vt", "Vr", "Vf"]
+variables(::Type{IEEET1{F}}) where {F} = variables(IEEET1)
 differential_variables(::Type{IEEET1}) = ["dEfd", "dVt", "dVr", "dVf"]
+differential_variables(::Type{IEEET1{F}}) where {F} = differential_variables(IEEET1)
 
 
 #######################################################################
@@ -110,19 +112,37 @@ end
 
 function quadratic_saturation(x, E1, E2, Se1, Se2)
     # saturation function used by powerfactory
-    sq = sqrt((E1 * Se1) / (E2 * Se2))
-    Asq = (E1 - E2 * sq) / (1 - sq)
-    Bsq = (E2 * Se2) / ((E2 - Asq)^2)
-
-    Se(x) = x > Asq ? Bsq * (x - Asq)^2 : 0.0
+    Se = quadratic_saturation_function(E1, E2, Se1, Se2)
     # Se(x) = Bsq * (x - Asq)^2
     # Se(x) = 0 * x
     return Se(x)
 end
 
+# Saturation functions, stored by their coefficients rather than as closures so that component
+#   models can be serialized (e.g. by a SimulationCache) and compared by their parameters
+struct QuadraticSaturation <: Function
+    Asq::Float64
+    Bsq::Float64
+end
+(Se::QuadraticSaturation)(x) = conditional_value(x > Se.Asq, Se.Bsq * (x - Se.Asq)^2, 0.0)
+
+struct ExponentialSaturation <: Function
+    Ax::Float64
+    Bx::Float64
+end
+(Se::ExponentialSaturation)(x) = Se.Ax * exp(1)^(Se.Bx * x)
+
+# returns the quadratic saturation function for the saturation points (E1, Se1) and (E2, Se2)
+#   the coefficients are calculated once, so that the function does not access the network data
+function quadratic_saturation_function(E1, E2, Se1, Se2)
+    sq = sqrt((E1 * Se1) / (E2 * Se2))
+    Asq = Float64((E1 - E2 * sq) / (1 - sq))
+    Bsq = Float64((E2 * Se2) / ((E2 - Asq)^2))
+    return QuadraticSaturation(Asq, Bsq)
+end
+
 function exponential_saturation(x, Ax::Float64, Bx::Float64)
-    Se(x) = Ax * exp(1)^(Bx * x)
-    return Se
+    return ExponentialSaturation(Ax, Bx)
 end
 
 
@@ -146,7 +166,7 @@ function make_dynamic_model(net::Dict{String,Any}, gen_ind::Int64, ::Type{IEEET1
     Vb_sys = net["bus"]["$(net["gen"]["$gen_ind"]["gen_bus"] )"]["base_kv"]
 
     # Define saturation function
-    Se(x) = quadratic_saturation(x, avr_parameters["E1"], avr_parameters["E2"], avr_parameters["Se1"], avr_parameters["Se2"])
+    Se = quadratic_saturation_function(avr_parameters["E1"], avr_parameters["E2"], avr_parameters["Se1"], avr_parameters["Se2"])
     # Define dynamic model
     avr_model = IEEET1(Te, Ta, Tf, Tr, Ke, Ka, Kf, Vref, Se, Vrmin, Vrmax, Vb_gen, Vb_sys)
     return avr_model
@@ -155,7 +175,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     gen_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{IEEET1},
 )
     # Extract generator and bus_ind
@@ -14,14 +14,14 @@ Type definition for the TGOV1 thermal governor model.
 - `Vmax`: Maximum valve position.
 """
 struct TGOV1 <: GovernorModel
-    T1
-    T2
-    T3
-    Rd
-    P_set
-    ωs
-    Vmin
-    Vmax
+    T1::Float64
+    T2::Float64
+    T3::Float64
+    Rd::Float64
+    P_set::Float64
+    ωs::Float64
+    Vmin::Float64
+    Vmax::Float64
 end
 
 variables(::Type{TGOV1}) = ["Pm", "Pv", "Tm"]
@@ -101,7 +101,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     gen_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{TGOV1},
 )
     # Extract generator and bus_ind
@@ -188,16 +188,6 @@ end
 #######################################################################
 # RECALCULATE STATE
 #######################################################################
-function algebraic_equations!(F, vars, states, model::TGOV1)
-    # Extract algebraic variables
-    Tm = vars[1]
-    # Extract state variables
-    (Pm, Pv, ω) = states[1:3]
-    # Differential Equations
-    F[1] = -Pm + Tm * ω
-
-end
-
 function calculate_state_derivatives!(du, u, model::TGOV1, inds_du, inds_u)
     # Extract parameters directly from the model
     T1, T2, T3, Rd, P_set, ωs =
@@ -221,5 +211,3 @@ function calculate_state_derivatives!(du, u, model::TGOV1, inds_du, inds_u)
 
     du[inds_du] = [dPm, dPv]
 end
-
-
@@ -24,31 +24,31 @@ All fields specified to be in per unit values are expressed on the generator bas
 - `Vb_sys`: System base voltage (kV)
 - `Sb_gen`: Generator base power (MVA)
 - `Sb_sys`: System base power (MVA)
-- `consider_ωr_variations`: Set to 1 if rotor speed variations should be considered, 0 if not.
+- `consider_ωr_variations`: `true` if rotor speed variations should be considered, `false` if not.
 
 Note: The time constants `Tdo_d`, `Tqo_d`, `Tdo_dd`, and `Tqo_dd` are the open loop time constants, not short circuit.
 """
 struct SixthOrderModel <: SynchronousGeneratorModel
-    H
-    Rs
-    Xl
-    Xd
-    Xq
-    Xd_d
-    Xq_d
-    Xd_dd
-    Xq_dd
-    Tdo_d
-    Tqo_d
-    Tdo_dd
-    Tqo_dd
-    ωs
-    f_nom
-    Vb_gen
-    Vb_sys
-    Sb_gen
-    Sb_sys
-    consider_ωr_variations
+    H::Float64
+    Rs::Float64
+    Xl::Float64
+    Xd::Float64
+    Xq::Float64
+    Xd_d::Float64
+    Xq_d::Float64
+    Xd_dd::Float64
+    Xq_dd::Float64
+    Tdo_d::Float64
+    Tqo_d::Float64
+    Tdo_dd::Float64
+    Tqo_dd::Float64
+    ωs::Float64
+    f_nom::Float64
+    Vb_gen::Float64
+    Vb_sys::Float64
+    Sb_gen::Float64
+    Sb_sys::Float64
+    consider_ωr_variations::Bool
 end
 
 variables(::Type{SixthOrderModel}) = ["Eq", "Ed", "ψ1d", "ψ2q", "δ", "ω", "Id", "Iq", "Pg", "Qg"]
@@ -90,7 +90,7 @@ All quantities specified in per unit values are expressed on the generator base
 
 ### Effect of rotor speed variations
 
-If `consider_ωr_variations` is set to 1, then
+If `consider_ωr_variations` is `true`, then
 
 ``ω_{var} = \\frac{ω}{ω_s}``
 
@@ -172,7 +172,7 @@ function update!(
     (dEq, dEd, dψ1d, dψ2q, dδ, dω) = du
 
     # rotor speed variation term
-    ω_var = consider_ωr_variations ? ω / ωs : 1
+    ω_var = consider_ωr_variations ? ω / ωs : 1.0
     # ω_var = 1 + (ω / ωs - 1) * consider_ωr_variations # non conditional formulation
 
     # calculate electrical torque
@@ -267,7 +267,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     gen_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{SixthOrderModel},
 )
     # Extract generator and bus_ind
@@ -429,53 +429,6 @@ end
 # RECALCULATE STATE
 #######################################################################
 
-function algebraic_equations!(F, vars, states, model::SixthOrderModel)
-    # Extract parameters directly from the model
-    Rs, Xl, Xd_d, Xq_d, Xd_dd, Xq_dd, ωs, Vb_gen, Vb_sys, Sb_gen, Sb_sys, consider_ωr_variations =
-        model.Rs,
-        model.Xl,
-        model.Xd_d,
-        model.Xq_d,
-        model.Xd_dd,
-        model.Xq_dd,
-        model.ωs,
-        model.Vb_gen,
-        model.Vb_sys,
-        model.Sb_gen,
-        model.Sb_sys,
-        model.consider_ωr_variations
-
-    # Extract variables from input vector 'u' and 'du'
-    (Id, Iq, Pg, Qg, V, θ) = vars[1:6]
-    (Eq, Ed, ψ1d, ψ2q, δ, ω) = states[1:6]
-
-    # convert to generator base voltage
-    V_gen = V * Vb_sys / Vb_gen
-
-    # rotor speed variation term
-    ω_var = consider_ωr_variations ? ω / ωs : 1
-    # ω_var = 1 + (ω / ωs - 1) * consider_ωr_variations # non conditional formulation
-
-    # Stator equations
-    F[1] =
-        V_gen * sin(δ - θ) +
-        Rs * Id +
-        ω_var * (
-            -Xq_dd * Iq - ((Xq_dd - Xl) / (Xq_d - Xl)) * Ed +
-            ((Xq_d - Xq_dd) / (Xq_d - Xl)) * ψ2q
-        )
-    F[2] =
-        V_gen * cos(δ - θ) +
-        Rs * Iq +
-        ω_var * (
-            Xd_dd * Id - ((Xd_dd - Xl) / (Xd_d - Xl)) * Eq -
-            ((Xd_d - Xd_dd) / (Xd_d - Xl)) * ψ1d
-        )
-    # Power injection to bus (converted to system base power)
-    F[3] = -Pg + (Id * V_gen * sin(δ - θ) + Iq * V_gen * cos(δ - θ)) * (Sb_gen / Sb_sys)
-    F[4] = -Qg + (Id * V_gen * cos(δ - θ) - Iq * V_gen * sin(δ - θ)) * (Sb_gen / Sb_sys)
-end
-
 function calculate_state_derivatives!(du, u, model::SixthOrderModel, inds_du, inds_u)
     # Extract parameters directly from the model
     H, Rs, Xl, Xd, Xq, Xd_d, Xq_d, Xd_dd, Xq_dd, Tdo_d, Tqo_d, Tdo_dd, Tqo_dd, ωs, f_nom, Vb_gen, Vb_sys, consider_ωr_variations =
@@ -504,7 +457,7 @@ function calculate_state_derivatives!(du, u, model::SixthOrderModel, inds_du, in
     (Eq, Ed, ψ1d, ψ2q, δ, ω, Id, Iq, Pg, Qg, ω_ref, V, θ, Efd, Tm) = u[inds_u]
 
     # rotor speed variation term
-    ω_var = consider_ωr_variations ? ω / ωs : 1
+    ω_var = consider_ωr_variations ? ω / ωs : 1.0
     # ω_var = 1 + (ω / ωs - 1) * consider_ωr_variations # non conditional formulation
 
     # calculate electrical torque
@@ -13,20 +13,25 @@ Type definition for the ZIP load model.
 - `Kqz`: Reactive power constant impedance coefficient.
 - `Kqi`: Reactive power constant current coefficient.
 - `Kqc`: Reactive power constant power coefficient.
+- `ΔPd`: Change in active power demand at nominal voltage applied by disturbances, e.g. `LoadStep` (p.u.).
 
 """
 mutable struct ZIPLoad <: LoadModel
-    Pd0
-    Qd0
-    V_nom
-    Kpz
-    Kpi
-    Kpc
-    Kqz
-    Kqi
-    Kqc
+    Pd0::Float64
+    Qd0::Float64
+    V_nom::Float64
+    Kpz::Float64
+    Kpi::Float64
+    Kpc::Float64
+    Kqz::Float64
+    Kqi::Float64
+    Kqc::Float64
+    ΔPd::Float64
 end
 
+# Constructor without disturbances
+ZIPLoad(Pd0, Qd0, V_nom, Kpz, Kpi, Kpc, Kqz, Kqi, Kqc) = ZIPLoad(Pd0, Qd0, V_nom, Kpz, Kpi, Kpc, Kqz, Kqi, Kqc, 0.0)
+
 variables(::Type{ZIPLoad}) = ["Pd", "Qd"]
 differential_variables(::Type{ZIPLoad}) = []
 
@@ -48,7 +53,7 @@ Implements the equations for the ZIPLoad model.
 
 # Equations
 
-``P_d = P_{d0} (K_{pz} ΔV^2 + K_{pi} ΔV + K_{pc})``
+``P_d = (P_{d0} + ΔP_d) (K_{pz} ΔV^2 + K_{pi} ΔV + K_{pc})``
 
 ``Q_d = Q_{d0} (K_{qz} ΔV^2 + K_{qi} ΔV + K_{qc})``
 
@@ -58,7 +63,7 @@ where
 """
 function update!(out, du, u, model::ZIPLoad, t)
     # Extract parameters directly from the model
-    Pd0, Qd0, V_nom, Kpz, Kpi, Kpc, Kqz, Kqi, Kqc = model.Pd0,
+    Pd0, Qd0, V_nom, Kpz, Kpi, Kpc, Kqz, Kqi, Kqc, ΔPd = model.Pd0,
     model.Qd0,
     model.V_nom,
     model.Kpz,
@@ -66,7 +71,8 @@ function update!(out, du, u, model::ZIPLoad, t)
     model.Kpc,
     model.Kqz,
     model.Kqi,
-    model.Kqc
+    model.Kqc,
+    model.ΔPd
 
     # Extract variables from input vector 'u'
     (Pd, Qd, V) = u
@@ -75,7 +81,7 @@ function update!(out, du, u, model::ZIPLoad, t)
     ΔV = V / V_nom
 
     # ZIPModelLoad equations
-    out[1] = -Pd + Pd0 * (Kpz * ΔV^2 + Kpi * ΔV + Kpc)
+    out[1] = -Pd + (Pd0 + ΔPd) * (Kpz * ΔV^2 + Kpi * ΔV + Kpc)
     out[2] = -Qd + Qd0 * (Kqz * ΔV^2 + Kqi * ΔV + Kqc)
 end
 
@@ -104,7 +110,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     load_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{ZIPLoad},
 )
     # Extract bus from network
@@ -120,29 +126,6 @@ function make_pointers_to_simulation_variables(
     return inds_out, inds_du, inds_u
 end
 
-function algebraic_equations!(F, vars, states, model::ZIPLoad)
-    # Extract parameters directly from the model
-    Pd0, Qd0, V_nom, Kpz, Kpi, Kpc, Kqz, Kqi, Kqc = model.Pd0,
-    model.Qd0,
-    model.V_nom,
-    model.Kpz,
-    model.Kpi,
-    model.Kpc,
-    model.Kqz,
-    model.Kqi,
-    model.Kqc
-
-    # Extract variables from input vector 'u'
-    (Pd, Qd, V) = vars
-
-    # Calculate voltage difference from nominal value
-    ΔV = V / V_nom
-
-    # ZIPModelLoad equations
-    F[1] = -Pd + Pd0 * (Kpz * ΔV^2 + Kpi * ΔV + Kpc)
-    F[2] = -Qd + Qd0 * (Kqz * ΔV^2 + Kqi * ΔV + Kqc)
-end
-
 """
     generate_ic!(net, gen_ind, ::Type{ZIPLoad})
 
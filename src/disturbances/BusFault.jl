@@ -50,7 +50,7 @@ end
 function make_pointers_to_simulation_variables(
     net::Dict{String,Any},
     bus_ind::Int64,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     ::Type{BusFaultModel},
 )
     # Extract output vector indexes
@@ -59,15 +59,6 @@ function make_pointers_to_simulation_variables(
     return inds
 end
 
-function algebraic_equations!(F, vars, states, model::BusFaultModel)
-    # Extract variables
-    (V, θ) = vars
-
-    # Define equations
-    F[1] = V
-    F[2] = θ
-end
-
 ###############################################################################
 # BusFault
 ###############################################################################
@@ -82,9 +73,9 @@ Type definition for a disturbance that applies a 3-phase, bolted, short-circuit
 - `restart_simulation`: Flag indicating whether the simulation should be restarted after applying the disturbance
 """
 struct BusFault <: Disturbance
-    bus_ind
-    t_disturbance
-    restart_simulation
+    bus_ind::Int64
+    t_disturbance::Float64
+    restart_simulation::Bool
 
     # Constructor with default value for restart_simulation
     BusFault(bus_ind, t_disturbance; restart_simulation=false) = new(bus_ind, t_disturbance, restart_simulation)
@@ -95,9 +86,16 @@ end
 
 Applies a 3-phase, bolted, short-circuit fault at a bus in the PowerSystemModel.
 
-A `BusFaultModel` is created for the faulted bus and replaces the original model data in the component list.
+If the network is modelled by a `NetworkModel`, the fault is applied by `set_bus_fault!`: a retained bus is flagged and its equations are replaced by those of a `BusFaultModel`, and for a bus eliminated by network reduction the reduced admittances are updated. Otherwise, a `BusFaultModel` is created for the faulted bus and replaces the original `NodeModel` data in the component list.
 """
 function perturb_model!(power_system_model::PowerSystemModel, disturbance::BusFault)
+    # Flag faulted bus in network model
+    network_ind = findfirst(n -> n.model isa NetworkModel, power_system_model.component_list)
+    if !isnothing(network_ind)
+        set_bus_fault!(power_system_model.component_list[network_ind].model, disturbance.bus_ind, true)
+        return
+    end
+
     # Get indexes of V and θ at the faulted bus
     bus_ind = disturbance.bus_ind
     (V_ind, θ_ind) = find_variable_indexes(power_system_model.variables, ["V_$bus_ind", "θ_$bus_ind"])
@@ -118,4 +116,10 @@ function perturb_model!(power_system_model::PowerSystemModel, disturbance::BusFa
     # Modify load equations
     power_system_model.component_list[bus_component_model_data_ind] = faulted_bus_component_model_data
 
-end
\ No newline at end of file
+end
+
+# Clearing the fault restores the bus
+undo_perturbation!(power_system_model::PowerSystemModel, disturbance::BusFault) =
+    perturb_model!(power_system_model, ClearBusFault(disturbance.bus_ind, disturbance.t_disturbance))
+
+introduced_model_types(::BusFault) = (BusFaultModel,)
\ No newline at end of file
@@ -9,9 +9,9 @@ Type definition for clearance of a `BusFault`
 - `restart_simulation`: Flag indicating whether the simulation should be restarted after applying the disturbance
 """
 struct ClearBusFault <: Disturbance
-    bus_ind
-    t_disturbance
-    restart_simulation
+    bus_ind::Int64
+    t_disturbance::Float64
+    restart_simulation::Bool
 
     # Constructor with default value for restart_simulation
     ClearBusFault(bus_ind, t_disturbance; restart_simulation=false) = new(bus_ind, t_disturbance, restart_simulation)
@@ -19,9 +19,16 @@ end
 """
     perturb_model!(power_system_model::PowerSystemModel, disturbance::BusFault)
 
-Removes a `BusFaultModel` from the `PowerSystemModel` and replaces it with the original `NodeModel`
+Removes a `BusFaultModel` from the `PowerSystemModel` and replaces it with the original `NodeModel`, or clears the fault with `set_bus_fault!` if the network is modelled by a `NetworkModel`.
 """
 function perturb_model!(power_system_model::PowerSystemModel, disturbance::ClearBusFault)
+    # Remove fault flag in network model
+    network_ind = findfirst(n -> n.model isa NetworkModel, power_system_model.component_list)
+    if !isnothing(network_ind)
+        set_bus_fault!(power_system_model.component_list[network_ind].model, disturbance.bus_ind, false)
+        return
+    end
+
     # Get index of faulted bus model data
     faulted_bus_ind = findfirst(n -> n.source_ind == disturbance.bus_ind && n.model isa BusFaultModel, power_system_model.component_list)
     faulted_bus = power_system_model.component_list[faulted_bus_ind]
@@ -29,3 +36,10 @@ function perturb_model!(power_system_model::PowerSystemModel, disturbance::Clear
     # Restore unfaulted bus model data
     power_system_model.component_list[faulted_bus_ind] = faulted_bus.model.unfaulted_model_data
 end
+
+# Reapplying the fault restores the faulted bus
+undo_perturbation!(power_system_model::PowerSystemModel, disturbance::ClearBusFault) =
+    perturb_model!(power_system_model, BusFault(disturbance.bus_ind, disturbance.t_disturbance))
+
+# Faults are cleared before simultaneous disturbances are applied
+event_priority(disturbance::ClearBusFault) = 1
\ No newline at end of file
@@ -10,10 +10,10 @@ Type definition for a disturbance that applies a step change in the active power
 - `restart_simulation`: Flag indicating whether the simulation should be restarted after applying the disturbance
 """
 struct LoadStep <: Disturbance
-    load_ind
-    t_disturbance
-    ΔP
-    restart_simulation
+    load_ind::Int64
+    t_disturbance::Float64
+    ΔP::Float64
+    restart_simulation::Bool
 
     # Constructor with default value for restart_simulation
     LoadStep(load_ind, t_disturbance, ΔP; restart_simulation=false) = new(load_ind, t_disturbance, ΔP, restart_simulation)
@@ -23,11 +23,19 @@ end
     perturb_model!(power_system_model::PowerSystemModel, disturbance::LoadStep)
 
 Applies a step change in the active power demand of a load component in the PowerSystemModel.
+
+The step is added to the `ΔPd` of the load model, so the base demand `Pd0` is unchanged.
 """
 function perturb_model!(power_system_model::PowerSystemModel, disturbance::LoadStep)
-    # Find load equations in component_list
-    load_model_ind = findfirst(component_model -> component_model.source_ind == disturbance.load_ind && component_model.model isa LoadModel, power_system_model.component_list)
+    load_model(power_system_model, disturbance.load_ind).ΔPd += disturbance.ΔP
+end
+
+function undo_perturbation!(power_system_model::PowerSystemModel, disturbance::LoadStep)
+    load_model(power_system_model, disturbance.load_ind).ΔPd -= disturbance.ΔP
+end
 
-    # Apply load step
-    power_system_model.component_list[load_model_ind].model.Pd0 += disturbance.ΔP
+# Find load equations in component_list
+function load_model(power_system_model::PowerSystemModel, load_ind)
+    load_model_ind = findfirst(component_model -> component_model.source_ind == load_ind && component_model.model isa LoadModel, power_system_model.component_list)
+    return power_system_model.component_list[load_model_ind].model
 end
@@ -1,6 +1,8 @@
 using NLsolve, DataFrames
 
-function calculate_system_ic!(net::Dict{String,Any}; recalculate_load_flow=true)
+# load_flow_method: :ipopt for the PowerModels load flow with Ipopt, or :newton_raphson or
+#   :fast_decoupled (see solve_load_flow!), which fall back to Ipopt if they do not converge
+function calculate_system_ic!(net::Dict{String,Any}; recalculate_load_flow=true, load_flow_method=:ipopt, profile=nothing)
     # Get var_list
     var_list = get_var_list(net)
 
@@ -14,10 +16,17 @@ function calculate_system_ic!(net::Dict{String,Any}; recalculate_load_flow=true)
     # Recalculate load flow if required
     if recalculate_load_flow
         # perform load flow
-        ldf_result = solve_pf(net, ACPPowerModel, Ipopt.Optimizer)
-        update_data!(net, ldf_result["solution"])
+        phase_start = time_ns()
+        if load_flow_method == :ipopt || !solve_load_flow!(net; method=load_flow_method)
+            load_flow_method == :ipopt || @info "Load flow did not converge, solving with Ipopt"
+            ldf_result = solve_pf(net, ACPPowerModel, Ipopt.Optimizer)
+            update_data!(net, ldf_result["solution"])
+        end
+        record_phase!(profile, "load flow", 0, NaN, phase_start)
     end
 
+    phase_start = time_ns()
+
     # Add initial values of bus variables to u0 vector
     add_bus_ic!(u0, net, var_list)
 
@@ -36,19 +45,20 @@ function calculate_system_ic!(net::Dict{String,Any}; recalculate_load_flow=true)
     # Qd_values = [net["load"]["$load_ind"]["qd"] for load_ind = 1:num_loads]
     # u0[Qd_indexes] = Qd_values
 
+    record_phase!(profile, "initial conditions", 0, NaN, phase_start)
     return (u0, du0)
 end
 
 function add_bus_ic!(u0, net::Dict{String,Any}, var_list)
     # Add initial values of bus voltages (from load flow solution) to u0 vector
-    num_buses = length(keys(net["bus"]))
+    bus_inds = retained_buses(net)
 
     V_indexes = find_all_variable_indexes(var_list, "V")
-    V_values = [net["bus"]["$bus_ind"]["vm"] for bus_ind = 1:num_buses]
+    V_values = [net["bus"]["$bus_ind"]["vm"] for bus_ind in bus_inds]
     u0[V_indexes] = V_values
 
     θ_indexes = find_all_variable_indexes(var_list, "θ")
-    θ_values = [net["bus"]["$bus_ind"]["va"] for bus_ind = 1:num_buses]
+    θ_values = [net["bus"]["$bus_ind"]["va"] for bus_ind in bus_inds]
     u0[θ_indexes] = θ_values
 end
 
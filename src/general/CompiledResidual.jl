@@ -0,0 +1,406 @@
+###########################################################################
+# Tracing of the component model equations
+###########################################################################
+# Straight-line code recorded by tracing the component model equations
+#   Each expression is recorded once, so common subexpressions (e.g. the sine and cosine of the
+#   angle differences shared by the active and reactive power equations) are evaluated once
+struct ResidualTrace
+    statements::Vector{Pair{Symbol,Any}}
+    symbols::Dict{Any,Symbol}
+end
+ResidualTrace() = ResidualTrace(Pair{Symbol,Any}[], Dict{Any,Symbol}())
+
+# Records an expression, returning the variable that it is assigned to
+function record!(trace::ResidualTrace, ex)
+    return get!(trace.symbols, ex) do
+        symbol = Symbol("x", length(trace.statements) + 1)
+        push!(trace.statements, symbol => ex)
+        symbol
+    end
+end
+
+# A value in the traced equations: a variable of the trace (or a constant), with its partial
+#   derivatives with respect to the variables (index j) and derivatives (index n + j) of the power
+#   system. The partial derivatives are traced values without partial derivatives.
+struct TracedValue <: Real
+    trace::Union{ResidualTrace,Nothing}
+    ex::Union{Symbol,Float64}
+    partials::Dict{Int64,TracedValue}
+end
+
+# A condition in the traced equations
+struct TracedBool
+    trace::ResidualTrace
+    ex::Symbol
+end
+
+const NO_PARTIALS = Dict{Int64,TracedValue}()
+
+traced_constant(x) = TracedValue(nothing, Float64(x), NO_PARTIALS)
+is_constant(x::TracedValue, value) = x.ex isa Float64 && x.ex == value
+value_of(x::TracedValue) = TracedValue(x.trace, x.ex, NO_PARTIALS)
+
+const TRACED_ZERO = traced_constant(0.0)
+const TRACED_ONE = traced_constant(1.0)
+const TRACED_MINUS_ONE = traced_constant(-1.0)
+
+function trace_of(args)
+    for arg in args
+        arg.trace === nothing || return arg.trace
+    end
+    return nothing
+end
+
+# Records the call f(args...). The partial derivatives of f with respect to each argument are
+#   returned by derivatives(result), and are only calculated if an argument has partial derivatives.
+#   Calls with constant arguments are evaluated.
+function traced_call(f::Symbol, args::Tuple, derivatives)
+    trace = trace_of(args)
+    arg_exs = map(arg -> arg.ex, args)
+    if trace === nothing
+        return traced_constant(getfield(Base, f)(arg_exs...))
+    end
+    result = TracedValue(trace, record!(trace, Expr(:call, f, arg_exs...)), NO_PARTIALS)
+    if all(arg -> isempty(arg.partials), args)
+        return result
+    end
+
+    # Chain rule
+    partials = Dict{Int64,TracedValue}()
+    for (arg, derivative) in zip(args, derivatives(result))
+        for (k, partial) in arg.partials
+            term = traced_mul(derivative, partial)
+            partials[k] = haskey(partials, k) ? traced_add(partials[k], term) : term
+        end
+    end
+    return TracedValue(trace, result.ex, partials)
+end
+
+# Arguments of commutative operations in a fixed order, so that a * b and b * a are recorded once
+ordered(a::TracedValue, b::TracedValue) = string(a.ex) <= string(b.ex) ? (a, b) : (b, a)
+
+function traced_add(a::TracedValue, b::TracedValue)
+    is_constant(a, 0.0) && return b
+    is_constant(b, 0.0) && return a
+    return traced_call(:+, ordered(a, b), result -> (TRACED_ONE, TRACED_ONE))
+end
+
+function traced_sub(a::TracedValue, b::TracedValue)
+    is_constant(b, 0.0) && return a
+    is_constant(a, 0.0) && return traced_neg(b)
+    return traced_call(:-, (a, b), result -> (TRACED_ONE, TRACED_MINUS_ONE))
+end
+
+traced_neg(a::TracedValue) = traced_call(:-, (a,), result -> (TRACED_MINUS_ONE,))
+
+function traced_mul(a::TracedValue, b::TracedValue)
+    (is_constant(a, 0.0) || is_constant(b, 0.0)) && return TRACED_ZERO
+    is_constant(a, 1.0) && return b
+    is_constant(b, 1.0) && return a
+    is_constant(a, -1.0) && return traced_neg(b)
+    is_constant(b, -1.0) && return traced_neg(a)
+    (x, y) = ordered(a, b)
+    return traced_call(:*, (x, y), result -> (value_of(y), value_of(x)))
+end
+
+function traced_div(a::TracedValue, b::TracedValue)
+    is_constant(b, 1.0) && return a
+    is_constant(a, 0.0) && return TRACED_ZERO
+    return traced_call(:/, (a, b), result -> (
+        traced_div(TRACED_ONE, value_of(b)),
+        traced_neg(traced_div(result, value_of(b))),
+    ))
+end
+
+function traced_pow(a::TracedValue, b::TracedValue)
+    if b.ex isa Float64
+        b.ex == 0.0 && return TRACED_ONE
+        b.ex == 1.0 && return a
+        b.ex == 2.0 && return traced_mul(a, a)
+        return traced_call(:^, (a, b), result -> (
+            traced_mul(b, traced_pow(value_of(a), traced_constant(b.ex - 1))),
+            TRACED_ZERO,
+        ))
+    end
+    return traced_call(:^, (a, b), result -> (
+        traced_mul(value_of(b), traced_pow(value_of(a), traced_sub(value_of(b), TRACED_ONE))),
+        traced_mul(log(value_of(a)), result),
+    ))
+end
+
+function traced_compare(f::Symbol, a::TracedValue, b::TracedValue)
+    trace = trace_of((a, b))
+    trace === nothing && return getfield(Base, f)(a.ex, b.ex)
+    return TracedBool(trace, record!(trace, Expr(:call, f, a.ex, b.ex)))
+end
+
+# Arithmetic
+for (op, traced_op) in ((:+, :traced_add), (:-, :traced_sub), (:*, :traced_mul), (:/, :traced_div), (:^, :traced_pow))
+    @eval begin
+        Base.$op(a::TracedValue, b::TracedValue) = $traced_op(a, b)
+        Base.$op(a::TracedValue, b::Real) = $traced_op(a, traced_constant(b))
+        Base.$op(a::Real, b::TracedValue) = $traced_op(traced_constant(a), b)
+        Base.$op(a::TracedValue, b::Bool) = $traced_op(a, traced_constant(b))
+        Base.$op(a::Bool, b::TracedValue) = $traced_op(traced_constant(a), b)
+    end
+end
+Base.:^(a::TracedValue, b::Integer) = traced_pow(a, traced_constant(b))
+Base.:-(a::TracedValue) = traced_neg(a)
+Base.:+(a::TracedValue) = a
+
+# Elementary functions
+Base.sin(a::TracedValue) = traced_call(:sin, (a,), result -> (cos(value_of(a)),))
+Base.cos(a::TracedValue) = traced_call(:cos, (a,), result -> (-sin(value_of(a)),))
+Base.sincos(a::TracedValue) = (sin(a), cos(a))
+Base.exp(a::TracedValue) = traced_call(:exp, (a,), result -> (result,))
+Base.log(a::TracedValue) = traced_call(:log, (a,), result -> (traced_div(TRACED_ONE, value_of(a)),))
+Base.sqrt(a::TracedValue) = traced_call(:sqrt, (a,), result -> (traced_div(traced_constant(0.5), result),))
+Base.abs(a::TracedValue) = traced_call(:abs, (a,), result -> (traced_call(:sign, (value_of(a),), nothing),))
+
+# Complex division without the scaling of the generic method, which branches on the values
+function Base.:/(a::Complex{TracedValue}, b::Complex{TracedValue})
+    d = real(b)^2 + imag(b)^2
+    return Complex(
+        (real(a) * real(b) + imag(a) * imag(b)) / d,
+        (imag(a) * real(b) - real(a) * imag(b)) / d,
+    )
+end
+
+# Conditions
+for op in (:<, :<=)
+    @eval begin
+        Base.$op(a::TracedValue, b::TracedValue) = traced_compare($(QuoteNode(op)), a, b)
+        Base.$op(a::TracedValue, b::Real) = traced_compare($(QuoteNode(op)), a, traced_constant(b))
+        Base.$op(a::Real, b::TracedValue) = traced_compare($(QuoteNode(op)), traced_constant(a), b)
+    end
+end
+Base.:&(a::TracedBool, b::TracedBool) = TracedBool(a.trace, record!(a.trace, Expr(:call, :&, a.ex, b.ex)))
+Base.:&(a::TracedBool, b::Bool) = b ? a : false
+Base.:&(a::Bool, b::TracedBool) = b & a
+Base.:|(a::TracedBool, b::TracedBool) = TracedBool(a.trace, record!(a.trace, Expr(:call, :|, a.ex, b.ex)))
+Base.:|(a::TracedBool, b::Bool) = b ? true : a
+Base.:|(a::Bool, b::TracedBool) = b | a
+Base.:!(a::TracedBool) = TracedBool(a.trace, record!(a.trace, Expr(:call, :!, a.ex)))
+
+function conditional_value(condition::TracedBool, a, b)
+    (a, b) = (convert(TracedValue, a), convert(TracedValue, b))
+    trace = condition.trace
+    result = TracedValue(trace, record!(trace, Expr(:call, :ifelse, condition.ex, a.ex, b.ex)), NO_PARTIALS)
+    if isempty(a.partials) && isempty(b.partials)
+        return result
+    end
+
+    partials = Dict{Int64,TracedValue}()
+    for k in union(keys(a.partials), keys(b.partials))
+        partials[k] = conditional_value(condition, get(a.partials, k, TRACED_ZERO), get(b.partials, k, TRACED_ZERO))
+    end
+    return TracedValue(trace, result.ex, partials)
+end
+
+# Conversion
+Base.convert(::Type{TracedValue}, x::TracedValue) = x
+Base.convert(::Type{TracedValue}, x::Real) = traced_constant(x)
+Base.promote_rule(::Type{TracedValue}, ::Type{<:Real}) = TracedValue
+Base.zero(::Type{TracedValue}) = TRACED_ZERO
+Base.one(::Type{TracedValue}) = TRACED_ONE
+Base.float(x::TracedValue) = x
+
+###########################################################################
+# Generate residual and Jacobian functions
+###########################################################################
+# Traces the equations of a component model, returning the traced outputs, or nothing if the
+#   equations cannot be traced (i.e. if they branch on the values of variables)
+function trace_component(trace::ResidualTrace, component_model::ComponentModelData, n)
+    du = TracedValue[traced_input(trace, :du, j, n + j) for j in component_model.inds_du]
+    u = TracedValue[traced_input(trace, :u, j, j) for j in component_model.inds_u]
+    out = fill(TRACED_ZERO, length(component_model.inds_out))
+    try
+        update!(out, du, u, component_model.model, TracedValue(trace, :t, NO_PARTIALS))
+    catch err
+        is_traced_branch(err) ? (return nothing) : rethrow()
+    end
+    return out
+end
+
+# Whether an error was thrown by a branch on a traced condition, e.g. an if statement or ifelse
+#   on the value of a variable
+is_traced_branch(err) = err isa TypeError && err.got isa TracedBool
+
+traced_input(trace, vector, j, k) =
+    TracedValue(trace, record!(trace, Expr(:ref, vector, j)), Dict{Int64,TracedValue}(k => TRACED_ONE))
+
+# Returns the expressions of the residual and Jacobian functions of a power system model, and the
+#   indexes of the components whose equations could not be traced
+function generate_residual_functions(power_system_model::PowerSystemModel)
+    n = length(power_system_model.variables)
+    jacobian = jacobian_sparsity(power_system_model)
+    trace = ResidualTrace()
+    (residual_outputs, jacobian_outputs, interpreted) = (Expr[], Expr[], Int64[])
+
+    for (c, component_model) in enumerate(power_system_model.component_list)
+        out = trace_component(trace, component_model, n)
+        if isnothing(out)
+            @debug "Equations of component $c ($(typeof(component_model.model))) branch on the values of variables, and are evaluated by update!"
+            push!(interpreted, c)
+            continue
+        end
+
+        for (i, row) in enumerate(component_model.inds_out)
+            push!(residual_outputs, :(out[$row] = $(out[i].ex)))
+
+            # Entries of the Jacobian, dF/du + gamma * dF/d(du)
+            for (k, partial) in out[i].partials
+                is_constant(partial, 0.0) && continue
+                (col, value) = k <= n ? (k, partial.ex) : (k - n, :(gamma * $(partial.ex)))
+                push!(jacobian_outputs, :(nz[$(jacobian_entry(jacobian, row, col))] += $value))
+            end
+        end
+    end
+
+    # Components that could not be traced are evaluated by their update! methods
+    for k in eachindex(interpreted)
+        push!(residual_outputs, :(update_component!(out, du, u, interpreted[$k][1], interpreted[$k][2], t)))
+        push!(jacobian_outputs, :(add_component_jacobian!(J, du, u, interpreted[$k][1], interpreted[$k][2], gamma, t)))
+    end
+
+    return (
+        residual=generated_function(trace, :((out, du, u, t, interpreted)), Expr[], residual_outputs),
+        jacobian=generated_function(trace, :((J, du, u, gamma, t, interpreted)), [:(nz = nonzeros(J)), :(fill!(nz, 0.0))], jacobian_outputs),
+        interpreted=interpreted,
+    )
+end
+
+# Index of the stored entry (row, col) in the nonzeros of a sparse matrix
+function jacobian_entry(J::SparseMatrixCSC, row, col)
+    k = searchsortedfirst(rowvals(J), row, J.colptr[col], J.colptr[col+1] - 1, Base.Order.Forward)
+    if k >= J.colptr[col+1] || rowvals(J)[k] != row
+        error("Jacobian entry ($row, $col) is not in the sparsity pattern")
+    end
+    return k
+end
+
+# Anonymous function evaluating the statements of the trace that the outputs depend on
+function generated_function(trace::ResidualTrace, arguments, preamble, outputs)
+    needed = Set{Symbol}()
+    foreach(output -> add_symbols!(needed, output), outputs)
+    statements = Expr[]
+    for (symbol, ex) in Iterators.reverse(trace.statements)
+        if symbol in needed
+            add_symbols!(needed, ex)
+            push!(statements, :($symbol = $ex))
+        end
+    end
+
+    body = Expr(:block, preamble..., reverse!(statements)..., outputs...)
+    return Expr(:->, arguments, Expr(:block, Expr(:macrocall, Symbol("@inbounds"), LineNumberNode(0), body), :(return nothing)))
+end
+
+add_symbols!(symbols, ex::Symbol) = push!(symbols, ex)
+add_symbols!(symbols, ex::Expr) = foreach(arg -> add_symbols!(symbols, arg), ex.args)
+add_symbols!(symbols, ex) = nothing
+
+###########################################################################
+# Compile residual
+###########################################################################
+# Generated functions of each key, shared by power system models with the same component models
+#   (e.g. scenario copies), so that each is compiled once per Julia session. Entries are never
+#   evicted, see clear_compiled_residuals!
+const GENERATED_RESIDUALS = Dict{String,Any}()
+const GENERATED_RESIDUALS_LOCK = ReentrantLock()
+
+"""
+    compile_residual!(power_system_model::PowerSystemModel; cache=nothing)
+
+Generates a single straight-line residual function and Jacobian function for the component models of a power system model, and stores them in its auxiliary data as a `CompiledResidual`, which is used by `make_dae_function`. Selected for a simulation with `run_RMS_simulation(...; residual=:compiled)`.
+
+The functions are generated by tracing the `update!` method of each component model. Each expression is evaluated once, so common subexpressions (e.g. the sine and cosine of the angle difference of each connection, shared by the active and reactive power equations) are not repeated, and the model parameters are constants. The Jacobian is the derivative of the traced equations, written directly to the stored entries of the sparse Jacobian. Component models whose equations cannot be traced (e.g. with `if` statements on the values of variables, see `conditional_value`) are evaluated by their `update!` methods within the generated functions.
+
+The generated functions are compiled once per Julia session for each `residual_cache_key`. If `cache` is a `SimulationCache`, the generated code is also stored on disk, so that the equations are not traced again.
+
+The parameters of the component models are constants of the generated functions, so the key, and the functions kept for the session, change with any parameter. A session that compiles the residual of many parameter variations of a network should call `clear_compiled_residuals!` once they are no longer used.
+
+# Note
+- Compiling the generated functions takes longer than compiling the component models, and grows with the size of the network.
+- The generated functions are those of the undisturbed model. Any disturbance (e.g. a fault or load step) switches the simulation back to the equations of the component models for the rest of the stage, until the disturbances are undone by `reset_model!`.
+"""
+function compile_residual!(power_system_model::PowerSystemModel; cache=nothing)
+    isempty(power_system_model.applied_disturbances) || error("The residual functions must be compiled for the undisturbed model, undo the applied disturbances with reset_model!")
+    key = residual_cache_key(power_system_model)
+    (residual, jacobian, interpreted_inds) = lock(GENERATED_RESIDUALS_LOCK) do
+        get!(GENERATED_RESIDUALS, key) do
+            entry = isnothing(cache) ? nothing : load_cache_entry(cache, key)
+            if isnothing(entry)
+                entry = generate_residual_functions(power_system_model)
+                isnothing(cache) ? nothing : save_cache_entry!(cache, key, entry)
+            end
+            (Core.eval(@__MODULE__, entry.residual), Core.eval(@__MODULE__, entry.jacobian), entry.interpreted)
+        end
+    end
+
+    component_list = power_system_model.component_list
+    interpreted = Tuple((component_list[c], component_list[c].model) for c in interpreted_inds)
+    compiled = CompiledResidual(key, residual, jacobian, jacobian_sparsity(power_system_model), interpreted, true)
+    power_system_model.auxiliary_data["compiled_residual"] = compiled
+    return compiled
+end
+
+"""
+    clear_compiled_residuals!()
+
+Removes the generated functions kept for the Julia session by `compile_residual!`, so that they are generated (or loaded from a `SimulationCache`) again by the next call. Power system models that were already compiled keep their `CompiledResidual`.
+
+Julia does not free compiled code, so this releases the generated expressions and functions, but not the machine code already compiled for them.
+"""
+function clear_compiled_residuals!()
+    lock(GENERATED_RESIDUALS_LOCK) do
+        empty!(GENERATED_RESIDUALS)
+    end
+    return nothing
+end
+
+"""
+    residual_cache_key(power_system_model::PowerSystemModel)
+
+Returns the key of the generated residual functions of a power system model, the SHA-256 hash of the types, parameters and variable indexes of its component models.
+"""
+function residual_cache_key(power_system_model::PowerSystemModel)
+    io = IOBuffer()
+    print(io, "compiled residual, cache version ", SIMULATION_CACHE_VERSION, ", julia ", VERSION, ", ")
+    write_canonical(io, power_system_model.component_list)
+    return bytes2hex(sha256(take!(io)))
+end
+
+# Activates the generated functions while no disturbance is applied, called whenever a disturbance
+#   is applied or undone. The generated functions are those of the undisturbed model, so this does
+#   not depend on the size of the model.
+function update_compiled_residual!(power_system_model::PowerSystemModel)
+    compiled = get(power_system_model.auxiliary_data, "compiled_residual", nothing)
+    if !isnothing(compiled)
+        compiled.active = isempty(power_system_model.applied_disturbances)
+    end
+end
+
+# DAE functions evaluating the generated functions while they are active
+function compiled_equations(compiled::CompiledResidual)
+    function compiled_equations!(out, du, u, p, t)
+        if compiled.active
+            compiled.residual(out, du, u, t, compiled.interpreted)
+        else
+            power_system_equations!(out, du, u, p, t)
+        end
+        return nothing
+    end
+    return compiled_equations!
+end
+
+function compiled_jacobian(compiled::CompiledResidual)
+    function compiled_jacobian!(J, du, u, p, gamma, t)
+        if compiled.active
+            compiled.jacobian(J, du, u, gamma, t, compiled.interpreted)
+        else
+            power_system_jacobian!(J, du, u, p, gamma, t)
+        end
+        return nothing
+    end
+    return compiled_jacobian!
+end
@@ -0,0 +1,323 @@
+###########################################################################
+# Modify the parameters of component models
+###########################################################################
+"""
+    set_parameters(model::ComponentModel, parameters::NamedTuple)
+
+Returns a copy of a component model with the fields named in `parameters` replaced, e.g. `set_parameters(model, (H=4.0,))`.
+"""
+function set_parameters(model::ComponentModel, parameters::NamedTuple)
+    model_type = typeof(model)
+    for name in keys(parameters)
+        hasfield(model_type, name) || error("$model_type has no parameter $name")
+    end
+    return model_type((haskey(parameters, name) ? parameters[name] : getfield(model, name) for name in fieldnames(model_type))...)
+end
+
+"""
+    set_parameters!(power_system_model::PowerSystemModel, component::Tuple{Type,Int64}, parameters::NamedTuple)
+
+Replaces the component model of a component with a copy with the parameters in `parameters` (see `set_parameters`).
+
+The component is identified by its model type and its index in the network data dictionary, e.g. `(ZIPLoad, 3)`. The component groups must be updated with `regroup_components!` after the parameters are set.
+"""
+function set_parameters!(power_system_model::PowerSystemModel, component::Tuple{Type,Int64}, parameters::NamedTuple)
+    (model_type, source_ind) = component
+    component_list = power_system_model.component_list
+    k = findfirst(component_model -> component_model.source_ind == source_ind && component_model.model isa model_type, component_list)
+    isnothing(k) && error("PowerSystemModel has no $model_type component with index $source_ind")
+
+    component_model = component_list[k]
+    component_list[k] = ComponentModelData(
+        component_model.source_ind,
+        set_parameters(component_model.model, parameters),
+        component_model.inds_out,
+        component_model.inds_du,
+        component_model.inds_u,
+    )
+end
+
+###########################################################################
+# Run ensembles
+###########################################################################
+"""
+    run_ensemble(power_system_simulation::PowerSystemSimulation, scenarios::AbstractVector{EnsembleScenario}, tspan; ensemble=:batched, saveat=0.01, save_variables=nothing, event_tolerance=1e-6, verbose=true, kwargs...)
+
+Simulates the scenarios of an ensemble (e.g. a Monte Carlo study of load parameters, or a sweep of generator inertia), which differ from a prepared power system simulation only in their parameters and disturbances, and returns the results of every scenario as `EnsembleResults`.
+
+Each scenario is simulated on a `scenario_copy` of the prepared simulation with the parameters of the scenario (see `set_parameters!`). The algebraic variables and derivatives of the initial state are recalculated for the modified parameters by `recalculate_system_state`, while the state variables are those of the prepared simulation. The disturbances of each scenario are applied within its integrator, as by `run_RMS_simulation` with `event_handling=:integrator`, and the disturbances at `tspan[1]` before its integrator starts.
+
+# Arguments
+- `power_system_simulation`: The prepared power system simulation, which is not modified.
+- `scenarios`: The `EnsembleScenario` of each scenario.
+- `tspan`: Time span of each simulation.
+- `ensemble`: `:batched` to integrate all scenarios as one DAE with the batched state of an `EnsembleModel`, or `:threads` or `:serial` to integrate each scenario separately as a trajectory of an `EnsembleProblem`.
+- `saveat`: Time step (s) or times at which the results of every scenario are saved.
+- `save_variables`: Names of the saved variables (all variables if `nothing`).
+- `event_tolerance`: See `run_RMS_events`.
+- `verbose`: Print the number of successful scenarios and the time of the ensemble when it finishes.
+- `kwargs`: Passed to the solver.
+
+# Note
+- With `ensemble=:batched`, every scenario takes the time steps of the integrator of the ensemble, and every disturbance re-initialises the integrator of the ensemble. This suits scenarios that differ only in parameters or have disturbances at the same times. The solver must factorise sparse Jacobians (e.g. `IDA(linear_solver=:KLU)`, the default).
+"""
+function run_ensemble(
+    power_system_simulation::PowerSystemSimulation,
+    scenarios::AbstractVector{EnsembleScenario},
+    tspan::Tuple{Float64,Float64};
+    ensemble=:batched,
+    saveat=0.01,
+    save_variables=nothing,
+    event_tolerance=1e-6,
+    verbose=true,
+    kwargs...
+)
+    start_time = time_ns()
+    members = [ensemble_member(power_system_simulation, scenario, tspan) for scenario in scenarios]
+
+    # Saved time steps and variables
+    t = saveat isa Number ? collect(tspan[1]:saveat:tspan[2]) : collect(Float64, saveat)
+    variables = power_system_simulation.power_system_model.variables
+    var_inds = isnothing(save_variables) ? collect(1:length(variables)) : find_variable_indexes(variables, save_variables)
+    any(isnothing, var_inds) && error("$(save_variables[findfirst(isnothing, var_inds)]) is not a simulation variable")
+    var_inds = sort!(unique!(Vector{Int64}(var_inds)))
+    results = EnsembleResults(
+        t,
+        fill(NaN, length(t), length(var_inds), length(members)),
+        fill("", length(members)),
+        VariableRegistry(variables.names[var_inds], variables.classes[var_inds], variables.elements[var_inds], variables.base_names[var_inds]),
+    )
+
+    if ensemble == :batched
+        run_ensemble_batched!(results, members, var_inds, tspan; event_tolerance=event_tolerance, saveat=t, kwargs...)
+    elseif ensemble == :threads
+        run_ensemble_trajectories!(results, members, var_inds, tspan, EnsembleThreads(); event_tolerance=event_tolerance, saveat=t, kwargs...)
+    elseif ensemble == :serial
+        run_ensemble_trajectories!(results, members, var_inds, tspan, EnsembleSerial(); event_tolerance=event_tolerance, saveat=t, kwargs...)
+    else
+        error("Unknown ensemble option $ensemble, expected :batched, :threads or :serial")
+    end
+
+    if verbose
+        println("Ensemble of ", length(members), " scenarios completed, ", count(==(string(ReturnCode.Success)), results.retcodes), " successfully")
+        println("Time elapsed = ", (time_ns() - start_time) / 1e9, " seconds")
+    end
+    return results
+end
+
+# Copy of the prepared simulation with the parameters and disturbances of a scenario
+function ensemble_member(power_system_simulation, scenario::EnsembleScenario, tspan)
+    member = scenario_copy(power_system_simulation)
+    member.disturbances = filter(disturbance -> tspan[1] <= disturbance.t_disturbance <= tspan[2], scenario.disturbances)
+
+    for (component, parameters) in scenario.parameters
+        set_parameters!(member.power_system_model, component, parameters)
+    end
+    power_system_model = group_disturbance_models!(member)
+
+    # Disturbances at the start of the simulation are applied to the model of the scenario before
+    #   the integrator starts
+    initial_disturbances = filter(disturbance -> disturbance.t_disturbance == tspan[1], member.disturbances)
+    filter!(disturbance -> disturbance.t_disturbance > tspan[1], member.disturbances)
+
+    # Consistent initial state for the modified parameters and initial disturbances
+    if !isempty(scenario.parameters) || !isempty(initial_disturbances)
+        state_recalculation(power_system_model)
+        if isempty(initial_disturbances)
+            (member.u0, member.du0, converged) = recalculate_system_state(power_system_model, member.u0, tspan[1])
+        else
+            batch = only(event_queue(initial_disturbances, Inf))
+            (member.u0, member.du0, converged) = apply_initial_disturbances!(power_system_model, batch, member.u0, tspan[1])
+        end
+        converged || error("Recalculation of the initial state of an ensemble scenario failed")
+    end
+    return member
+end
+
+# Copies the saved time steps of a solution into the results of scenario s
+#   the variables of the scenario are stored after the first offset variables of the solution
+function copy_ensemble_results!(results::EnsembleResults, soln, s, var_inds, offset=0)
+    for step in 1:min(length(soln.t), length(results.t))
+        u_step = soln.u[step]
+        for (j, i) in enumerate(var_inds)
+            results.u[step, j, s] = u_step[offset+i]
+        end
+    end
+    results.retcodes[s] = string(soln.retcode)
+end
+
+###########################################################################
+# Scenarios integrated separately
+###########################################################################
+# Each scenario is a trajectory of an EnsembleProblem, with the problem of the scenario built by
+# prob_func, and its results copied into the results of the ensemble by output_func
+function run_ensemble_trajectories!(results::EnsembleResults, members, var_inds, tspan, ensemble_algorithm; event_tolerance=1e-6, kwargs...)
+    function member_problem(member)
+        power_system_model = member.power_system_model
+        batches = event_queue(member.disturbances, event_tolerance)
+        if !isempty(batches)
+            state_recalculation(power_system_model)
+        end
+        return DAEProblem(
+            make_dae_function(power_system_model, member.solver),
+            member.du0,
+            member.u0,
+            tspan,
+            power_system_model,
+            differential_vars=power_system_model.differential_vars,
+            tstops=[batch.t for batch in batches],
+            callback=create_event_callback(batches; save_positions=(false, false)),
+        )
+    end
+
+    function output_func(soln, s)
+        copy_ensemble_results!(results, soln, s, var_inds)
+        return (nothing, false)
+    end
+
+    ensemble_problem = EnsembleProblem(
+        member_problem(members[1]);
+        prob_func=(prob, s, repeat) -> member_problem(members[s]),
+        output_func=output_func,
+        safetycopy=false,
+    )
+    solve(ensemble_problem, members[1].solver, ensemble_algorithm; trajectories=length(members), kwargs...)
+    return results
+end
+
+###########################################################################
+# Scenarios integrated in one batched state
+###########################################################################
+function EnsembleModel(members)
+    models = PowerSystemModel[member.power_system_model for member in members]
+    return EnsembleModel(
+        models,
+        length(first(models).variables),
+        [jacobian_sparsity(power_system_model) for power_system_model in models],
+    )
+end
+
+# Index range of the variables of scenario k in the batched vectors
+ensemble_block(ensemble_model::EnsembleModel, k) = (k-1)*ensemble_model.n_variables+1:k*ensemble_model.n_variables
+
+"""
+    ensemble_equations!(out, du, u, p::EnsembleModel, t)
+
+Evaluates the power system equations of every scenario of an ensemble, on its block of the batched vectors.
+"""
+function ensemble_equations!(out, du, u, p::EnsembleModel, t)
+    for k in eachindex(p.models)
+        block = ensemble_block(p, k)
+        power_system_equations!(view(out, block), view(du, block), view(u, block), p.models[k], t)
+    end
+    return nothing
+end
+
+"""
+    ensemble_jacobian!(J::SparseMatrixCSC, du, u, p::EnsembleModel, gamma, t)
+
+Evaluates the block diagonal Jacobian of the equations of an ensemble.
+
+The Jacobian of each scenario is evaluated by `power_system_jacobian!` into its own sparse matrix. The stored entries of each block of `J` are contiguous and in the same order, so they are copied directly.
+"""
+function ensemble_jacobian!(J::SparseMatrixCSC, du, u, p::EnsembleModel, gamma, t)
+    offset = 0
+    for k in eachindex(p.models)
+        (block, J_k) = (ensemble_block(p, k), p.jacobians[k])
+        power_system_jacobian!(J_k, view(du, block), view(u, block), p.models[k], gamma, t)
+        copyto!(nonzeros(J), offset + 1, nonzeros(J_k), 1, nnz(J_k))
+        offset += nnz(J_k)
+    end
+    return nothing
+end
+
+function run_ensemble_batched!(results::EnsembleResults, members, var_inds, tspan; event_tolerance=1e-6, kwargs...)
+    solver = first(members).solver
+    if !supports_sparse_jacobian(solver)
+        error("Batched ensembles require a solver that factorises sparse Jacobians, e.g. IDA(linear_solver=:KLU)")
+    end
+    ensemble_model = EnsembleModel(members)
+
+    # Event queue of each scenario, ordered by time
+    events = Tuple{Int64,EventBatch}[]
+    for (k, member) in enumerate(members)
+        batches = event_queue(member.disturbances, event_tolerance)
+        if !isempty(batches)
+            state_recalculation(member.power_system_model)
+        end
+        append!(events, (k, batch) for batch in batches)
+    end
+    sort!(events; by=event -> (event[2].t, event[1]))
+
+    prob = DAEProblem(
+        DAEFunction(ensemble_equations!; jac=ensemble_jacobian!, jac_prototype=blockdiag(ensemble_model.jacobians...)),
+        reduce(vcat, [member.du0 for member in members]),
+        reduce(vcat, [member.u0 for member in members]),
+        tspan,
+        ensemble_model,
+        differential_vars=reduce(vcat, [member.power_system_model.differential_vars for member in members]),
+        tstops=unique([event[2].t for event in events]),
+    )
+    soln = solve(prob, solver; callback=create_ensemble_event_callback(ensemble_model, events), kwargs...)
+
+    for k in eachindex(members)
+        copy_ensemble_results!(results, soln, k, var_inds, (k - 1) * ensemble_model.n_variables)
+    end
+    return results
+end
+
+"""
+    create_ensemble_event_callback(ensemble_model::EnsembleModel, events::Vector{Tuple{Int64,EventBatch}})
+
+Create a callback that applies each batch of disturbances to the model of its scenario, given by the index of the scenario and the batch of each event in order of time.
+
+The state of each disturbed scenario is recalculated by `recalculate_system_state` on its block of the batched vectors, and the integrator of the ensemble is then re-initialised (see `create_event_callback`). If the recalculation of any scenario does not converge, the integrator of the ensemble is terminated with `ReturnCode.ConvergenceFailure`.
+"""
+function create_ensemble_event_callback(ensemble_model::EnsembleModel, events::Vector{Tuple{Int64,EventBatch}})
+    # Index of the next event
+    next_event = 1
+
+    condition(u, t, integrator) = next_event <= length(events) && t == events[next_event][2].t
+
+    function affect!(integrator)
+        # Apply all batches at this time, and recalculate the state of their scenarios
+        while next_event <= length(events) && events[next_event][2].t == integrator.t
+            (k, batch) = events[next_event]
+            for disturbance in batch.disturbances
+                apply_disturbance!(ensemble_model.models[k], disturbance)
+            end
+            next_event += 1
+
+            block = ensemble_block(ensemble_model, k)
+            (u, du, converged) = recalculate_system_state(ensemble_model.models[k], view(integrator.u, block), integrator.t)
+            if !converged
+                terminate!(integrator, ReturnCode.ConvergenceFailure)
+                return nothing
+            end
+            integrator.u[block] .= u
+            integrator.du[block] .= du
+        end
+        u_modified!(integrator, true)
+    end
+
+    return DiscreteCallback(condition, affect!; save_positions=(false, false))
+end
+
+###########################################################################
+# Accessing results
+###########################################################################
+"""
+    result_variable(results::EnsembleResults, var::AbstractString)
+
+Returns a view of the results of a variable in every scenario of an ensemble, with one row per saved time step and one column per scenario, or `nothing` if the variable was not saved.
+"""
+function result_variable(results::EnsembleResults, var::AbstractString)
+    j = find_variable_index(results.variables, var)
+    return isnothing(j) ? nothing : view(results.u, :, j, :)
+end
+
+function Base.getindex(results::EnsembleResults, var::AbstractString)
+    res_mat = result_variable(results, var)
+    isnothing(res_mat) && throw(KeyError(var))
+    return res_mat
+end
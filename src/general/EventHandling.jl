@@ -0,0 +1,148 @@
+###########################################################################
+# Apply disturbances within a single integrator
+###########################################################################
+"""
+    EventBatch
+
+Disturbances that are applied together at the same time by `run_RMS_events`.
+
+# Fields
+- `t::Float64`: Time at which the disturbances are applied (s), the time of the earliest disturbance.
+- `disturbances::Vector{Disturbance}`: The disturbances, in the order they are applied.
+"""
+struct EventBatch
+    t::Float64
+    disturbances::Vector{Disturbance}
+end
+
+"""
+    event_priority(disturbance::Disturbance)
+
+Returns the priority of a disturbance in the event queue. Disturbances that occur at the same time are applied in order of increasing priority (e.g. a fault is cleared before a new fault is applied).
+"""
+event_priority(disturbance::Disturbance) = 2
+
+"""
+    event_queue(disturbances, event_tolerance)
+
+Returns the batches of the event queue, in order of time.
+
+Disturbances are ordered by time and `event_priority` (and then by their order in `disturbances`). Disturbances that occur within `event_tolerance` (s) of the first disturbance of a batch are added to the batch, and are applied in this order.
+"""
+function event_queue(disturbances, event_tolerance)
+    order = sortperm(collect(eachindex(disturbances)); by=i -> (disturbances[i].t_disturbance, event_priority(disturbances[i]), i))
+
+    batches = EventBatch[]
+    for i in order
+        disturbance = disturbances[i]
+        if isempty(batches) || disturbance.t_disturbance - batches[end].t > event_tolerance
+            push!(batches, EventBatch(disturbance.t_disturbance, Disturbance[]))
+        end
+        push!(batches[end].disturbances, disturbance)
+    end
+    return batches
+end
+
+"""
+    create_event_callback(batches::Vector{EventBatch}; save_positions=(true, true), profile=nothing)
+
+Create a callback that applies each batch of disturbances at its time, and then re-initialises the integrator with a consistent state. `save_positions` selects whether the solution is saved before and after each batch, and the time of each state recalculation is recorded in `profile`, if given.
+
+The state variables are unchanged by the disturbances, and the algebraic variables and derivatives are recalculated by `recalculate_system_state`. If the recalculation does not converge, the integrator is terminated with `ReturnCode.ConvergenceFailure`. Otherwise the integrator is re-initialised from the recalculated state (for IDA, with `IDAReInit`), which discards its step size and order history as a new stage would, without rebuilding the problem.
+"""
+function create_event_callback(batches::Vector{EventBatch}; save_positions=(true, true), profile=nothing)
+    # Index of the next batch
+    next_batch = 1
+
+    condition(u, t, integrator) = next_batch <= length(batches) && t == batches[next_batch].t
+
+    function affect!(integrator)
+        # Apply all disturbances of the batch
+        phase_start = time_ns()
+        batch = batches[next_batch]
+        for disturbance in batch.disturbances
+            apply_disturbance!(integrator.p, disturbance)
+        end
+        next_batch += 1
+
+        # Consistent re-initialisation of the algebraic variables and derivatives
+        (u, du, converged) = recalculate_system_state(integrator.p, integrator.u, integrator.t)
+        if !converged
+            terminate!(integrator, ReturnCode.ConvergenceFailure)
+            return nothing
+        end
+        integrator.u .= u
+        integrator.du .= du
+        u_modified!(integrator, true)
+        record_phase!(profile, "state recalculation", 1, integrator.t, phase_start)
+    end
+
+    return DiscreteCallback(condition, affect!; save_positions=save_positions)
+end
+
+"""
+    apply_initial_disturbances!(power_system_model::PowerSystemModel, batch::EventBatch, u0, t)
+
+Applies a batch of disturbances at the start of a simulation, before the integrator starts, and returns the recalculated initial state `(u, du, converged)` of the disturbed model (see `recalculate_system_state`).
+"""
+function apply_initial_disturbances!(power_system_model::PowerSystemModel, batch::EventBatch, u0, t)
+    for disturbance in batch.disturbances
+        apply_disturbance!(power_system_model, disturbance)
+    end
+    return recalculate_system_state(power_system_model, u0, t)
+end
+
+"""
+    run_RMS_events(power_system_simulation, tspan, output_callbacks; event_tolerance=1e-6, profile=nothing, verbose=true, kwargs...)
+
+Runs an RMS simulation with all disturbances applied within a single integrator, called by `run_RMS_simulation` with `event_handling=:integrator`.
+
+Disturbances are applied in batches from the `event_queue`, and the integrator is re-initialised after each batch by the callback of `create_event_callback`, regardless of `restart_simulation`. Closely spaced disturbances (within `event_tolerance` (s)) are applied together, with a single re-initialisation. Disturbances at `tspan[1]` are applied before the integrator starts, from the initial state recalculated for the disturbed model (see `apply_initial_disturbances!`).
+
+Returns the `DAESolution` of the simulation.
+"""
+function run_RMS_events(power_system_simulation, tspan::Tuple{Float64,Float64}, output_callbacks; event_tolerance=1e-6, profile=nothing, verbose=true, kwargs...)
+    power_system_model = power_system_simulation.power_system_model
+    start_time = time_ns()
+
+    # Event queue
+    disturbances = filter(disturbance -> tspan[1] <= disturbance.t_disturbance <= tspan[2], power_system_simulation.disturbances)
+    batches = event_queue(disturbances, event_tolerance)
+    if !isempty(batches)
+        # build the state recalculation data before the model is perturbed
+        state_recalculation(power_system_model)
+    end
+
+    # Disturbances at the start of the simulation are applied before the integrator starts
+    (u0, du0) = (power_system_simulation.u0, power_system_simulation.du0)
+    if !isempty(batches) && batches[1].t == tspan[1]
+        phase_start = time_ns()
+        (u0, du0, converged) = apply_initial_disturbances!(power_system_model, popfirst!(batches), u0, tspan[1])
+        converged || error("Recalculation of system state failed for the disturbances at t = $(tspan[1])")
+        record_phase!(profile, "state recalculation", 1, tspan[1], phase_start)
+    end
+
+    prob = DAEProblem(
+        make_dae_function(power_system_model, power_system_simulation.solver; profile=profile),
+        du0,
+        u0,
+        tspan,
+        power_system_model,
+        differential_vars=power_system_model.differential_vars,
+        tstops=[batch.t for batch in batches],
+    )
+    soln = solve(
+        prob,
+        power_system_simulation.solver;
+        callback=CallbackSet(create_event_callback(batches; profile=profile), output_callbacks...),
+        kwargs...
+    )
+    record_phase!(profile, "solve", 1, tspan[1], start_time)
+    record_solver_statistics!(profile, 1, soln)
+
+    if verbose
+        soln.retcode != ReturnCode.Success ? println("Simulation failed at t = ", soln.t[end]) : println("Simulation completed successfully")
+        print_solution_info(soln, start_time)
+    end
+    return soln
+end
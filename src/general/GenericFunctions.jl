@@ -7,7 +7,7 @@ struct phasor
     θ::Any
 end
 
-function ptc(r::Union{Float64,Int}, θ::Union{Float64,Int}; deg=false)
+function ptc(r::Real, θ::Real; deg=false)
     if deg == true
         return r * (cos(pi * θ / 180) + 1im * sin(pi * θ / 180))
     else
@@ -50,11 +50,23 @@ function ctp(x::Union{Float64,Int64}, y::Union{Float64,Int64}; deg=false)
 end
 
 # dq0 transformations
-function dq_transform(phsr::ComplexF64, δ::Float64)
+#   Real arguments allow dual numbers when differentiating the component model equations
+function dq_transform(phsr::Complex, δ::Real)
     phsr_dq = phsr / (cos(δ - pi / 2) + 1im * sin(δ - pi / 2))
     return (real(phsr_dq), imag(phsr_dq))
 end
 
+###########################################################################
+# Sparse admittance matrix
+###########################################################################
+# Indexes and admittances of the buses connected to bus i (including bus i itself)
+#   The structure of an admittance matrix is symmetric, so the connections in row i are the
+#   stored rows of column i. Only these entries are accessed, rather than the whole row.
+function admittance_row(Y::SparseMatrixCSC, i)
+    connected_buses = [k for k in rowvals(Y)[nzrange(Y, i)] if Y[i, k] != 0]
+    return connected_buses, [Y[i, k] for k in connected_buses]
+end
+
 ###########################################################################
 # Search for generators and loads connected to a bus
 ###########################################################################
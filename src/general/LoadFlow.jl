@@ -0,0 +1,177 @@
+###########################################################################
+# Load flow
+###########################################################################
+"""
+    solve_load_flow!(net; method=:newton_raphson, warm_start=true, tol=1e-8, max_iterations=50)
+
+Solves the AC load flow of a network, and updates the bus voltages and generator power outputs in the network data dictionary with the solution.
+
+# Arguments
+- `net`: Network data dictionary.
+- `method`: `:newton_raphson`, or `:fast_decoupled` for the fast decoupled load flow (XB version).
+- `warm_start`: Start from the bus voltages in `net` (e.g. the solution of a previous load flow), otherwise from a flat start.
+- `tol`: Tolerance on the largest active and reactive power mismatch (p.u.).
+- `max_iterations`: The maximum number of iterations.
+
+Returns whether the load flow converged. The network data dictionary is updated only if the load flow converged.
+
+# Note
+- The admittance matrix is taken from `net["Y"]`, and is added to `net` if it has not been calculated already (see `add_admittance_matrix!`).
+- As for the PowerModels load flow, the voltage magnitudes of PV and reference buses are held at the `vm` of the bus, and generator reactive power limits are not enforced.
+- The active power of the reference bus, and the reactive power of PV and reference buses, are shared equally between the in-service generators at the bus.
+"""
+function solve_load_flow!(net; method=:newton_raphson, warm_start=true, tol=1e-8, max_iterations=50)
+    haskey(net, "Y") ? nothing : add_admittance_matrix!(net)
+    Y = net["Y"]
+    num_buses = size(Y, 1)
+
+    # Bus types (1 = PQ, 2 = PV, 3 = reference)
+    bus_type = [net["bus"]["$bus_ind"]["bus_type"] for bus_ind = 1:num_buses]
+    pv = findall(==(2), bus_type)
+    pq = findall(==(1), bus_type)
+    pvpq = [pv; pq]
+
+    # Specified power injections
+    S_spec = zeros(ComplexF64, num_buses)
+    for gen in values(net["gen"])
+        gen["gen_status"] == 1 ? S_spec[gen["gen_bus"]] += gen["pg"] + im * gen["qg"] : nothing
+    end
+    for load in values(net["load"])
+        load["status"] == 1 ? S_spec[load["load_bus"]] -= load["pd"] + im * load["qd"] : nothing
+    end
+
+    # Initial bus voltages
+    Vm = [net["bus"]["$bus_ind"]["vm"] for bus_ind = 1:num_buses]
+    Va = [net["bus"]["$bus_ind"]["va"] for bus_ind = 1:num_buses]
+    if !warm_start
+        Vm[pq] .= 1.0
+        Va[pvpq] .= 0.0
+    end
+
+    if method == :newton_raphson
+        converged = newton_raphson_load_flow!(Vm, Va, Y, S_spec, pv, pq, tol, max_iterations)
+    elseif method == :fast_decoupled
+        converged = fast_decoupled_load_flow!(Vm, Va, Y, fast_decoupled_susceptance(net, num_buses), S_spec, pv, pq, tol, max_iterations)
+    else
+        error("Unknown load flow method $method, expected :newton_raphson or :fast_decoupled")
+    end
+    if converged
+        update_load_flow_solution!(net, Vm, Va, Y, pq)
+    end
+    return converged
+end
+
+# Power mismatch of the active power of PV and PQ buses and the reactive power of PQ buses
+function load_flow_mismatch(Vm, Va, Y, S_spec, pvpq, pq)
+    V = Vm .* cis.(Va)
+    ΔS = V .* conj.(Y * V) .- S_spec
+    return [real.(ΔS[pvpq]); imag.(ΔS[pq])]
+end
+
+function newton_raphson_load_flow!(Vm, Va, Y, S_spec, pv, pq, tol, max_iterations)
+    pvpq = [pv; pq]
+    (n_pvpq, n_pq) = (length(pvpq), length(pq))
+
+    for iteration = 0:max_iterations
+        F = load_flow_mismatch(Vm, Va, Y, S_spec, pvpq, pq)
+        if maximum(abs, F; init=0.0) < tol
+            return true
+        elseif iteration == max_iterations
+            break
+        end
+
+        # Jacobian of the complex power injections with respect to the voltage angles and magnitudes
+        V = Vm .* cis.(Va)
+        I = Y * V
+        dS_dVa = im * Diagonal(V) * conj.(Diagonal(I) - Y * Diagonal(V))
+        dS_dVm = Diagonal(V) * conj.(Y * Diagonal(cis.(Va))) + conj.(Diagonal(I)) * Diagonal(cis.(Va))
+        J = [
+            real.(dS_dVa[pvpq, pvpq]) real.(dS_dVm[pvpq, pq])
+            imag.(dS_dVa[pq, pvpq]) imag.(dS_dVm[pq, pq])
+        ]
+
+        Δx = J \ F
+        Va[pvpq] .-= Δx[1:n_pvpq]
+        Vm[pq] .-= Δx[n_pvpq+1:n_pvpq+n_pq]
+    end
+    return false
+end
+
+# Fast decoupled load flow, with the constant matrices B' (for the voltage angles) and B'' (for
+# the voltage magnitudes) factorised once
+function fast_decoupled_load_flow!(Vm, Va, Y, B_prime, S_spec, pv, pq, tol, max_iterations)
+    pvpq = [pv; pq]
+    n_pvpq = length(pvpq)
+    B_prime_factorisation = lu(B_prime[pvpq, pvpq])
+    B_double_prime_factorisation = lu(-imag.(Y[pq, pq]))
+
+    for iteration = 0:max_iterations
+        F = load_flow_mismatch(Vm, Va, Y, S_spec, pvpq, pq)
+        if maximum(abs, F; init=0.0) < tol
+            return true
+        elseif iteration == max_iterations
+            break
+        end
+
+        # Voltage angle half iteration
+        Va[pvpq] .-= B_prime_factorisation \ (F[1:n_pvpq] ./ Vm[pvpq])
+
+        # Voltage magnitude half iteration
+        F = load_flow_mismatch(Vm, Va, Y, S_spec, pvpq, pq)
+        Vm[pq] .-= B_double_prime_factorisation \ (F[n_pvpq+1:end] ./ Vm[pq])
+    end
+    return false
+end
+
+# B' of the fast decoupled load flow, from the branch reactances only (resistances, shunts and
+# tap ratios are neglected)
+function fast_decoupled_susceptance(net, num_buses)
+    (rows, cols, B) = (Int64[], Int64[], Float64[])
+    for branch in values(net["branch"])
+        if branch["br_status"] != 1
+            continue
+        end
+        (f, t, b) = (branch["f_bus"], branch["t_bus"], 1 / branch["br_x"])
+        append!(rows, [f, t, f, t])
+        append!(cols, [f, t, t, f])
+        append!(B, [b, b, -b, -b])
+    end
+    return sparse(rows, cols, B, num_buses, num_buses)
+end
+
+function update_load_flow_solution!(net, Vm, Va, Y, pq)
+    for bus_ind in eachindex(Vm)
+        net["bus"]["$bus_ind"]["vm"] = Vm[bus_ind]
+        net["bus"]["$bus_ind"]["va"] = Va[bus_ind]
+    end
+
+    # Power injected into the network at each bus, plus the power drawn by loads
+    V = Vm .* cis.(Va)
+    S_gen = V .* conj.(Y * V)
+    for load in values(net["load"])
+        load["status"] == 1 ? S_gen[load["load_bus"]] += load["pd"] + im * load["qd"] : nothing
+    end
+
+    # Share the power of each bus between its generators
+    gens = [gen for gen in values(net["gen"]) if gen["gen_status"] == 1]
+    for gen in gens
+        bus_ind = gen["gen_bus"]
+        num_bus_gens = count(g -> g["gen_bus"] == bus_ind, gens)
+        if net["bus"]["$bus_ind"]["bus_type"] == 3
+            gen["pg"] = real(S_gen[bus_ind]) / num_bus_gens
+        end
+        if !(bus_ind in pq)
+            gen["qg"] = imag(S_gen[bus_ind]) / num_bus_gens
+        end
+    end
+end
+
+"""
+    add_admittance_matrix!(net)
+
+Calculates the sparse admittance matrix of a network and adds it to the network data dictionary as `net["Y"]`, where it is used by the load flow and by `build_component_list`.
+"""
+function add_admittance_matrix!(net)
+    net["Y"] = sparse(calc_admittance_matrix(net).matrix)
+    return net["Y"]
+end
@@ -1,4 +1,4 @@
-string_to_component_model_type = Dict(
+const string_to_component_model_type = Dict(
     "SixthOrderModel" => SixthOrderModel,
     "ConstantExcitation" => ConstantExcitation,
     "ConstantMechanicalPower" => ConstantMechanicalPower,
@@ -0,0 +1,152 @@
+###########################################################################
+# Record selected outputs during simulation
+###########################################################################
+function OutputSpecification(var_list, variables; derived=[], decimation=1, capacity=10000)
+    # Expand variables given as a variable and element indexes, i.e. "Pg" => [2, 9]
+    var_names = String[]
+    for var in variables
+        if var isa Pair
+            append!(var_names, [pad_with_element_index(String(var.first), element) for element in var.second])
+        else
+            push!(var_names, var)
+        end
+    end
+
+    # Indexes of variables
+    var_inds = Int64[]
+    for var in var_names
+        var_ind = find_variable_index(var_list, var)
+        isnothing(var_ind) && error("$var is not a simulation variable")
+        push!(var_inds, var_ind)
+    end
+
+    names = [var_names; [String(first(output)) for output in derived]]
+    return OutputSpecification(
+        names,
+        [var_inds; zeros(Int64, length(derived))],
+        [fill(nothing, length(var_names)); [last(output) for output in derived]],
+        decimation,
+        0,
+        0,
+        zeros(capacity),
+        zeros(capacity, length(names)),
+    )
+end
+
+OutputSpecification(power_system_simulation::PowerSystemSimulation, variables; kwargs...) =
+    OutputSpecification(power_system_simulation.power_system_model.variables, variables; kwargs...)
+
+# The recorded time steps and values, as views of the buffers
+recorded_times(outputs::OutputSpecification) = view(outputs.t_buffer, 1:outputs.n_recorded)
+recorded_values(outputs::OutputSpecification, i) = view(outputs.buffer, 1:outputs.n_recorded, i)
+
+function Base.getproperty(outputs::OutputSpecification, name::Symbol)
+    name == :t && return recorded_times(outputs)
+    return getfield(outputs, name)
+end
+
+function Base.getindex(outputs::OutputSpecification, name::AbstractString)
+    i = findfirst(isequal(name), outputs.names)
+    isnothing(i) && throw(KeyError(name))
+    return recorded_values(outputs, i)
+end
+
+# Discards the outputs recorded by a previous simulation
+function reset_outputs!(outputs::OutputSpecification)
+    outputs.n_steps = 0
+    outputs.n_recorded = 0
+    return nothing
+end
+reset_outputs!(outputs) = nothing
+
+# Doubles the capacity of the buffers, keeping the recorded outputs
+function grow_outputs!(outputs::OutputSpecification)
+    capacity = max(2 * length(outputs.t_buffer), 1)
+    buffer = zeros(capacity, length(outputs.names))
+    buffer[1:outputs.n_recorded, :] .= view(outputs.buffer, 1:outputs.n_recorded, :)
+    outputs.buffer = buffer
+    resize!(outputs.t_buffer, capacity)
+    return nothing
+end
+
+function record_outputs!(outputs::OutputSpecification, u, t)
+    k = outputs.n_recorded + 1
+    k > length(outputs.t_buffer) ? grow_outputs!(outputs) : nothing
+    outputs.t_buffer[k] = t
+    for i in eachindex(outputs.names)
+        outputs.buffer[k, i] = outputs.var_inds[i] != 0 ? u[outputs.var_inds[i]] : outputs.derived[i](u, t)
+    end
+    outputs.n_recorded = k
+    return nothing
+end
+
+# Recorded outputs are held in memory, nothing to write
+close_outputs!(outputs::OutputSpecification) = nothing
+
+"""
+    create_output_callback(outputs)
+
+Create a callback that records the outputs at the start of each simulation stage and at every `outputs.decimation`th step of the solver.
+
+`outputs` is an `OutputSpecification` or a `ResultsStreamWriter`, which define `record_outputs!(outputs, u, t)`. The outputs recorded in an `OutputSpecification` by a previous simulation are discarded.
+"""
+function create_output_callback(outputs)
+    reset_outputs!(outputs)
+
+    # Record at every step (the decimation is counted in affect!)
+    condition(u, t, integrator) = true
+
+    function affect!(integrator)
+        outputs.n_steps += 1
+        if outputs.n_steps % outputs.decimation == 0
+            record_outputs!(outputs, integrator.u, integrator.t)
+        end
+        u_modified!(integrator, false)
+    end
+
+    # Record the initial state of the stage
+    initialize(c, u, t, integrator) = record_outputs!(outputs, u, t)
+
+    return DiscreteCallback(condition, affect!; initialize=initialize, save_positions=(false, false))
+end
+
+"""
+    coi_frequency(power_system_model::PowerSystemModel)
+    coi_frequency(power_system_simulation::PowerSystemSimulation)
+
+Returns a function `f(u, t)` that calculates the centre of inertia frequency of the generators, for use as a derived output in an `OutputSpecification`.
+
+``ω_{coi} = \\frac{\\sum_{i=1}^{n} M_i ω_i}{\\sum_{i=1}^{n} M_i}``
+
+The inertia constants `M_i` are those of the component models, so that the output matches the simulated dynamics: the `M_vec` of the `COIReferenceFrequency` if the centre of inertia reference is selected, otherwise ``M_i = 2H_i/ω_s`` of each synchronous generator model (including any parameters set by `set_parameters!` before the function is created).
+"""
+function coi_frequency(power_system_model::PowerSystemModel)
+    component_list = power_system_model.component_list
+    coi_ind = findfirst(component_model -> component_model.model isa COIReferenceFrequency, component_list)
+    if !isnothing(coi_ind)
+        # Generator speeds of the reference frequency model (u = [ω_coi; ω])
+        ω_inds = component_list[coi_ind].inds_u[2:end]
+        M_vec = copy(component_list[coi_ind].model.M_vec)
+    else
+        ω_inds = Int64[]
+        M_vec = Float64[]
+        for component_model in component_list
+            model = component_model.model
+            if model isa SynchronousGeneratorModel
+                push!(ω_inds, find_variable_index(power_system_model.variables, "ω_$(component_model.source_ind)"))
+                push!(M_vec, 2 * model.H / model.ωs)
+            end
+        end
+    end
+    Mt = sum(M_vec)
+
+    function ω_coi(u, t)
+        Mω = 0.0
+        for i in eachindex(ω_inds)
+            Mω += M_vec[i] * u[ω_inds[i]]
+        end
+        return Mω / Mt
+    end
+    return ω_coi
+end
+coi_frequency(power_system_simulation::PowerSystemSimulation) = coi_frequency(power_system_simulation.power_system_model)
@@ -0,0 +1,410 @@
+using DataFrames, Mmap
+###########################################################################
+# PowerFactory results header
+###########################################################################
+"""
+    PowerFactoryHeader
+
+The element/variable map of a PowerFactory results export (`header_<name>.csv`).
+
+# Fields
+- `elements::Vector{String}`: Element name of each column, i.e. "Bus 31". The first column is "time".
+- `classes::Vector{String}`: PowerFactory class of each element, i.e. "ElmTerm".
+- `variables::Vector{String}`: Variable of each column, including the variable set, i.e. "m:u1".
+- `names::Vector{String}`: Column names in the form "element_variable" with the variable set removed, i.e. "Bus 31_u1".
+- `index::Dict{String,Int64}`: Column index of each name.
+"""
+struct PowerFactoryHeader
+    elements::Vector{String}
+    classes::Vector{String}
+    variables::Vector{String}
+    names::Vector{String}
+    index::Dict{String,Int64}
+end
+
+function PowerFactoryHeader(elements::Vector{String}, classes::Vector{String}, variables::Vector{String})
+    names = [pf_column_name(elm, var) for (elm, var) in zip(elements, variables)]
+    names[1] = "time" # first column is time
+    index = Dict(name => i for (i, name) in enumerate(names))
+    return PowerFactoryHeader(elements, classes, variables, names, index)
+end
+
+# join elm and variable, removing the variable set. i.e. "Load 16", "m:Psum:bus1" -> "Load 16_Psum_bus1"
+pf_column_name(elm, var) = "$(elm)_$(join(split(var, ":")[2:end], "_"))"
+
+pf_header_path(folder_path::String, file_name::String) = joinpath(folder_path, "header_$(file_name).csv")
+pf_values_path(folder_path::String, file_name::String) = joinpath(folder_path, "$(file_name).csv")
+pf_binary_path(folder_path::String, file_name::String) = joinpath(folder_path, "$(file_name).bin")
+
+"""
+    read_pf_header(fp_header::String)
+    read_pf_header(folder_path::String, file_name::String)
+
+Parse the header file of a PowerFactory results export to a `PowerFactoryHeader`.
+
+The header file is written by ComRes with `iopt_vars = 1`. The second method reads `header_<file_name>.csv` in `folder_path`.
+"""
+function read_pf_header(fp_header::String)
+    elements = String[]
+    classes = String[]
+    variables = String[]
+
+    open(fp_header) do file
+        (elm, cls) = ("time", "")
+        for (idx, line) in enumerate(eachline(file))
+            idx <= 2 || isempty(strip(line)) ? continue : nothing   # skip preamble
+            if startswith(line, "\\") || startswith(line, "'") # get elm from elm data lines
+                (elm, cls) = parse_pf_element(line)
+            else
+                cells = split(line, ",")
+                push!(elements, elm)
+                push!(classes, cls)
+                push!(variables, String(cells[2]))
+            end
+        end
+    end
+
+    return PowerFactoryHeader(elements, classes, variables)
+end
+read_pf_header(folder_path::String, file_name::String) = read_pf_header(pf_header_path(folder_path, file_name))
+
+# i.e. "'\user\...\Power Plant 02.ElmComp\AVR 02.ElmDsl':" -> ("AVR 02", "ElmDsl")
+function parse_pf_element(line)
+    elm_with_class = split(rstrip(line, [':', '\'', ' ']), "\\")[end]
+    parts = rsplit(elm_with_class, "."; limit=2)
+    return length(parts) == 2 ? (String(parts[1]), String(parts[2])) : (String(parts[1]), "")
+end
+
+"""
+    write_pf_header(fp_header::String, header::PowerFactoryHeader; source="RMSPowerSims.jl")
+
+Write a `PowerFactoryHeader` in the format of a PowerFactory results export header, so that it can be read with `read_pf_header`.
+"""
+function write_pf_header(fp_header::String, header::PowerFactoryHeader; source="RMSPowerSims.jl")
+    open(fp_header, "w") do file
+        println(file, "$(source):")
+        println(file, "'$(splitext(basename(fp_header))[1])':")
+        (elm, cls) = ("time", "")
+        for (i, var) in enumerate(header.variables)
+            if i > 1 && (header.elements[i], header.classes[i]) != (elm, cls)
+                (elm, cls) = (header.elements[i], header.classes[i])
+                println(file, isempty(cls) ? "'\\$(elm)':" : "'\\$(elm).$(cls)':")
+            end
+            println(file, "$(i),$(var),,\"$(var)\"")
+        end
+    end
+end
+
+# column indexes of a collection of column names (or indexes)
+column_indexes(header::PowerFactoryHeader, columns) =
+    unique([column isa Integer ? Int64(column) : header.index[column] for column in columns])
+
+# header containing only the selected columns
+function select_columns(header::PowerFactoryHeader, col_inds::Vector{Int64})
+    return PowerFactoryHeader(header.elements[col_inds], header.classes[col_inds], header.variables[col_inds])
+end
+
+###########################################################################
+# Streaming reader for PowerFactory results values
+###########################################################################
+"""
+    foreach_pf_chunk(f, fp::String, header::PowerFactoryHeader; columns=nothing, chunk_size=10_000)
+
+Stream the values file of a PowerFactory results export in chunks of `chunk_size` rows.
+
+`f(chunk, row_offset)` is called for each chunk, where `chunk` is a `Matrix{Float64}` with one column for each selected column (in the order given by `columns`) and `row_offset` is the number of rows read before the chunk. Only the selected columns are parsed. Returns the total number of rows.
+
+# Arguments
+- `f`: Function called for each chunk.
+- `fp`: Path to the values file, written by ComRes with `iopt_vars = 0`.
+- `header`: The header of the export, see `read_pf_header`.
+- `columns`: Names or indexes of the columns to read. All columns are read if `nothing`.
+- `chunk_size`: Number of rows in each chunk.
+
+# Note
+- The chunk buffer is reused between calls, `f` must copy any data it keeps.
+"""
+function foreach_pf_chunk(f::Function, fp::String, header::PowerFactoryHeader; columns=nothing, chunk_size::Int64=10_000)
+    col_inds = isnothing(columns) ? collect(eachindex(header.names)) : column_indexes(header, columns)
+
+    # position of each file column in the chunk (zero if not selected)
+    chunk_cols = zeros(Int64, length(header.names))
+    chunk_cols[col_inds] = 1:length(col_inds)
+    n_last = maximum(col_inds)
+
+    buffer = Matrix{Float64}(undef, chunk_size, length(col_inds))
+    n_rows = 0
+    row_offset = 0
+    open(fp) do file
+        for (idx, line) in enumerate(eachline(file))
+            idx <= 2 || isempty(line) ? continue : nothing # skip element and variable rows
+            n_rows += 1
+            parse_pf_row!(buffer, n_rows, line, chunk_cols, n_last)
+            if n_rows == chunk_size
+                f(buffer, row_offset)
+                row_offset += n_rows
+                n_rows = 0
+            end
+        end
+    end
+    if n_rows > 0
+        f(@view(buffer[1:n_rows, :]), row_offset)
+    end
+
+    return row_offset + n_rows
+end
+
+# parse the selected fields of a line of comma separated values into a row of the buffer
+function parse_pf_row!(buffer, row, line, chunk_cols, n_last)
+    col = 1
+    field_start = 1
+    n = ncodeunits(line)
+    for i = 1:n+1
+        if i > n || codeunit(line, i) == UInt8(',')
+            j = chunk_cols[col]
+            if j != 0
+                buffer[row, j] = parse(Float64, SubString(line, field_start, i - 1))
+            end
+            if col == n_last
+                return nothing
+            end
+            col += 1
+            field_start = i + 1
+        end
+    end
+    throw(ArgumentError("row $(row) has $(col - 1) columns, expected at least $(n_last)"))
+end
+
+"""
+    read_pf_results(folder_path::String, file_name::String; columns=nothing, chunk_size=10_000)
+
+Read a PowerFactory results export (`header_<file_name>.csv` and `<file_name>.csv`) to a DataFrame.
+
+Only the selected `columns` are parsed and stored. Column names are in the form "element_variable", i.e. "Bus 31_u1", and the first column is "time".
+"""
+function read_pf_results(folder_path::String, file_name::String; columns=nothing, chunk_size::Int64=10_000)
+    header = read_pf_header(folder_path, file_name)
+    col_inds = isnothing(columns) ? collect(eachindex(header.names)) : column_indexes(header, columns)
+
+    data = [Float64[] for _ in col_inds]
+    foreach_pf_chunk(pf_values_path(folder_path, file_name), header; columns=col_inds, chunk_size=chunk_size) do chunk, row_offset
+        for (j, column) in enumerate(data)
+            append!(column, @view(chunk[:, j]))
+        end
+    end
+
+    return DataFrame([header.names[i] => data[j] for (j, i) in enumerate(col_inds)])
+end
+
+###########################################################################
+# Columnar binary results
+###########################################################################
+"""
+    PowerFactoryBinaryResults
+
+Results stored as memory-mapped Float64 columns.
+
+The values file (`<file_name>.bin`) contains each column of the results one after another, and is accompanied by a header file (`header_<file_name>.csv`) in PowerFactory format. Columns are accessed as views, i.e. `results["Bus 31_u1"]`, and are only read from disk when used.
+
+# Fields
+- `header::PowerFactoryHeader`: The element/variable map of the columns.
+- `data::Matrix{Float64}`: Memory-mapped values, with one row for each time step and one column for each column of the results.
+"""
+struct PowerFactoryBinaryResults
+    header::PowerFactoryHeader
+    data::Matrix{Float64}
+end
+
+Base.getindex(results::PowerFactoryBinaryResults, name::String) = @view results.data[:, results.header.index[name]]
+Base.getindex(results::PowerFactoryBinaryResults, i::Integer) = @view results.data[:, i]
+Base.names(results::PowerFactoryBinaryResults) = results.header.names
+
+"""
+    open_pf_binary(folder_path::String, file_name::String)
+
+Memory-map binary results written by `convert_pf_results` to a `PowerFactoryBinaryResults`.
+"""
+function open_pf_binary(folder_path::String, file_name::String)
+    header = read_pf_header(folder_path, file_name)
+    n_cols = length(header.names)
+    data = open(pf_binary_path(folder_path, file_name)) do file
+        n_rows = div(filesize(file), sizeof(Float64) * n_cols)
+        Mmap.mmap(file, Matrix{Float64}, (n_rows, n_cols))
+    end
+    return PowerFactoryBinaryResults(header, data)
+end
+
+"""
+    convert_pf_results(folder_path, file_name, out_folder_path=folder_path; out_file_name=file_name, columns=nothing, chunk_size=10_000)
+
+Convert a PowerFactory results export to binary results that can be opened with `open_pf_binary`.
+
+The values file is streamed in chunks into a memory-mapped output file, so the full table is never held in memory. Only the selected `columns` are converted, the time column is always included.
+"""
+function convert_pf_results(
+    folder_path::String,
+    file_name::String,
+    out_folder_path::String=folder_path;
+    out_file_name::String=file_name,
+    columns=nothing,
+    chunk_size::Int64=10_000,
+)
+    header = read_pf_header(folder_path, file_name)
+    col_inds = isnothing(columns) ? collect(eachindex(header.names)) : unique([1; column_indexes(header, columns)])
+    fp_values = pf_values_path(folder_path, file_name)
+
+    # write header of selected columns
+    write_pf_header(pf_header_path(out_folder_path, out_file_name), select_columns(header, col_inds))
+
+    # count rows, skipping element and variable rows
+    n_rows = 0
+    for (idx, line) in enumerate(eachline(fp_values))
+        if idx > 2 && !isempty(line)
+            n_rows += 1
+        end
+    end
+
+    # fill columns chunk by chunk
+    open(pf_binary_path(out_folder_path, out_file_name), "w+") do file
+        data = Mmap.mmap(file, Matrix{Float64}, (n_rows, length(col_inds)))
+        foreach_pf_chunk(fp_values, header; columns=col_inds, chunk_size=chunk_size) do chunk, row_offset
+            data[row_offset+1:row_offset+size(chunk, 1), :] .= chunk
+        end
+        Mmap.sync!(data)
+    end
+
+    return open_pf_binary(out_folder_path, out_file_name)
+end
+
+###########################################################################
+# Streaming simulation results writer
+###########################################################################
+"""
+    ResultsStreamWriter
+
+Writes simulation results to disk during an RMS simulation, in the binary results format read by `open_pf_binary`.
+
+Passing a `ResultsStreamWriter` to `run_RMS_simulation` with the `outputs` keyword records the selected variables at every `decimation`th step of the solver. Recorded rows are held in a buffer of `chunk_size` rows, which is appended to a temporary file (`<file_name>.rows`) when full. When the simulation finishes, the rows are transposed into the columns of `<file_name>.bin`, so only one chunk of results is held in memory at a time.
+
+The header (`header_<file_name>.csv`) is written in PowerFactory format, with one element for each element of the variable registry (i.e. "bus 31"), and the variables of the registry (i.e. "m:V", read as the column "bus 31_V").
+
+# Fields
+- `folder_path::String`, `file_name::String`: Location of the results files.
+- `header::PowerFactoryHeader`: The element/variable map of the columns. The first column is "time".
+- `var_inds::Vector{Int64}`: The index of the variable of each column (after time) in the u vector.
+- `decimation::Int64`: The number of solver steps between recorded steps.
+- `n_steps::Int64`: The number of solver steps taken since recording started.
+- `buffer::Matrix{Float64}`: Recorded rows that have not been written, with one column for each row.
+- `n_buffered::Int64`: The number of rows in the buffer.
+- `n_rows::Int64`: The number of rows written to disk.
+- `io::IOStream`: The temporary file of rows.
+
+# Constructor
+```julia
+ResultsStreamWriter(folder_path, file_name, var_list; variables=nothing, decimation=1, chunk_size=1000)
+```
+Only the variables named in `variables` are recorded (all variables if `nothing`).
+"""
+mutable struct ResultsStreamWriter
+    folder_path::String
+    file_name::String
+    header::PowerFactoryHeader
+    var_inds::Vector{Int64}
+    decimation::Int64
+    n_steps::Int64
+    buffer::Matrix{Float64}
+    n_buffered::Int64
+    n_rows::Int64
+    io::IOStream
+end
+
+function ResultsStreamWriter(folder_path::String, file_name::String, var_list; variables=nothing, decimation=1, chunk_size::Int64=1000)
+    var_list = VariableRegistry(var_list)
+
+    # Indexes of recorded variables
+    if isnothing(variables)
+        var_inds = collect(1:length(var_list))
+    else
+        var_inds = Int64[]
+        for var in variables
+            var_ind = find_variable_index(var_list, var)
+            isnothing(var_ind) && error("$var is not a simulation variable")
+            push!(var_inds, var_ind)
+        end
+        sort!(unique!(var_inds))
+    end
+
+    # Header matching the variable registry, i.e. "V_31" -> element "bus 31", variable "m:V"
+    header = PowerFactoryHeader(
+        ["time"; [stream_element_name(var_list, i) for i in var_inds]],
+        [""; [string(var_list.classes[i]) for i in var_inds]],
+        ["b:tnow"; ["m:$(var_list.base_names[i])" for i in var_inds]],
+    )
+    write_pf_header(pf_header_path(folder_path, file_name), header)
+
+    return ResultsStreamWriter(
+        folder_path,
+        file_name,
+        header,
+        var_inds,
+        decimation,
+        0,
+        Matrix{Float64}(undef, length(var_inds) + 1, chunk_size),
+        0,
+        0,
+        open(stream_rows_path(folder_path, file_name), "w"),
+    )
+end
+
+stream_rows_path(folder_path::String, file_name::String) = joinpath(folder_path, "$(file_name).rows")
+stream_element_name(var_list::VariableRegistry, i) =
+    var_list.classes[i] == :system ? "system" : "$(var_list.classes[i]) $(var_list.elements[i])"
+
+function record_outputs!(writer::ResultsStreamWriter, u, t)
+    writer.n_buffered += 1
+    (buffer, k) = (writer.buffer, writer.n_buffered)
+    buffer[1, k] = t
+    for (j, var_ind) in enumerate(writer.var_inds)
+        buffer[j+1, k] = u[var_ind]
+    end
+    if writer.n_buffered == size(buffer, 2)
+        flush_buffer!(writer)
+    end
+    return nothing
+end
+
+# append the buffered rows to the temporary file
+function flush_buffer!(writer::ResultsStreamWriter)
+    write(writer.io, @view(writer.buffer[:, 1:writer.n_buffered]))
+    writer.n_rows += writer.n_buffered
+    writer.n_buffered = 0
+end
+
+"""
+    close_outputs!(writer::ResultsStreamWriter)
+
+Write the remaining rows of a `ResultsStreamWriter` and convert the results to columns, so that they can be opened with `open_pf_binary`. Called by `run_RMS_simulation` when the simulation finishes.
+"""
+function close_outputs!(writer::ResultsStreamWriter; chunk_size::Int64=size(writer.buffer, 2))
+    isopen(writer.io) || return nothing
+    flush_buffer!(writer)
+    close(writer.io)
+
+    # transpose rows into columns, one chunk of rows at a time
+    (n_cols, n_rows) = (length(writer.header.names), writer.n_rows)
+    fp_rows = stream_rows_path(writer.folder_path, writer.file_name)
+    open(pf_binary_path(writer.folder_path, writer.file_name), "w+") do file
+        n_rows == 0 && return nothing
+        data = Mmap.mmap(file, Matrix{Float64}, (n_rows, n_cols))
+        rows = open(fp_rows) do file_rows
+            Mmap.mmap(file_rows, Matrix{Float64}, (n_cols, n_rows))
+        end
+        for row_offset in 0:chunk_size:n_rows-1
+            row_range = row_offset+1:min(row_offset + chunk_size, n_rows)
+            data[row_range, :] .= transpose(@view(rows[:, row_range]))
+        end
+        Mmap.sync!(data)
+    end
+    rm(fp_rows)
+    return nothing
+end
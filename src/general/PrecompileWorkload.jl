@@ -0,0 +1,26 @@
+###########################################################################
+# Precompilation workload
+###########################################################################
+# Prepares and simulates a small network with each disturbance type and event handling option
+# during precompilation, so that the first simulation in a new Julia session does not compile
+# the solver, the component models and the disturbances.
+@setup_workload begin
+    network_file = joinpath(dirname(dirname(@__DIR__)), "data", "example_test_systems", "single_gen_three_bus_network.json")
+    disturbances = Disturbance[
+        LoadStep(1, 0.1, 0.1),
+        BusFault(2, 0.2),
+        ClearBusFault(2, 0.25, restart_simulation=true),
+    ]
+
+    @compile_workload begin
+        redirect_stdout(devnull) do
+            net = parse_network_json(network_file)
+            power_system_simulation = prepare_simulation(net)
+            power_system_simulation.disturbances = disturbances
+            for event_handling in (:stages, :integrator)
+                soln = run_RMS_simulation(power_system_simulation, (0.0, 0.5); event_handling=event_handling, dtmax=0.01)
+                add_simulation_results!(net, soln)
+            end
+        end
+    end
+end
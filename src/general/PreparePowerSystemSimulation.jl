@@ -1,17 +1,53 @@
 ###########################################################################
 # Build PowerSystemSimulation object
 ###########################################################################
-function prepare_simulation(net; recalculate_load_flow=true)
+# recalculate_load_flow: solve the load flow before calculating the initial conditions, otherwise
+#   the initial conditions are calculated from the load flow solution in net
+# load_flow_method: :ipopt, :newton_raphson or :fast_decoupled (see calculate_system_ic!)
+# network_model: see build_component_list
+# reduce_network: eliminate the passive buses of the network by Kron reduction (see
+#   add_network_reduction!), which requires network_model = NetworkModel
+# cache: a SimulationCache, to reuse the load flow solution, initial conditions and component
+#   list of a network that has been prepared before with the same options
+# profile: SimulationProfile recording the time of each phase of the preparation
+function prepare_simulation(net; recalculate_load_flow=true, load_flow_method=:ipopt, network_model=NodeModel, reduce_network=false, cache=nothing, profile=nothing)
+    if !isnothing(cache)
+        return prepare_cached_simulation(
+            net,
+            cache;
+            profile=profile,
+            recalculate_load_flow=recalculate_load_flow,
+            load_flow_method=load_flow_method,
+            network_model=network_model,
+            reduce_network=reduce_network,
+        )
+    end
+
+    # admittance matrix, used by the load flow and the network model
+    phase_start = time_ns()
+    add_admittance_matrix!(net)
+    record_phase!(profile, "admittance matrix", 0, NaN, phase_start)
+
+    # select the passive buses to eliminate, before the variables of the network are listed
+    if reduce_network
+        network_model == NetworkModel || error("Network reduction requires network_model = NetworkModel")
+        add_network_reduction!(net)
+    else
+        delete!(net, "eliminated_buses")
+    end
+
     # calculate initial conditions
-    (u0, du0) = calculate_system_ic!(net; recalculate_load_flow=true)
+    (u0, du0) = calculate_system_ic!(net; recalculate_load_flow=recalculate_load_flow, load_flow_method=load_flow_method, profile=profile)
 
     # Build power system model
+    phase_start = time_ns()
     power_system_model = PowerSystemModel(
-        build_component_list(net),
+        build_component_list(net; network_model=network_model),
         get_var_list(net),
         generate_differential_vars(net),
         Dict()
     )
+    record_phase!(profile, "model build", 0, NaN, phase_start)
 
     return PowerSystemSimulation(
         power_system_model,
@@ -20,7 +56,11 @@ function prepare_simulation(net; recalculate_load_flow=true)
     )
 end
 
-function build_component_list(net::Dict{String,Any})
+# network_model: NodeModel adds the equations of each node as a separate component, NetworkModel
+#   evaluates the equations of all nodes as a single sparse kernel
+# If net["eliminated_buses"] lists the buses eliminated by network reduction (see
+#   add_network_reduction!), the NetworkModel contains the reduced network of the retained buses
+function build_component_list(net::Dict{String,Any}; network_model=NodeModel)
     # Initialise vectors and collect relevant parameters
     component_list = ComponentModelData[]
     var_list = get_var_list(net)
@@ -28,8 +68,8 @@ function build_component_list(net::Dict{String,Any})
     num_gens = length(keys(net["gen"]))
     num_loads = length(keys(net["load"]))
 
-    # Add admittance matrix to net
-    net["Y"] = calc_admittance_matrix(net).matrix
+    # Add sparse admittance matrix to net (if not already added by prepare_simulation)
+    haskey(net, "Y") ? nothing : add_admittance_matrix!(net)
 
     # Build COI reference frequency equations (if selected)
     net["dynamic_model_parameters"]["ω_ref"] == "coi" ?
@@ -87,20 +127,33 @@ function build_component_list(net::Dict{String,Any})
     end
 
     # Build network equations
-    for bus_ind = 1:num_buses
-        node_model = make_dynamic_model(net, bus_ind, NodeModel)
-        (inds_out, inds_u) =
-            make_pointers_to_simulation_variables(net, bus_ind, var_list, NodeModel)
+    if network_model != NetworkModel && haskey(net, "eliminated_buses")
+        error("Network reduction requires network_model = NetworkModel")
+    elseif network_model == NetworkModel
+        network = make_dynamic_model(net, nothing, NetworkModel)
+        (inds_out, inds_du, inds_u) =
+            make_pointers_to_simulation_variables(net, nothing, var_list, NetworkModel)
+        # the network model is not associated with a single bus, so has source index 0
         push!(
             component_list,
-            ComponentModelData(
-                bus_ind,
-                node_model,
-                inds_out,
-                [],
-                inds_u
-            ),
+            ComponentModelData(0, network, inds_out, inds_du, inds_u),
         )
+    else
+        for bus_ind = 1:num_buses
+            node_model = make_dynamic_model(net, bus_ind, NodeModel)
+            (inds_out, inds_u) =
+                make_pointers_to_simulation_variables(net, bus_ind, var_list, NodeModel)
+            push!(
+                component_list,
+                ComponentModelData(
+                    bus_ind,
+                    node_model,
+                    inds_out,
+                    [],
+                    inds_u
+                ),
+            )
+        end
     end
 
     # Build load equations
@@ -125,7 +178,7 @@ function add_model_equation_data!(
     component_list,
     net::Dict{String,Any},
     index,
-    var_list::Vector{String},
+    var_list::AbstractVector{String},
     model_type,
 )
     model = make_dynamic_model(net, index, model_type)
@@ -137,6 +190,50 @@ function add_model_equation_data!(
     )
 end
 
+###########################################################################
+# Group component models by type
+###########################################################################
+"""
+    group_components(component_list, model_types=())
+
+Returns a tuple of `ComponentGroup`s, one for each concrete model type in `component_list` and in `model_types`.
+
+`model_types` are the types of models that may be swapped into the component list later, e.g. by a disturbance (see `introduced_model_types`). Their groups are empty until `regroup_components!` is called.
+"""
+function group_components(component_list, model_types=())
+    types = unique([[typeof(component_model.model) for component_model in component_list]; collect(model_types)])
+    groups = Tuple(ComponentGroup{model_type}() for model_type in types)
+    fill_component_groups!(groups, component_list)
+    return groups
+end
+
+"""
+    regroup_components!(power_system_model::PowerSystemModel)
+
+Updates the component groups of the power system model after its component list has been modified.
+
+The types of the groups are not changed, so the type of every model in the component list must already have a group.
+"""
+function regroup_components!(power_system_model::PowerSystemModel)
+    for group in power_system_model.component_groups
+        empty!(group.models)
+        empty!(group.component_data)
+    end
+    fill_component_groups!(power_system_model.component_groups, power_system_model.component_list)
+    return power_system_model
+end
+
+function fill_component_groups!(groups, component_list)
+    for component_model in component_list
+        group_ind = findfirst(group -> eltype(group.models) === typeof(component_model.model), groups)
+        if isnothing(group_ind)
+            error("PowerSystemModel has no component group for model type $(typeof(component_model.model))")
+        end
+        push!(groups[group_ind].models, component_model.model)
+        push!(groups[group_ind].component_data, component_model)
+    end
+end
+
 ###########################################################################
 # Make differential variables vector
 ###########################################################################
@@ -150,17 +247,17 @@ end
 
 function generate_differential_vars(net::Dict{String,Any})
     # get all state variables
-    state_variable_list = []
+    state_variable_list = Set{String}()
 
     for (g, gen) in net["gen"]
-        append!(state_variable_list, state_variables(gen["dynamic_model"]["model_type"], g))
+        union!(state_variable_list, state_variables(gen["dynamic_model"]["model_type"], g))
         for (c, controller) in gen["dynamic_model"]["controllers"]
-            append!(state_variable_list, state_variables(controller["model_type"], g))
+            union!(state_variable_list, state_variables(controller["model_type"], g))
         end
     end
     for (l, load) in net["load"]
-        append!(state_variable_list, state_variables(load["dynamic_model"]["model_type"], l))
+        union!(state_variable_list, state_variables(load["dynamic_model"]["model_type"], l))
     end
 
-    return [var ∈ state_variable_list ? true : false for var in get_var_list(net)]
+    return [var ∈ state_variable_list for var in get_var_list(net)]
 end
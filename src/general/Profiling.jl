@@ -0,0 +1,200 @@
+###########################################################################
+# Simulation profiles
+###########################################################################
+function SimulationProfile()
+    return SimulationProfile(
+        DataFrame(
+            :phase => String[],
+            :stage => Int64[],
+            :t => Float64[],
+            :time => Float64[],
+        ),
+        DataFrame(
+            :stage => Int64[],
+            :retcode => String[],
+            :residual_calls => Int64[],
+            :jacobian_evaluations => Int64[],
+            :linear_solves => Int64[],
+            :accepted_steps => Int64[],
+            :rejected_steps => Int64[],
+            :nonlinear_iterations => Int64[],
+            :nonlinear_convergence_failures => Int64[],
+        ),
+        String[],
+        Int64[],
+        Int64[],
+        Float64[],
+        Int64[],
+        Float64[],
+        Int64[],
+    )
+end
+
+# Records the time elapsed since start_time (from time_ns) for a phase, if profiling
+record_phase!(profile::Nothing, phase, stage, t, start_time) = nothing
+function record_phase!(profile::SimulationProfile, phase, stage, t, start_time)
+    push!(profile.phases, (phase, stage, t, (time_ns() - start_time) * 1e-9))
+    return nothing
+end
+
+# Records the statistics of the solver for a stage, if profiling
+record_solver_statistics!(profile::Nothing, stage, soln) = nothing
+function record_solver_statistics!(profile::SimulationProfile, stage, soln)
+    stats = hasproperty(soln, :stats) ? soln.stats : soln.destats
+    isnothing(stats) && return nothing
+    push!(profile.solver_statistics, (
+        stage,
+        string(soln.retcode),
+        stats.nf,
+        stats.njacs,
+        stats.nsolve,
+        stats.naccept,
+        stats.nreject,
+        stats.nnonliniter,
+        stats.nnonlinconvfail,
+    ))
+    return nothing
+end
+
+"""
+    profile_model!(profile::SimulationProfile, power_system_model::PowerSystemModel)
+
+Adds the model types of the component groups of a power system model to the component timings of a profile, and sets the model type of each group in `group_inds`.
+"""
+function profile_model!(profile::SimulationProfile, power_system_model::PowerSystemModel)
+    empty!(profile.group_inds)
+    for group in power_system_model.component_groups
+        i = model_type_index!(profile, string(eltype(group.models)))
+        profile.components[i] = max(profile.components[i], length(group.models))
+        push!(profile.group_inds, i)
+    end
+    return profile
+end
+
+# Index of a model type in the component timings of a profile, adding the model type if needed
+function model_type_index!(profile::SimulationProfile, model_type)
+    i = findfirst(isequal(model_type), profile.model_types)
+    isnothing(i) || return i
+    push!(profile.model_types, model_type)
+    push!(profile.components, 0)
+    push!(profile.residual_calls, 0)
+    push!(profile.residual_time, 0.0)
+    push!(profile.jacobian_calls, 0)
+    push!(profile.jacobian_time, 0.0)
+    return length(profile.model_types)
+end
+
+"""
+    merge_profile!(profile::SimulationProfile, other::SimulationProfile)
+
+Adds the phase timings, solver statistics and component timings recorded in `other` to `profile`, e.g. to combine the profiles of the scenarios of `run_scenarios`.
+"""
+function merge_profile!(profile::SimulationProfile, other::SimulationProfile)
+    append!(profile.phases, other.phases)
+    append!(profile.solver_statistics, other.solver_statistics)
+    for (j, model_type) in enumerate(other.model_types)
+        i = model_type_index!(profile, model_type)
+        profile.components[i] = max(profile.components[i], other.components[j])
+        profile.residual_calls[i] += other.residual_calls[j]
+        profile.residual_time[i] += other.residual_time[j]
+        profile.jacobian_calls[i] += other.jacobian_calls[j]
+        profile.jacobian_time[i] += other.jacobian_time[j]
+    end
+    return profile
+end
+
+###########################################################################
+# Profiled equations
+###########################################################################
+"""
+    profiled_equations!(out, du, u, p, t, profile::SimulationProfile)
+
+Evaluates the power system equations as `power_system_equations!`, recording the number of evaluations and the time of each component group in the profile.
+"""
+function profiled_equations!(out, du, u, p, t, profile::SimulationProfile)
+    profiled_update_groups!(out, du, u, p.component_groups, t, profile, 1)
+    return nothing
+end
+
+profiled_update_groups!(out, du, u, groups::Tuple{}, t, profile, g) = nothing
+function profiled_update_groups!(out, du, u, groups::Tuple, t, profile, g)
+    start_time = time_ns()
+    group = first(groups)
+    update_group!(out, du, u, group, t)
+
+    i = profile.group_inds[g]
+    profile.residual_time[i] += (time_ns() - start_time) * 1e-9
+    profile.residual_calls[i] += length(group.models)
+    profiled_update_groups!(out, du, u, Base.tail(groups), t, profile, g + 1)
+end
+
+"""
+    profiled_jacobian!(J, du, u, p, gamma, t, profile::SimulationProfile)
+
+Evaluates the Jacobian of the power system equations as `power_system_jacobian!`, recording the number of evaluations and the time of each component group in the profile.
+"""
+function profiled_jacobian!(J, du, u, p, gamma, t, profile::SimulationProfile)
+    zero_jacobian!(J)
+    profiled_jacobian_groups!(J, du, u, p.component_groups, gamma, t, profile, 1)
+    return nothing
+end
+
+profiled_jacobian_groups!(J, du, u, groups::Tuple{}, gamma, t, profile, g) = nothing
+function profiled_jacobian_groups!(J, du, u, groups::Tuple, gamma, t, profile, g)
+    start_time = time_ns()
+    group = first(groups)
+    jacobian_group!(J, du, u, group, gamma, t)
+
+    i = profile.group_inds[g]
+    profile.jacobian_time[i] += (time_ns() - start_time) * 1e-9
+    profile.jacobian_calls[i] += length(group.models)
+    profiled_jacobian_groups!(J, du, u, Base.tail(groups), gamma, t, profile, g + 1)
+end
+
+###########################################################################
+# Reports
+###########################################################################
+"""
+    component_timings(profile::SimulationProfile)
+
+Returns a DataFrame of the component timings of a profile, with one row for each component model type.
+"""
+function component_timings(profile::SimulationProfile)
+    return DataFrame(
+        :model_type => copy(profile.model_types),
+        :components => copy(profile.components),
+        :residual_calls => copy(profile.residual_calls),
+        :residual_time => copy(profile.residual_time),
+        :jacobian_calls => copy(profile.jacobian_calls),
+        :jacobian_time => copy(profile.jacobian_time),
+    )
+end
+
+"""
+    save_profile(fp, profile::SimulationProfile)
+
+Saves the phase timings, solver statistics and component timings of a profile.
+
+If `fp` ends with `.json`, the tables are saved to a single JSON file, as lists of rows keyed by `"phases"`, `"solver_statistics"` and `"component_timings"`. Otherwise `fp` is a folder, and each table is saved to a CSV file named by its key.
+"""
+function save_profile(fp, profile::SimulationProfile)
+    tables = OrderedDict(
+        "phases" => profile.phases,
+        "solver_statistics" => profile.solver_statistics,
+        "component_timings" => component_timings(profile),
+    )
+
+    if endswith(fp, ".json")
+        open(fp, "w") do io
+            JSON.print(io, OrderedDict(
+                name => [OrderedDict(String(k) => v for (k, v) in pairs(row)) for row in eachrow(table)]
+                for (name, table) in tables
+            ))
+        end
+    else
+        mkpath(fp)
+        for (name, table) in tables
+            CSV.write(joinpath(fp, "$name.csv"), table)
+        end
+    end
+end
@@ -2,98 +2,164 @@ using DataFrames
 ###########################################################################
 # Recalculate system state
 ###########################################################################
+"""
+    recalculate_system_state(power_system_model::PowerSystemModel, u0, t)
 
-function recalculate_system_state(component_list, u0, var_list, differential_vars)
-    #push!(time_tracker, ["State recalc started", time_ns()])
-    # Initialise u and du vectors
-    u = Vector{Any}(undef, length(var_list))
-    du = Vector{Any}(undef, length(var_list))
+Recalculates the state of the power system after a disturbance that restarts the simulation.
 
-    # Define state variables as constant at time of fault
-    u = [is_differential ? var : nothing for (is_differential, var) in zip(differential_vars, u0)]
+The state variables are held at their values in `u0`, and the algebraic variables are recalculated by Newton's method on the algebraic equations of the power system model, starting from their values in `u0` (i.e. before the disturbance). The derivatives of the state variables are then calculated by `calculate_state_derivatives!`.
 
-    # Recaclulate algebraic variables
-    recalculate_algebraic_variables!(u, component_list, var_list, differential_vars)
+The index maps and sparsity patterns used for the recalculation are stored in a `StateRecalculation`, which is reused by every stage. The timings of each recalculation are recorded in its `timings`.
 
-    #push!(time_tracker, ["Algebraic vars recalculated", time_ns()])
+Returns the recalculated variables and derivatives, and whether the Newton iterations converged `(u, du, converged)`. If they did not converge, a warning is logged and `u` holds the last iterate.
+"""
+function recalculate_system_state(power_system_model::PowerSystemModel, u0, t)
+    recalculation = state_recalculation(power_system_model)
+    start_time = time_ns()
 
-    # Set algebraic variable derivatives to zero (for conversion to float64)
-    du = [is_differential ? nothing : 0.0 for is_differential in differential_vars]
+    # State variables are constant at the time of the disturbance
+    u = Vector{Float64}(u0)
 
-    # Recalculate derivatives of state variables
-    for component_model in component_list
+    # Recalculate algebraic variables
+    (converged, iterations, max_residual) = recalculate_algebraic_variables!(u, power_system_model, recalculation, t)
+    converged || @warn "Recalculation of system state failed at t = $t (maximum residual $max_residual after $iterations iterations)"
+    algebraic_time = time_ns()
+
+    # Recalculate derivatives of state variables (derivatives of algebraic variables are zero)
+    du = zeros(length(u))
+    for component_model in power_system_model.component_list
         if length(differential_variables(typeof(component_model.model))) != 0
             calculate_state_derivatives!(du, u, component_model.model, component_model.inds_du, component_model.inds_u)
         end
     end
-    #push!(time_tracker, ["derivatives recalculated", time_ns()])
-
-    # Convert to Float64
-    u = convert.(Float64, u)
-    du = convert.(Float64, du)
 
-    return u, du
+    push!(recalculation.timings, (
+        t,
+        iterations,
+        max_residual,
+        converged,
+        (algebraic_time - start_time) * 1e-9,
+        (time_ns() - algebraic_time) * 1e-9,
+    ))
+    return u, du, converged
 end
 
-function recalculate_algebraic_variables!(u, component_list, var_list, differential_vars)
-    #push!(time_tracker, ["Algebraic var calc started", time_ns()])
-    # Define var lists for algebraic variables and state variables
-    state_var_list = [var_list[i] for i in 1:length(var_list) if differential_vars[i]]
-    algebraic_var_list = [var_list[i] for i in 1:length(var_list) if !differential_vars[i]]
+"""
+    state_recalculation(power_system_model::PowerSystemModel)
 
-    # Create maps from each variable to its index in the algebraic/state variable lists
-    global_var_to_algebraic_var_map = Dict()
-    for (i, var) in enumerate(var_list)
-        global_var_to_algebraic_var_map[i] = var in algebraic_var_list ? findfirst(x -> x == var, algebraic_var_list) : nothing
+Returns the `StateRecalculation` of the power system model, building it on first use.
+"""
+function state_recalculation(power_system_model::PowerSystemModel)
+    return get!(power_system_model.auxiliary_data, "state_recalculation") do
+        StateRecalculation(power_system_model)
     end
-    global_var_to_state_var_map = Dict()
-    for (i, var) in enumerate(var_list)
-        global_var_to_state_var_map[i] = var in state_var_list ? findfirst(x -> x == var, state_var_list) : nothing
+end
+
+function StateRecalculation(power_system_model::PowerSystemModel; ftol=1e-8, max_iterations=50)
+    differential_vars = power_system_model.differential_vars
+    n = length(differential_vars)
+    state_inds = findall(differential_vars)
+    algebraic_inds = findall(.!differential_vars)
+
+    # Position of each variable in the algebraic variables (0 for state variables)
+    algebraic_position = zeros(Int64, n)
+    algebraic_position[algebraic_inds] = 1:length(algebraic_inds)
+
+    # Sparsity pattern of the algebraic block of the Jacobian
+    jacobian = jacobian_sparsity(power_system_model)
+    (rows, cols) = (Int64[], Int64[])
+    for col in algebraic_inds, k in nzrange(jacobian, col)
+        row = rowvals(jacobian)[k]
+        if algebraic_position[row] != 0
+            push!(rows, algebraic_position[row])
+            push!(cols, algebraic_position[col])
+        end
     end
-    #push!(time_tracker, ["Maps created", time_ns()])
-
-    # Initial guess for the variables
-    states = u[find_variable_indexes(var_list, state_var_list)]
-
-    initial_guess = make_initial_guess(algebraic_var_list)
-    #push!(time_tracker, ["Initial guess made", time_ns()])
-
-    # Define algebraic equations
-    function system_algebraic_model!(F, vars)
-        for component_model in component_list
-            if length(variables(typeof(component_model.model))) != length(differential_variables(typeof(component_model.model)))
-                # Get indexes of variables in the algebraic and state variable lists
-                inds_F = map(x -> global_var_to_algebraic_var_map[x], component_model.inds_out)
-                inds_vars = map(x -> global_var_to_algebraic_var_map[x], component_model.inds_u)
-                inds_states = map(x -> global_var_to_state_var_map[x], component_model.inds_u)
-                filter!.(!isnothing, [inds_F, inds_vars, inds_states])
-
-                # Algebraic equations for each component model
-                algebraic_equations!(@view(F[inds_F]), vars[inds_vars], states[inds_states], component_model.model)
-            end
+    algebraic_jacobian = sparse(rows, cols, ones(length(rows)), length(algebraic_inds), length(algebraic_inds))
+    fill!(nonzeros(algebraic_jacobian), 0.0)
+
+    # Map the stored entries of the Jacobian to the stored entries of the algebraic block
+    algebraic_entries = zeros(Int64, nnz(jacobian))
+    for col in algebraic_inds, k in nzrange(jacobian, col)
+        (i, j) = (algebraic_position[rowvals(jacobian)[k]], algebraic_position[col])
+        if i != 0
+            r = nzrange(algebraic_jacobian, j)
+            algebraic_entries[k] = r[searchsortedfirst(view(rowvals(algebraic_jacobian), r), i)]
         end
     end
-    #push!(time_tracker, ["Function defined", time_ns()])
-    # Solve the system
-    solution = nlsolve(system_algebraic_model!, initial_guess)
-    #push!(time_tracker, ["Algebraic model solved", time_ns()])
 
-    if solution.f_converged
-        u[find_variable_indexes(var_list, algebraic_var_list)] = solution.zero
-    else
-        println("Recalculation of system state failed")
+    return StateRecalculation(
+        state_inds,
+        algebraic_inds,
+        jacobian,
+        algebraic_jacobian,
+        algebraic_entries,
+        nothing,
+        zeros(n),
+        zeros(n),
+        zeros(length(algebraic_inds)),
+        ftol,
+        max_iterations,
+        DataFrame(
+            :t => Float64[],
+            :iterations => Int64[],
+            :max_residual => Float64[],
+            :converged => Bool[],
+            :algebraic_time => Float64[],
+            :derivative_time => Float64[],
+        ),
+    )
+end
+
+# Newton's method on the algebraic equations, with the state variables held constant
+#   The algebraic equations are the rows of the power system equations of the algebraic
+#   variables, which do not depend on the derivatives.
+function recalculate_algebraic_variables!(u, power_system_model, recalculation::StateRecalculation, t)
+    (algebraic_inds, out, du, Δ) = (recalculation.algebraic_inds, recalculation.out, recalculation.du, recalculation.Δ)
+    max_residual = Inf
+
+    for iteration in 0:recalculation.max_iterations
+        # Residuals of the algebraic equations
+        power_system_equations!(out, du, u, power_system_model, t)
+        max_residual = 0.0
+        for (k, i) in enumerate(algebraic_inds)
+            Δ[k] = out[i]
+            max_residual = max(max_residual, abs(out[i]))
+        end
+        if max_residual < recalculation.ftol
+            return true, iteration, max_residual
+        elseif iteration == recalculation.max_iterations
+            break
+        end
+
+        # Newton step with the sparse Jacobian of the algebraic equations
+        factorise_algebraic_jacobian!(recalculation, du, u, power_system_model, t)
+        ldiv!(recalculation.factorisation, Δ)
+        for (k, i) in enumerate(algebraic_inds)
+            u[i] -= Δ[k]
+        end
     end
+    return false, recalculation.max_iterations, max_residual
 end
 
-function make_initial_guess(algebraic_var_list)
-    # Initalise initial guess vector
-    initial_guess = zeros(length(algebraic_var_list))
+function factorise_algebraic_jacobian!(recalculation::StateRecalculation, du, u, power_system_model, t)
+    (jacobian, algebraic_jacobian, algebraic_entries) = (recalculation.jacobian, recalculation.algebraic_jacobian, recalculation.algebraic_entries)
+
+    # dF/du (gamma = 0, as the algebraic equations do not depend on the derivatives)
+    power_system_jacobian!(jacobian, du, u, power_system_model, 0.0, t)
 
-    # Set initial guess for voltage variables to be one
-    for (i, var) in enumerate(algebraic_var_list)
-        if split(var, "_")[1] == "V"
-            initial_guess[i] = 1.0
+    # Copy the algebraic block
+    fill!(nonzeros(algebraic_jacobian), 0.0)
+    for k in eachindex(algebraic_entries)
+        if algebraic_entries[k] != 0
+            nonzeros(algebraic_jacobian)[algebraic_entries[k]] = nonzeros(jacobian)[k]
         end
     end
-    return initial_guess
-end
\ No newline at end of file
+
+    # The sparsity pattern is constant, so the symbolic factorisation is reused
+    if recalculation.factorisation === nothing
+        recalculation.factorisation = lu(algebraic_jacobian)
+    else
+        lu!(recalculation.factorisation, algebraic_jacobian)
+    end
+end
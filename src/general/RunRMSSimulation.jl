@@ -2,29 +2,132 @@
 # Functions for executing RMS simulation
 ###########################################################################
 function power_system_equations!(out, du, u, p, t)
-    # Extract equations
-    component_list = p.component_list
+    # Evaluate equations, one concretely typed group of component models at a time
+    update_groups!(out, du, u, p.component_groups, t)
+    return nothing
+end
+
+# Recursion over the tuple of component groups, so that each group is compiled for its model type
+update_groups!(out, du, u, groups::Tuple{}, t) = nothing
+@inline function update_groups!(out, du, u, groups::Tuple, t)
+    update_group!(out, du, u, first(groups), t)
+    update_groups!(out, du, u, Base.tail(groups), t)
+end
 
-    for component_model in component_list
-        update!(@view(out[component_model.inds_out]), du[component_model.inds_du], u[component_model.inds_u], component_model.model, t)
+function update_group!(out, du, u, group::ComponentGroup, t)
+    (models, component_data) = (group.models, group.component_data)
+    for k in eachindex(models)
+        update_component!(out, du, u, component_data[k], models[k], t)
     end
+    return nothing
+end
+
+# Evaluates the equations of a single component model
+#   Variables are gathered into the preallocated buffers of the component model and the
+#   outputs scattered back, so that no vectors are allocated per residual call
+function update_component!(out::AbstractVector{Float64}, du::AbstractVector{Float64}, u::AbstractVector{Float64}, component_model::ComponentModelData, model::ComponentModel, t)
+    # Gather variables
+    (inds_du, inds_u, du_buf, u_buf) = (component_model.inds_du, component_model.inds_u, component_model.du_buf, component_model.u_buf)
+    for j in eachindex(inds_du)
+        du_buf[j] = du[inds_du[j]]
+    end
+    for j in eachindex(inds_u)
+        u_buf[j] = u[inds_u[j]]
+    end
+
+    # Evaluate component equations
+    out_buf = component_model.out_buf
+    update!(out_buf, du_buf, u_buf, model, t)
+
+    # Scatter outputs
+    inds_out = component_model.inds_out
+    for j in eachindex(inds_out)
+        out[inds_out[j]] = out_buf[j]
+    end
+    return nothing
+end
+
+# Fallback for non Float64 inputs (e.g. dual numbers used for automatic differentiation)
+function update_component!(out, du, u, component_model::ComponentModelData, model::ComponentModel, t)
+    update!(@view(out[component_model.inds_out]), du[component_model.inds_du], u[component_model.inds_u], model, t)
+    return nothing
 end
 
 # kwargs are passed only to the solver
-function run_RMS_simulation(power_system_simulation, tspan::Tuple{Float64,Float64}; kwargs...)
+# outputs: OutputSpecification or ResultsStreamWriter (or a vector of them) recording outputs
+#   during the simulation. If given, the solution is saved only at the end of each stage (unless
+#   overridden by kwargs), and the outputs are closed when the simulation finishes
+# reset_model: undo the disturbances applied during the simulation when it finishes, so that the
+#   power system simulation can be run again
+# event_handling: :stages restarts the simulation in a new stage at each disturbance with
+#   restart_simulation = true, :integrator applies all disturbances within a single integrator
+#   (see run_RMS_events)
+# residual: :components evaluates the equations of each component model, :compiled evaluates the
+#   generated residual and Jacobian functions of the whole model (see compile_residual!)
+# residual_cache: SimulationCache for the generated residual functions
+# profile: SimulationProfile recording the phase timings, solver statistics and component timings
+#   of the simulation
+# verbose: print the status and time of the simulation when it finishes
+function run_RMS_simulation(
+    power_system_simulation,
+    tspan::Tuple{Float64,Float64};
+    outputs=nothing,
+    reset_model=true,
+    event_handling=:stages,
+    residual=:components,
+    residual_cache=nothing,
+    profile=nothing,
+    verbose=true,
+    kwargs...
+)
+    # group component models by type, including the models swapped in by disturbances
+    power_system_model = group_disturbance_models!(power_system_simulation)
+
+    # generate the residual functions for the undisturbed model
+    if residual == :compiled
+        phase_start = time_ns()
+        compile_residual!(power_system_model; cache=residual_cache)
+        record_phase!(profile, "residual compilation", 0, tspan[1], phase_start)
+    elseif residual != :components
+        error("Unknown residual option $residual, expected :components or :compiled")
+    end
+
+    # record selected outputs instead of saving the full solution
+    output_list = isnothing(outputs) ? [] : outputs isa AbstractVector ? outputs : [outputs]
+    output_callbacks = [create_output_callback(outputs) for outputs in output_list]
+    if !isempty(output_list)
+        kwargs = (save_everystep=false, save_start=false, kwargs...)
+    end
 
+    try
+        # the generated residual functions are defined at run time, so the simulation is run in the
+        # latest world
+        if event_handling == :stages
+            return Base.invokelatest(run_RMS_stages, power_system_simulation, tspan, output_callbacks; profile=profile, verbose=verbose, kwargs...)
+        elseif event_handling == :integrator
+            return Base.invokelatest(run_RMS_events, power_system_simulation, tspan, output_callbacks; profile=profile, verbose=verbose, kwargs...)
+        else
+            error("Unknown event_handling option $event_handling, expected :stages or :integrator")
+        end
+    finally
+        foreach(close_outputs!, output_list)
+        reset_model ? reset_model!(power_system_model) : nothing
+        delete!(power_system_model.auxiliary_data, "compiled_residual")
+    end
+end
+
+function run_RMS_stages(power_system_simulation, tspan::Tuple{Float64,Float64}, output_callbacks; profile=nothing, verbose=true, kwargs...)
 
     # configure stages
-    #push!(time_tracker, ["Simulation Start", time_ns()])
+    phase_start = time_ns()
     stages = configure_stages(power_system_simulation, tspan)
-    #push!(time_tracker, ["Stages Configures", time_ns()])
+    record_phase!(profile, "stage configuration", 0, tspan[1], phase_start)
 
     # run first stage 
     start_time = time_ns()
-    #push!(time_tracker, ["Stages Configures", time_ns()])
     first_stage = stages[1]
     prob = DAEProblem(
-        power_system_equations!,
+        make_dae_function(power_system_simulation.power_system_model, power_system_simulation.solver; profile=profile),
         power_system_simulation.du0,
         power_system_simulation.u0,
         (tspan[1], first_stage.t_end),
@@ -32,46 +135,46 @@ function run_RMS_simulation(power_system_simulation, tspan::Tuple{Float64,Float6
         differential_vars=power_system_simulation.power_system_model.differential_vars,
         tstops=first_stage.tstops,
     )
-    #push!(time_tracker, ["Stage 1 problem defined", time_ns()])
     soln = solve(
         prob,
         power_system_simulation.solver;
-        callback=CallbackSet(first_stage.callbacks...),
+        callback=CallbackSet(first_stage.callbacks..., output_callbacks...),
         kwargs...
     )
-    #push!(time_tracker, ["Stage 1 executed", time_ns()])
-    # pr("stage 1 complete: $((time_ns() - start_time)*1e-9) s\n")
+    record_phase!(profile, "solve", 1, tspan[1], start_time)
+    record_solver_statistics!(profile, 1, soln)
     if soln.retcode != ReturnCode.Success
-        println("Simulation failed at stage 1")
-        print_solution_info(soln, start_time)
+        verbose ? println("Simulation failed at stage 1") : nothing
+        verbose ? print_solution_info(soln, start_time) : nothing
         return soln
     end
 
     # check for additional stages
     if length(stages) == 1
-        println("Simulation completed successfully")
-        print_solution_info(soln, start_time)
+        verbose ? println("Simulation completed successfully") : nothing
+        verbose ? print_solution_info(soln, start_time) : nothing
         return soln
     else
+        # build the state recalculation data before the model is perturbed, so that its
+        # Jacobian pattern covers the original component models
+        state_recalculation(power_system_simulation.power_system_model)
+
         solns = DAESolution[soln]
         for stage in stages[2:end]
             # Apply disturbance to power system model
-            perturb_model!(power_system_simulation.power_system_model, stage.initial_disturbance)
-            # pr("state recalc started: $((time_ns() - start_time)*1e-9) s\n")
-            #push!(time_tracker, ["model perturbed", time_ns()])
-
+            phase_start = time_ns()
+            apply_disturbance!(power_system_simulation.power_system_model, stage.initial_disturbance)
             (u, du) = recalculate_system_state(
-                power_system_simulation.power_system_model.component_list,
+                power_system_simulation.power_system_model,
                 solns[end].u[end],
-                power_system_simulation.power_system_model.variables,
-                power_system_simulation.power_system_model.differential_vars
+                stage.t_start,
             )
-            # pr("state recalc complete: $((time_ns() - start_time)*1e-9) s\n")
-            #push!(time_tracker, ["state recalc complete", time_ns()])
+            record_phase!(profile, "state recalculation", stage.stage_index, stage.t_start, phase_start)
 
             # Run stage
+            phase_start = time_ns()
             prob = DAEProblem(
-                power_system_equations!,
+                make_dae_function(power_system_simulation.power_system_model, power_system_simulation.solver; profile=profile),
                 du,
                 u,
                 (stage.t_start, stage.t_end),
@@ -79,32 +182,53 @@ function run_RMS_simulation(power_system_simulation, tspan::Tuple{Float64,Float6
                 differential_vars=power_system_simulation.power_system_model.differential_vars,
                 tstops=stage.tstops,
             )
-            #push!(time_tracker, ["stage $(stage.stage_index) problem defined", time_ns()])
-
             soln = solve(
                 prob,
                 power_system_simulation.solver;
-                callback=CallbackSet(stage.callbacks...),
+                callback=CallbackSet(stage.callbacks..., output_callbacks...),
                 kwargs...
             )
-            # pr("stage $(stage.stage_index) complete: $((time_ns() - start_time)*1e-9) s\n")
-            #push!(time_tracker, ["stage $(stage.stage_index) complete", time_ns()])
+            record_phase!(profile, "solve", stage.stage_index, stage.t_start, phase_start)
+            record_solver_statistics!(profile, stage.stage_index, soln)
 
             push!(solns, soln)
 
             if soln.retcode != ReturnCode.Success
-                println("Simulation failed at stage ", stage.stage_index)
-                print_solution_info(soln, start_time)
+                verbose ? println("Simulation failed at stage ", stage.stage_index) : nothing
+                verbose ? print_solution_info(soln, start_time) : nothing
                 return solns
             end
         end
 
-        println("Simulation completed successfully")
-        print_solution_info(soln, start_time)
+        verbose ? println("Simulation completed successfully") : nothing
+        verbose ? print_solution_info(soln, start_time) : nothing
         return solns
     end
 end
 
+# Ensures that the power system model has a component group for each model type that the
+# disturbances can swap into the component list, returning the (possibly replaced) power system model
+function group_disturbance_models!(power_system_simulation)
+    power_system_model = power_system_simulation.power_system_model
+    model_types = unique(Type[model_type for disturbance in power_system_simulation.disturbances for model_type in introduced_model_types(disturbance)])
+    group_types = [eltype(group.models) for group in power_system_model.component_groups]
+
+    if all(model_type -> model_type in group_types, model_types)
+        regroup_components!(power_system_model)
+        return power_system_model
+    else
+        power_system_simulation.power_system_model = PowerSystemModel(
+            power_system_model.component_list,
+            power_system_model.variables,
+            power_system_model.differential_vars,
+            power_system_model.auxiliary_data,
+            group_components(power_system_model.component_list, model_types),
+            power_system_model.applied_disturbances,
+        )
+        return power_system_simulation.power_system_model
+    end
+end
+
 function print_solution_info(soln, start_time)
     println("retcode: ", soln.retcode)
     println("Time elapsed = ", (time_ns() - start_time) / 1e9, " seconds")
@@ -158,6 +282,52 @@ Modify the power system model in accordance with the specified disturbance.
 """
 function perturb_model!() end # This function method is defined only for documentation purposes and should not be called
 
+"""
+    undo_perturbation!(power_system_model::PowerSystemModel, disturbance::Disturbance)
+
+Undo the modification of the power system model made by `perturb_model!` for the specified disturbance.
+
+Disturbances modify only parameter switches of the component models (e.g. the fault flags of a `NetworkModel`, or the `ΔPd` of a `ZIPLoad`), or replace single entries of the component list, so undoing a disturbance does not depend on the size of the model.
+"""
+function undo_perturbation!() end # This function method is defined only for documentation purposes and should not be called
+
+"""
+    apply_disturbance!(power_system_model::PowerSystemModel, disturbance::Disturbance)
+
+Apply a disturbance to the power system model with `perturb_model!`, and record it so that it can be undone by `reset_model!`.
+"""
+function apply_disturbance!(power_system_model::PowerSystemModel, disturbance::Disturbance)
+    perturb_model!(power_system_model, disturbance)
+    push!(power_system_model.applied_disturbances, disturbance)
+    regroup_components!(power_system_model)
+    update_compiled_residual!(power_system_model)
+end
+
+"""
+    reset_model!(power_system_model::PowerSystemModel)
+
+Undo the disturbances applied to the power system model by `apply_disturbance!`, in reverse order, returning the model to its prepared state.
+
+Called by `run_RMS_simulation` when the simulation finishes, so that a `PowerSystemSimulation` can be run repeatedly without copying it.
+"""
+function reset_model!(power_system_model::PowerSystemModel)
+    applied_disturbances = power_system_model.applied_disturbances
+    while !isempty(applied_disturbances)
+        undo_perturbation!(power_system_model, pop!(applied_disturbances))
+    end
+    regroup_components!(power_system_model)
+    update_compiled_residual!(power_system_model)
+end
+
+"""
+    introduced_model_types(disturbance::Disturbance)
+
+Return the component model types that `perturb_model!` can add to the component list when applying the disturbance.
+
+The component models are grouped by type before the simulation starts, so a disturbance that replaces a component model with a model of a new type must define this method.
+"""
+introduced_model_types(disturbance::Disturbance) = ()
+
 """
     create_callback(disturbance::Disturbance)
 
@@ -178,7 +348,7 @@ function create_callback(disturbance::Disturbance)
     # Event action function
     function affect!(integrator)
         # Modify load equations
-        perturb_model!(integrator.p, disturbance)
+        apply_disturbance!(integrator.p, disturbance)
 
         # Set event flag as triggered
         fault_triggered = true
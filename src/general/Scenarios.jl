@@ -0,0 +1,143 @@
+###########################################################################
+# Copy prepared models for independent simulations
+###########################################################################
+"""
+    scenario_copy(power_system_simulation::PowerSystemSimulation)
+
+Returns a copy of a prepared power system simulation that can be perturbed and simulated independently of the original, without repeating the load flow, initial condition calculation and model building.
+
+Only the data modified during a simulation is copied: the component list and its buffers, the component groups, the auxiliary data, and the component models that disturbances can modify (see `copy_component_model`). The variable registry, index vectors and immutable component models are shared with the original. The copy has no disturbances.
+"""
+function scenario_copy(power_system_simulation::PowerSystemSimulation)
+    power_system_model = power_system_simulation.power_system_model
+
+    # New component model data (with new buffers) for each component
+    component_list = ComponentModelData[
+        ComponentModelData(
+            component_model.source_ind,
+            copy_component_model(component_model.model),
+            component_model.inds_out,
+            component_model.inds_du,
+            component_model.inds_u,
+        )
+        for component_model in power_system_model.component_list
+    ]
+    model_types = [eltype(group.models) for group in power_system_model.component_groups]
+
+    return PowerSystemSimulation(
+        PowerSystemModel(
+            component_list,
+            power_system_model.variables,
+            power_system_model.differential_vars,
+            Dict(),
+            group_components(component_list, model_types),
+        ),
+        copy(power_system_simulation.u0),
+        copy(power_system_simulation.du0);
+        solver=power_system_simulation.solver,
+        auxiliary_data=power_system_simulation.auxiliary_data,
+    )
+end
+
+"""
+    copy_component_model(model::ComponentModel)
+
+Returns a copy of a component model for `scenario_copy`. Mutable models (e.g. `ZIPLoad`, which is modified by `LoadStep`) are copied, and immutable models are shared.
+"""
+copy_component_model(model::ComponentModel) = ismutable(model) ? deepcopy(model) : model
+
+# The faulted flags are modified by BusFault and ClearBusFault, the admittance data is shared
+#   unless faults at eliminated buses modify the admittances of a reduced network
+copy_component_model(model::NetworkModel) = NetworkModel(
+    model.n_buses,
+    model.row_ptr,
+    model.connected_bus,
+    isnothing(model.reduction) ? model.Y_mag : copy(model.Y_mag),
+    isnothing(model.reduction) ? model.α : copy(model.α),
+    model.injection_bus,
+    model.injection_sign,
+    copy(model.faulted),
+    isnothing(model.reduction) ? nothing : copy(model.reduction),
+)
+
+###########################################################################
+# Run scenarios
+###########################################################################
+"""
+    run_scenarios(power_system_simulation::PowerSystemSimulation, scenarios, tspan; parallel=:threads, summary=scenario_summary, profile=nothing, kwargs...)
+
+Simulates each scenario of a sweep (e.g. a contingency study) on a `scenario_copy` of a prepared power system simulation, and returns a DataFrame with one row for each scenario.
+
+# Arguments
+- `power_system_simulation`: The prepared power system simulation, which is not modified.
+- `scenarios`: Pairs of the name and disturbances of each scenario (e.g. `"fault bus 16" => [BusFault(16, 1.0), ClearBusFault(16, 1.1)]`), or a vector of the disturbances of each scenario (named by their index).
+- `tspan`: Time span of each simulation.
+- `parallel`: `:threads` to run the scenarios on the available Julia threads, or `:serial`.
+- `summary`: Function `summary(soln, power_system_model)` returning a `NamedTuple` of the results of a scenario, see `scenario_summary`.
+- `profile`: A `SimulationProfile`. Each scenario is profiled separately, and the profiles of all scenarios are added to `profile` when the sweep finishes (see `merge_profile!`).
+- `kwargs`: Passed to `run_RMS_simulation`.
+
+# Note
+- Outputs (`OutputSpecification`, `ResultsStreamWriter`) record a single simulation, and should not be passed to `run_scenarios`.
+- The status of each simulation is not printed, the return code of each scenario is in its summary.
+"""
+function run_scenarios(power_system_simulation::PowerSystemSimulation, scenarios, tspan; parallel=:threads, summary=scenario_summary, profile=nothing, kwargs...)
+    scenario_list = eltype(scenarios) <: Pair ? collect(scenarios) : ["$i" => disturbances for (i, disturbances) in enumerate(scenarios)]
+    rows = Vector{Any}(undef, length(scenario_list))
+    profiles = [isnothing(profile) ? nothing : SimulationProfile() for scenario in scenario_list]
+
+    function run_scenario(i)
+        (name, disturbances) = scenario_list[i]
+        scenario_simulation = scenario_copy(power_system_simulation)
+        scenario_simulation.disturbances = disturbances
+        start_time = time_ns()
+        soln = run_RMS_simulation(scenario_simulation, tspan; kwargs..., profile=profiles[i], verbose=false)
+        simulation_time = (time_ns() - start_time) * 1e-9
+        rows[i] = (
+            scenario=String(name),
+            simulation_time=simulation_time,
+            summary(soln, scenario_simulation.power_system_model)...,
+        )
+    end
+
+    if parallel == :threads
+        Threads.@threads for i in eachindex(scenario_list)
+            run_scenario(i)
+        end
+    elseif parallel == :serial
+        foreach(run_scenario, eachindex(scenario_list))
+    else
+        error("Unknown parallel option $parallel, expected :threads or :serial")
+    end
+    isnothing(profile) ? nothing : foreach(scenario_profile -> merge_profile!(profile, scenario_profile), profiles)
+
+    return DataFrame([row for row in rows])
+end
+
+"""
+    scenario_summary(soln, power_system_model::PowerSystemModel)
+
+The default summary of a scenario for `run_scenarios`.
+
+Returns the return code and final time of the last simulation stage, the minimum bus voltage, and the maximum difference between generator rotor angles over the saved time steps.
+"""
+function scenario_summary(soln, power_system_model::PowerSystemModel)
+    soln_vector = soln isa DAESolution ? [soln] : soln
+    V_inds = find_all_variable_indexes(power_system_model.variables, "V")
+    δ_inds = find_all_variable_indexes(power_system_model.variables, "δ")
+
+    (V_min, δ_spread_max) = (Inf, 0.0)
+    for soln_instance in soln_vector, u in soln_instance.u
+        V_min = min(V_min, minimum(view(u, V_inds)))
+        if !isempty(δ_inds)
+            δ_spread_max = max(δ_spread_max, maximum(view(u, δ_inds)) - minimum(view(u, δ_inds)))
+        end
+    end
+
+    return (
+        retcode=string(soln_vector[end].retcode),
+        t_final=soln_vector[end].t[end],
+        V_min=V_min,
+        δ_spread_max=δ_spread_max,
+    )
+end
@@ -0,0 +1,206 @@
+###########################################################################
+# Cache of prepared simulations
+###########################################################################
+# Version of the cache entries, to be incremented when the prepared data changes
+const SIMULATION_CACHE_VERSION = 4
+
+# Keys of the network data that do not affect the prepared simulation (simulation results, the
+# admittance matrix added by build_component_list, and the buses eliminated by the network
+# reduction option)
+const UNHASHED_NETWORK_KEYS = ("sol", "t_vec", "Y", "eliminated_buses")
+
+"""
+    simulation_cache_key(net; recalculate_load_flow=true, load_flow_method=:ipopt, network_model=NodeModel, reduce_network=false)
+
+Returns the key of the `SimulationCache` entry of a network, the SHA-256 hash of the network data, the options of `prepare_simulation`, and the versions of the cache and Julia.
+
+The network data is hashed in a form that does not depend on the order of its dictionary keys, with model types hashed by name. Simulation results and the admittance matrix are excluded. Any change to the network data (e.g. a parameter or a model type) therefore gives a new key, and the entry of the previous data is no longer used.
+
+When an entry is created, the key of the prepared network data (with its load flow solution and initial conditions) is stored as an alias of the entry, so that preparing the same network data again finds the entry.
+"""
+function simulation_cache_key(net; recalculate_load_flow=true, load_flow_method=:ipopt, network_model=NodeModel, reduce_network=false)
+    io = IOBuffer()
+    print(io, "cache version ", SIMULATION_CACHE_VERSION, ", julia ", VERSION)
+    print(io, ", recalculate_load_flow ", recalculate_load_flow, ", load_flow_method ", load_flow_method)
+    print(io, ", network_model ", network_model, ", reduce_network ", reduce_network, ", ")
+    write_canonical(io, net)
+    return bytes2hex(sha256(take!(io)))
+end
+
+# Writes data in a form that does not depend on the order of dictionary keys
+function write_canonical(io, data::AbstractDict)
+    print(io, "{")
+    for key in sort!(collect(keys(data)); by=string)
+        string(key) in UNHASHED_NETWORK_KEYS && continue
+        write_canonical(io, key)
+        print(io, "=>")
+        write_canonical(io, data[key])
+        print(io, ",")
+    end
+    print(io, "}")
+end
+function write_canonical(io, data::AbstractArray)
+    print(io, "Array", size(data), "[")
+    for x in data
+        write_canonical(io, x)
+        print(io, ",")
+    end
+    print(io, "]")
+end
+write_canonical(io, data) = show(io, data)
+
+# Component models by type and field values, including the coefficients of callable parameters
+#   (e.g. the QuadraticSaturation of IEEET1)
+function write_canonical(io, data::Union{ComponentModel,Function})
+    print(io, typeof(data), "(")
+    for field in fieldnames(typeof(data))
+        write_canonical(io, getfield(data, field))
+        print(io, ",")
+    end
+    print(io, ")")
+end
+# The reduced admittances are fields of the network model, so only the faults of the reduction are written
+function write_canonical(io, data::KronReduction)
+    print(io, "KronReduction(")
+    write_canonical(io, data.faulted)
+    print(io, ")")
+end
+function write_canonical(io, data::ComponentModelData)
+    write_canonical(io, data.model)
+    write_canonical(io, [data.inds_out, data.inds_du, data.inds_u])
+end
+
+###########################################################################
+# Cache entries
+###########################################################################
+# Prepares a simulation from its cache entry, or prepares it and adds the entry
+function prepare_cached_simulation(net, cache::SimulationCache; profile=nothing, options...)
+    phase_start = time_ns()
+    key = simulation_cache_key(net; options...)
+    entry = load_cache_entry(cache, key)
+    record_phase!(profile, "cache lookup", 0, NaN, phase_start)
+
+    if isnothing(entry)
+        power_system_simulation = prepare_simulation(net; profile=profile, options...)
+        power_system_model = power_system_simulation.power_system_model
+        save_cache_entry!(cache, key, (
+            net=Dict{String,Any}(k => v for (k, v) in net if !(k in ("sol", "t_vec"))),
+            u0=power_system_simulation.u0,
+            du0=power_system_simulation.du0,
+            component_list=power_system_model.component_list,
+            variables=power_system_model.variables,
+            differential_vars=power_system_model.differential_vars,
+        ))
+
+        # prepare_simulation adds the load flow solution and initial conditions to net, so the
+        #   prepared network data has a different key. It refers to the same entry, so that
+        #   preparing the same network data again is a cache hit.
+        prepared_key = simulation_cache_key(net; options...)
+        prepared_key == key ? nothing : save_cache_entry!(cache, prepared_key, (alias=key,))
+        return power_system_simulation
+    end
+
+    # Restore the load flow solution and the parameters set by the initial condition calculation
+    delete!(net, "eliminated_buses")
+    merge!(net, entry.net)
+
+    return PowerSystemSimulation(
+        PowerSystemModel(
+            entry.component_list,
+            entry.variables,
+            entry.differential_vars,
+            Dict()
+        ),
+        entry.u0,
+        entry.du0
+    )
+end
+
+cache_entry_path(cache::SimulationCache, key) = joinpath(cache.folder_path, "$key.jls")
+
+cache_entry_paths(cache::SimulationCache) =
+    isdir(cache.folder_path) ? filter(endswith(".jls"), readdir(cache.folder_path; join=true)) : String[]
+
+function load_cache_entry(cache::SimulationCache, key)
+    path = cache_entry_path(cache, key)
+    if !isfile(path)
+        return nothing
+    end
+
+    entry = try
+        deserialize(path)
+    catch
+        # e.g. an entry written by a different version of RMSPowerSims
+        @debug "Removing unreadable cache entry $path"
+        rm(path; force=true)
+        return nothing
+    end
+
+    # Mark the entry as recently used
+    touch(path)
+
+    # The key of prepared network data refers to the entry of the network data before preparation
+    if entry isa NamedTuple && haskey(entry, :alias)
+        return load_cache_entry(cache, entry.alias)
+    end
+    return entry
+end
+
+function save_cache_entry!(cache::SimulationCache, key, entry)
+    mkpath(cache.folder_path)
+
+    # Write to a temporary file first, so that an interrupted write does not leave a partial entry
+    temp_path = tempname(cache.folder_path; cleanup=false)
+    serialize(temp_path, entry)
+    mv(temp_path, cache_entry_path(cache, key); force=true)
+
+    evict_cache!(cache)
+end
+
+"""
+    evict_cache!(cache::SimulationCache)
+
+Removes the least recently used entries of the cache until it has at most `max_entries` entries with a total size of at most `max_size`. Entries are used when they are written or loaded by `prepare_simulation`.
+"""
+function evict_cache!(cache::SimulationCache)
+    # Most recently used entries first
+    paths = sort!(cache_entry_paths(cache); by=mtime, rev=true)
+
+    total_size = 0
+    for (i, path) in enumerate(paths)
+        total_size += filesize(path)
+        if i > cache.max_entries || total_size > cache.max_size
+            rm(path; force=true)
+        end
+    end
+    return cache
+end
+
+"""
+    invalidate_cache!(cache::SimulationCache, net; recalculate_load_flow=true, load_flow_method=:ipopt, network_model=NodeModel, reduce_network=false)
+
+Removes the cache entry of a network, so that the next `prepare_simulation` of the network recalculates the load flow and initial conditions.
+
+The entry is found from the network data, either before or after it is prepared, and the options of `prepare_simulation` (see `simulation_cache_key`). If the network data has been prepared, the entry of the network data before preparation is removed with its alias.
+"""
+function invalidate_cache!(cache::SimulationCache, net; options...)
+    path = cache_entry_path(cache, simulation_cache_key(net; options...))
+
+    # The key of prepared network data is an alias, and the entry it refers to is removed with it
+    entry = isfile(path) ? (try deserialize(path) catch; nothing end) : nothing
+    if entry isa NamedTuple && haskey(entry, :alias)
+        rm(cache_entry_path(cache, entry.alias); force=true)
+    end
+    rm(path; force=true)
+    return cache
+end
+
+"""
+    clear_cache!(cache::SimulationCache)
+
+Removes all entries of the cache, e.g. after modifying the code of a component model, which does not change the keys of the entries.
+"""
+function clear_cache!(cache::SimulationCache)
+    foreach(path -> rm(path; force=true), cache_entry_paths(cache))
+    return cache
+end
@@ -2,68 +2,121 @@ using DifferentialEquations, DataFrames, OrderedCollections
 ###########################################################################
 # Read DAESolutions
 ###########################################################################
-function get_res_u(net::Dict{String,Any}, soln)
-    # Initialise dataframe
-    df = DataFrame()
-    var_list = get_var_list(net)
-    for var in var_list
-        df[!, var] = Vector{Float64}(undef, 0)
+function SimulationResults(soln, var_list; save_variables=nothing, decimation=1)
+    var_list = VariableRegistry(var_list)
+    soln_vector = soln isa DAESolution ? [soln] : soln
+
+    # Indexes of the saved variables
+    if isnothing(save_variables)
+        var_inds = collect(1:length(var_list))
+    else
+        var_inds = Int64[]
+        for var in save_variables
+            var_ind = find_variable_index(var_list, var)
+            isnothing(var_ind) && error("$var is not a simulation variable")
+            push!(var_inds, var_ind)
+        end
+        sort!(unique!(var_inds))
     end
 
-    # Read solutions
-    soln_vector = soln isa DAESolution ? [soln] : soln
-    for soln_instance in soln_vector
-        for row in soln_instance.u
-            push!(df, row)
+    # Indexes of the saved time steps, in each stage
+    step_inds = [1:decimation:length(soln_instance.t) for soln_instance in soln_vector]
+    n_steps = sum(length, step_inds)
+
+    # Copy solutions into preallocated matrices
+    t = Vector{Float64}(undef, n_steps)
+    u = Matrix{Float64}(undef, n_steps, length(var_inds))
+    du = Matrix{Float64}(undef, n_steps, length(var_inds))
+    k = 0
+    for (soln_instance, steps) in zip(soln_vector, step_inds)
+        for step in steps
+            k += 1
+            t[k] = soln_instance.t[step]
+            (u_step, du_step) = (soln_instance.u[step], soln_instance.du[step])
+            for (j, i) in enumerate(var_inds)
+                u[k, j] = u_step[i]
+                du[k, j] = du_step[i]
+            end
         end
     end
 
-    # Add time vector
-    t_vec = vcat([soln_instance.t for soln_instance in soln_vector]...)
-    df = insertcols!(df, 1, :t => t_vec)
-    return df
+    saved_variables = VariableRegistry(
+        var_list.names[var_inds],
+        var_list.classes[var_inds],
+        var_list.elements[var_inds],
+        var_list.base_names[var_inds],
+    )
+    return SimulationResults(t, u, du, saved_variables)
 end
-function get_res_du(net::Dict{String,Any}, soln)
-    # Initialise dataframe
-    df = DataFrame()
-    var_list = get_var_list(net)
-    for var in var_list
-        df[!, "d$var"] = Vector{Float64}(undef, 0)
-    end
 
-    # Read solutions
-    soln_vector = soln isa DAESolution ? [soln] : soln
+SimulationResults(net::Dict{String,Any}, soln; kwargs...) = SimulationResults(soln, get_var_list(net); kwargs...)
 
-    for soln_instance in soln_vector
-        for row in soln_instance.du
-            push!(df, row)
-        end
+"""
+    result_variable(results::SimulationResults, var)
+
+Returns a view of the results of a variable, e.g. `"V_3"`, or of its derivative, e.g. `"dEq_1"`. Returns `nothing` if the variable was not saved.
+"""
+function result_variable(results::SimulationResults, var::AbstractString)
+    j = find_variable_index(results.variables, var)
+    if !isnothing(j)
+        return view(results.u, :, j)
     end
 
-    # Add time vector
-    t_vec = vcat([soln_instance.t for soln_instance in soln_vector]...)
-    df = insertcols!(df, 1, :t => t_vec)
-    return df
+    # Derivatives are named "d<variable>"
+    j = startswith(var, "d") ? find_variable_index(results.variables, var[nextind(var, 1):end]) : nothing
+    return isnothing(j) ? nothing : view(results.du, :, j)
+end
+
+"""
+    result_variable(results::SimulationResults, class::Symbol, element, var)
+
+Returns a view of the results of a variable of an element, e.g. `result_variable(results, :bus, 3, "V")`. Returns `nothing` if the variable was not saved.
+"""
+function result_variable(results::SimulationResults, class::Symbol, element, var::AbstractString)
+    j = variable_index(results.variables, class, element, var)
+    return isnothing(j) ? nothing : view(results.u, :, j)
+end
+
+function Base.getindex(results::SimulationResults, var::AbstractString)
+    res_vec = result_variable(results, var)
+    isnothing(res_vec) && throw(KeyError(var))
+    return res_vec
+end
+
+function get_res_u(net::Dict{String,Any}, soln)
+    results = SimulationResults(net, soln)
+    df = DataFrame(results.u, collect(results.variables))
+    return insertcols!(df, 1, :t => results.t)
+end
+function get_res_du(net::Dict{String,Any}, soln)
+    results = SimulationResults(net, soln)
+    df = DataFrame(results.du, ["d$var" for var in results.variables])
+    return insertcols!(df, 1, :t => results.t)
 end
 
 ###########################################################################
 # Add data to PowerModels network data dictionary
 ###########################################################################
-function add_simulation_results!(net::Dict{String,Any}, soln)
-    # Parse DAE solution to dataframe
-    result_df = innerjoin(get_res_u(net, soln), get_res_du(net, soln), on=:t)
+# kwargs (save_variables, decimation) are passed to SimulationResults
+#   The results of each element are added to its "sol" dict as views of the SimulationResults,
+#   which is also returned
+# disturbances: the disturbances of the simulation, so that the voltages of buses eliminated by
+#   network reduction are reconstructed with the faults applied at them (see
+#   add_eliminated_bus_results!)
+function add_simulation_results!(net::Dict{String,Any}, soln; disturbances=Disturbance[], kwargs...)
+    results = soln isa SimulationResults ? soln : SimulationResults(net, soln; kwargs...)
 
     # Add time vector to network dict
-    net["t_vec"] = result_df.t
-
+    net["t_vec"] = results.t
 
     # Add centre of inertia reference (if selected)
-    net["dynamic_model_parameters"]["ω_ref"] == "coi" ? net["ω_coi"] = copy(result_df.ω_coi) : nothing
+    net["dynamic_model_parameters"]["ω_ref"] == "coi" ? net["ω_coi"] = result_variable(results, "ω_coi") : nothing
 
     # Add generator, bus and load results
-    add_gen_results!(net, result_df)
-    add_bus_results!(net, result_df)
-    add_load_results!(net, result_df)
+    add_gen_results!(net, results)
+    add_bus_results!(net, results, disturbances)
+    add_load_results!(net, results)
+    return results
 end
 
 get_all_variables(model_type) = String[
@@ -71,7 +124,7 @@ get_all_variables(model_type) = String[
     differential_variables(model_type)
 ]
 
-function add_gen_results!(net::Dict, res::DataFrame)
+function add_gen_results!(net::Dict, res::SimulationResults)
     for (g, gen) in net["gen"]
         # Initialise result dict
         gen["sol"] = OrderedDict{String,Any}()
@@ -94,14 +147,57 @@ function add_gen_results!(net::Dict, res::DataFrame)
     end
 end
 
-function add_bus_results!(net::Dict, res::DataFrame)
+function add_bus_results!(net::Dict, res::SimulationResults, disturbances=Disturbance[])
     for (b, bus) in net["bus"]
         bus["sol"] = Dict{String,Any}()
         add_res_vecs!(bus, res, ["V", "θ"])
     end
+    haskey(net, "eliminated_buses") ? add_eliminated_bus_results!(net, res, disturbances) : nothing
+end
+
+# Reconstructs the voltages of the buses eliminated by network reduction from the voltages of the
+#   retained buses, if they were saved. The BusFaults and ClearBusFaults at eliminated buses in
+#   disturbances are applied to the reduction at the saved time steps after their times, so the
+#   voltages of each time step are those of the faults active during it.
+function add_eliminated_bus_results!(net::Dict, res::SimulationResults, disturbances=Disturbance[])
+    reduction = KronReduction(net)
+    fault_events = sort!(
+        [
+            (disturbance.t_disturbance, disturbance.bus_ind, disturbance isa BusFault)
+            for disturbance in disturbances
+            if (disturbance isa BusFault || disturbance isa ClearBusFault) && reduction.bus_position[disturbance.bus_ind] == 0
+        ];
+        by=first,
+    )
+    V_retained = [result_variable(res, "V_$bus_ind") for bus_ind in reduction.retained_buses]
+    θ_retained = [result_variable(res, "θ_$bus_ind") for bus_ind in reduction.retained_buses]
+    (any(isnothing, V_retained) || any(isnothing, θ_retained)) && return nothing
+
+    eliminated_buses = net["eliminated_buses"]
+    for bus_ind in eliminated_buses
+        net["bus"]["$bus_ind"]["sol"] = Dict{String,Any}("V" => zeros(length(res.t)), "θ" => zeros(length(res.t)))
+    end
+    num_buses = length(reduction.bus_position)
+    (V, θ) = (zeros(num_buses), zeros(num_buses))
+    e = 1
+    for k in eachindex(res.t)
+        while e <= length(fault_events) && fault_events[e][1] < res.t[k]
+            (_, bus_ind, faulted) = fault_events[e]
+            reduction.faulted[bus_ind] = faulted
+            e += 1
+        end
+        for (p, bus_ind) in enumerate(reduction.retained_buses)
+            (V[bus_ind], θ[bus_ind]) = (V_retained[p][k], θ_retained[p][k])
+        end
+        eliminated_bus_voltages!(V, θ, reduction)
+        for bus_ind in eliminated_buses
+            bus_sol = net["bus"]["$bus_ind"]["sol"]
+            (bus_sol["V"][k], bus_sol["θ"][k]) = (V[bus_ind], θ[bus_ind])
+        end
+    end
 end
 
-function add_load_results!(net::Dict, res::DataFrame)
+function add_load_results!(net::Dict, res::SimulationResults)
     for (l, load) in net["load"]
         load["sol"] = Dict{String,Any}()
         add_res_vecs!(
@@ -112,11 +208,13 @@ function add_load_results!(net::Dict, res::DataFrame)
     end
 end
 
-function add_res_vec!(elm::Dict, res::DataFrame, var)
-    elm["sol"][var] = copy(res[:, "$(var)_$(elm["index"])"])
+# variables that were not saved are skipped
+function add_res_vec!(elm::Dict, res::SimulationResults, var)
+    res_vec = result_variable(res, "$(var)_$(elm["index"])")
+    !isnothing(res_vec) ? elm["sol"][var] = res_vec : nothing
 end
 
-function add_res_vecs!(elm::Dict, res::DataFrame, vars::Vector{String})
+function add_res_vecs!(elm::Dict, res::SimulationResults, vars::Vector{String})
     for var in vars
         add_res_vec!(elm, res, var)
     end
@@ -0,0 +1,155 @@
+###########################################################################
+# Jacobian of the power system equations
+###########################################################################
+"""
+    jacobian_sparsity(power_system_model::PowerSystemModel)
+
+Returns the sparsity pattern of the Jacobian of the power system equations as a `SparseMatrixCSC` with all stored values set to zero.
+
+The equations of a component model depend only on the variables and derivatives that its `ComponentModelData` points to, so by default a component adds a dense block with rows `inds_out` and columns `inds_u` and `inds_du`. Components that couple many variables sparsely, such as `NetworkModel`, define their own pattern. The diagonal is always included, so that models swapped in by disturbances (e.g. `BusFaultModel`) are covered.
+"""
+function jacobian_sparsity(power_system_model::PowerSystemModel)
+    n = length(power_system_model.variables)
+    (rows, cols) = (collect(1:n), collect(1:n))
+    for component_model in power_system_model.component_list
+        add_sparsity!(rows, cols, component_model, component_model.model)
+    end
+
+    jac_prototype = sparse(rows, cols, ones(length(rows)), n, n)
+    fill!(nonzeros(jac_prototype), 0.0)
+    return jac_prototype
+end
+
+# Dense block of the equations of a component model
+function add_sparsity!(rows, cols, component_model::ComponentModelData, model::ComponentModel)
+    for i in component_model.inds_out, j in [component_model.inds_u; component_model.inds_du]
+        push!(rows, i)
+        push!(cols, j)
+    end
+end
+
+"""
+    power_system_jacobian!(J, du, u, p, gamma, t)
+
+Evaluates the Jacobian of the power system equations for the DAE solver, `J = dF/du + gamma * dF/d(du)`.
+
+The Jacobian block of each component model is calculated by forward mode automatic differentiation of its `update!` method, unless the model defines an analytic `add_component_jacobian!` method (e.g. `NetworkModel`), and added to `J`. If `J` is sparse, its sparsity pattern must contain the pattern returned by `jacobian_sparsity`.
+"""
+function power_system_jacobian!(J, du, u, p, gamma, t)
+    zero_jacobian!(J)
+    jacobian_groups!(J, du, u, p.component_groups, gamma, t)
+    return nothing
+end
+
+# Recursion over the tuple of component groups, so that each group is compiled for its model type
+jacobian_groups!(J, du, u, groups::Tuple{}, gamma, t) = nothing
+function jacobian_groups!(J, du, u, groups::Tuple, gamma, t)
+    jacobian_group!(J, du, u, first(groups), gamma, t)
+    jacobian_groups!(J, du, u, Base.tail(groups), gamma, t)
+end
+
+function jacobian_group!(J, du, u, group::ComponentGroup, gamma, t)
+    for k in eachindex(group.models)
+        add_component_jacobian!(J, du, u, group.component_data[k], group.models[k], gamma, t)
+    end
+    return nothing
+end
+
+# Adds the Jacobian block of a single component model to J
+function add_component_jacobian!(J, du, u, component_model::ComponentModelData, model::ComponentModel, gamma, t)
+    (inds_out, inds_du, inds_u) = (component_model.inds_out, component_model.inds_du, component_model.inds_u)
+    n_du = length(inds_du)
+
+    # Differentiate the component equations with respect to [du; u] of the component
+    #   the buffers are passed through a function barrier, as the type of their configuration
+    #   depends on the chunk size
+    J_component = component_jacobian!(component_model.jacobian, du, u, inds_du, inds_u, model, t)
+
+    # Add derivative and variable blocks
+    for (i, row) in enumerate(inds_out)
+        for (j, col) in enumerate(inds_du)
+            add_to_jacobian!(J, row, col, gamma * J_component[i, j])
+        end
+        for (j, col) in enumerate(inds_u)
+            add_to_jacobian!(J, row, col, J_component[i, n_du+j])
+        end
+    end
+end
+
+# Jacobian of the component equations with respect to [du; u] of the component, evaluated into
+#   the preallocated buffers. The configuration has no function tag, so the tag check is disabled.
+function component_jacobian!(buffers::ComponentJacobian, du, u, inds_du, inds_u, model::ComponentModel, t)
+    (x, n_du) = (buffers.x, length(inds_du))
+    for (k, i) in enumerate(inds_du)
+        x[k] = du[i]
+    end
+    for (k, i) in enumerate(inds_u)
+        x[n_du+k] = u[i]
+    end
+
+    component_equations!(out, x) = update!(out, view(x, 1:n_du), view(x, n_du+1:length(x)), model, t)
+    ForwardDiff.jacobian!(buffers.jacobian, component_equations!, buffers.out, x, buffers.config, Val{false}())
+    return buffers.jacobian
+end
+
+zero_jacobian!(J::SparseMatrixCSC) = fill!(nonzeros(J), 0.0)
+zero_jacobian!(J) = fill!(J, 0.0)
+
+function add_to_jacobian!(J::SparseMatrixCSC, row, col, value)
+    iszero(value) && return nothing
+
+    # Find the stored entry in the column
+    rows = rowvals(J)
+    k = searchsortedfirst(rows, row, J.colptr[col], J.colptr[col+1] - 1, Base.Order.Forward)
+    if k >= J.colptr[col+1] || rows[k] != row
+        error("Jacobian entry ($row, $col) is not in the sparsity pattern")
+    end
+    nonzeros(J)[k] += value
+    return nothing
+end
+function add_to_jacobian!(J, row, col, value)
+    J[row, col] += value
+    return nothing
+end
+
+# Whether the solver factorises a sparse Jacobian. Sundials solvers only do so with the KLU
+# linear solver, otherwise they are given a dense Jacobian.
+supports_sparse_jacobian(solver) = true
+supports_sparse_jacobian(::Sundials.SundialsDAEAlgorithm{LinearSolver}) where {LinearSolver} = LinearSolver === :KLU
+
+"""
+    make_dae_function(power_system_model::PowerSystemModel, solver; profile=nothing)
+
+Returns the `DAEFunction` of the power system equations, with the Jacobian `power_system_jacobian!`.
+
+The sparsity pattern of the Jacobian is passed to solvers that factorise sparse Jacobians, e.g. `IDA(linear_solver=:KLU)`.
+
+If the power system model has a `CompiledResidual` (see `compile_residual!`), its generated functions are used instead. The generated Jacobian function is only used by solvers that factorise sparse Jacobians, with the sparsity pattern of the model when the functions were generated (which contains the pattern of any disturbed model, as the diagonal is always included).
+
+If a `SimulationProfile` is given, the equations and Jacobian are evaluated by `profiled_equations!` and `profiled_jacobian!`, which record the timings of each component model type (the generated functions of a `CompiledResidual` are not profiled by component).
+"""
+function make_dae_function(power_system_model::PowerSystemModel, solver; profile=nothing)
+    compiled = get(power_system_model.auxiliary_data, "compiled_residual", nothing)
+    if !isnothing(profile) && isnothing(compiled)
+        profile_model!(profile, power_system_model)
+        return DAEFunction(
+            (out, du, u, p, t) -> profiled_equations!(out, du, u, p, t, profile);
+            jac=(J, du, u, p, gamma, t) -> profiled_jacobian!(J, du, u, p, gamma, t, profile),
+            jac_prototype=supports_sparse_jacobian(solver) ? jacobian_sparsity(power_system_model) : nothing,
+        )
+    elseif !isnothing(compiled)
+        return DAEFunction(
+            compiled_equations(compiled);
+            jac=supports_sparse_jacobian(solver) ? compiled_jacobian(compiled) : power_system_jacobian!,
+            jac_prototype=supports_sparse_jacobian(solver) ? copy(compiled.jacobian_pattern) : nothing,
+        )
+    elseif supports_sparse_jacobian(solver)
+        return DAEFunction(
+            power_system_equations!;
+            jac=power_system_jacobian!,
+            jac_prototype=jacobian_sparsity(power_system_model),
+        )
+    else
+        return DAEFunction(power_system_equations!; jac=power_system_jacobian!)
+    end
+end
@@ -23,6 +23,34 @@ abstract type Disturbance end
 ###########################################################################
 # Simulation data structures
 ###########################################################################
+"""
+    ComponentJacobian{C<:ForwardDiff.JacobianConfig}
+
+Preallocated buffers for the forward mode automatic differentiation of the equations of a component model by `add_component_jacobian!`.
+
+# Fields
+- `x::Vector{Float64}`: The derivatives and variables of the component model, `[du[inds_du]; u[inds_u]]`.
+- `out::Vector{Float64}`: The outputs of the component model.
+- `jacobian::Matrix{Float64}`: The Jacobian of the outputs with respect to `x`.
+- `config::C`: The `ForwardDiff.JacobianConfig` holding the dual number buffers, created without a function (tag `Nothing`).
+
+# Constructor
+```julia
+ComponentJacobian(n_out, n_x)
+```
+"""
+struct ComponentJacobian{C<:ForwardDiff.JacobianConfig}
+    x::Vector{Float64}
+    out::Vector{Float64}
+    jacobian::Matrix{Float64}
+    config::C
+end
+
+function ComponentJacobian(n_out, n_x)
+    (x, out) = (zeros(n_x), zeros(n_out))
+    return ComponentJacobian(x, out, zeros(n_out, n_x), ForwardDiff.JacobianConfig(nothing, out, x))
+end
+
 """
     ComponentModelData
     
@@ -30,10 +58,21 @@ A struct containing the component model and the indices of the variables that ap
 
 # Fields
 - `source_ind::Int64`: The index of the component in the network data dictionary (either a generator, load, or bus).
-- `model::ComponentModel`: The component model.
+- `model::ComponentModel`: The component model. The field is abstractly typed, so that components of all model types share a component list.
 - `inds_out::Vector{Int64}`: The indices of the equations in the output (residuals) vector.
 - `inds_du::Vector{Int64}`: The indices of the state derivatives in the du vector.
 - `inds_u::Vector{Int64}`: The indices of the state variables in the u vector.
+- `out_buf::Vector{Float64}`, `du_buf::Vector{Float64}`, `u_buf::Vector{Float64}`: Buffers that the outputs, derivatives and variables of the component model are gathered into during residual evaluation, so that evaluating the residuals does not allocate.
+- `jacobian::ComponentJacobian`: Buffers for the automatic differentiation of the component equations, so that evaluating the Jacobian does not allocate them.
+
+# Constructor
+```julia
+ComponentModelData(source_ind, model, inds_out, inds_du, inds_u)
+```
+The buffers are allocated from the lengths of the index vectors.
+
+# Note
+- Code evaluated for every component in the residual or Jacobian must take the model from `ComponentGroup.models`, which is concretely typed, and not from `model`, which is dynamically dispatched. `power_system_equations!` and `power_system_jacobian!` iterate over the `component_groups` of the `PowerSystemModel` and pass each model alongside its `ComponentModelData` (e.g. `update_component!(out, du, u, component_data[k], models[k], t)`).
 """
 struct ComponentModelData
     source_ind::Int64
@@ -41,24 +80,343 @@ struct ComponentModelData
     inds_out::Vector{Int64}
     inds_du::Vector{Int64}
     inds_u::Vector{Int64}
+    out_buf::Vector{Float64}
+    du_buf::Vector{Float64}
+    u_buf::Vector{Float64}
+    jacobian::ComponentJacobian
+end
+
+ComponentModelData(source_ind, model, inds_out, inds_du, inds_u) = ComponentModelData(
+    source_ind,
+    model,
+    inds_out,
+    inds_du,
+    inds_u,
+    zeros(length(inds_out)),
+    zeros(length(inds_du)),
+    zeros(length(inds_u)),
+    ComponentJacobian(length(inds_out), length(inds_du) + length(inds_u)),
+)
+
+"""
+    ComponentGroup{M<:ComponentModel}
+
+The component models of a single concrete model type, used to evaluate the residuals without dynamic dispatch.
+
+# Fields
+- `models::Vector{M}`: The component models.
+- `component_data::Vector{ComponentModelData}`: The model data of each component model, containing the indices and buffers of its variables. Its `model` field is the same model, but abstractly typed, so use `models[k]` in functions called per component.
+"""
+struct ComponentGroup{M<:ComponentModel}
+    models::Vector{M}
+    component_data::Vector{ComponentModelData}
+end
+
+ComponentGroup{M}() where {M} = ComponentGroup{M}(M[], ComponentModelData[])
+
+"""
+    VariableRegistry <: AbstractVector{String}
+
+The names of the simulation variables, indexed for constant time lookup.
+
+Each variable is named `"<variable>_<element>"` (e.g. `"V_3"`), and belongs to an element of a class: `:gen`, `:bus`, `:load` or `:system` (`ω_coi`, with element index 0). A `VariableRegistry` can be used wherever the vector of variable names is used, and is built once by `get_var_list`.
+
+# Fields
+- `names::Vector{String}`: Names of the variables, in the order of the simulation vectors.
+- `classes::Vector{Symbol}`: Element class of each variable.
+- `elements::Vector{Int64}`: Element index of each variable.
+- `base_names::Vector{String}`: Name of each variable without the element index (e.g. `"V"`).
+- `index::Dict{String,Int64}`: Index of each variable name.
+- `element_index::Dict{Tuple{Symbol,Int64,String},Int64}`: Index of each (class, element, base name).
+- `base_index::Dict{String,Vector{Int64}}`: Indexes of all variables with a base name, in order.
+- `class_ranges::Dict{Symbol,UnitRange{Int64}}`: Index range of the variables of each class.
+
+# Constructors
+```julia
+VariableRegistry(names, classes, elements, base_names)
+VariableRegistry(names)
+```
+The second constructor infers the classes and elements from the variable names.
+
+See also `save_variable_registry` and `load_variable_registry`.
+"""
+struct VariableRegistry <: AbstractVector{String}
+    names::Vector{String}
+    classes::Vector{Symbol}
+    elements::Vector{Int64}
+    base_names::Vector{String}
+    index::Dict{String,Int64}
+    element_index::Dict{Tuple{Symbol,Int64,String},Int64}
+    base_index::Dict{String,Vector{Int64}}
+    class_ranges::Dict{Symbol,UnitRange{Int64}}
 end
 
 """
-    PowerSystemModel
+    PowerSystemModel{G<:Tuple}
 
 A struct containing a list of the component models, and a list of the simulation variables.
 
 # Fields
 - `component_list::Vector{ComponentModelData}`: A list of the component models and the indices of the variables that appear in their equations.
-- `variables::Vector{String}`: A vector containing the names of the state/algebraic variables.
+- `variables::VariableRegistry`: The names of the state/algebraic variables, indexed by `VariableRegistry`. A vector of names is converted to a `VariableRegistry`.
 - `differential_vars::Vector{Bool}`: A boolean vector indicating whether each variable is a state variable (true) or an algebraic variable (false).
 - `auxiliary_data`: Any additional data that needs to be passed to the solver.
+- `component_groups::G`: A tuple of `ComponentGroup`s containing the components of `component_list` grouped by concrete model type. Must be updated with `regroup_components!` if `component_list` is modified.
+- `applied_disturbances::Vector{Disturbance}`: The disturbances applied to the model by `apply_disturbance!`, in order. These are undone by `reset_model!`.
+
+# Constructor
+```julia
+PowerSystemModel(component_list, variables, differential_vars, auxiliary_data, component_groups=group_components(component_list), applied_disturbances=Disturbance[])
+```
 """
-mutable struct PowerSystemModel
+mutable struct PowerSystemModel{G<:Tuple}
     component_list::Vector{ComponentModelData}
-    variables::Vector{String}
+    variables::VariableRegistry
     differential_vars::Vector{Bool}
     auxiliary_data
+    component_groups::G
+    applied_disturbances::Vector{Disturbance}
+end
+
+function PowerSystemModel(
+    component_list,
+    variables,
+    differential_vars,
+    auxiliary_data,
+    component_groups=group_components(component_list),
+    applied_disturbances=Disturbance[],
+)
+    return PowerSystemModel{typeof(component_groups)}(
+        component_list,
+        variables,
+        differential_vars,
+        auxiliary_data,
+        component_groups,
+        applied_disturbances,
+    )
+end
+
+"""
+    SimulationResults
+
+A struct containing the results of an RMS simulation, with one column per saved variable and one row per saved time step.
+
+The results of all stages of a simulation are copied once into preallocated matrices. Results are accessed by variable name (e.g. `results["V_3"]`, or `results["dEq_1"]` for a derivative) or with `result_variable`, which return views of the matrices.
+
+# Fields
+- `t::Vector{Float64}`: The saved time steps.
+- `u::Matrix{Float64}`: The values of the saved variables, `u[k, j]` is the value of variable `j` at time step `k`.
+- `du::Matrix{Float64}`: The derivatives of the saved variables.
+- `variables::VariableRegistry`: The names of the saved variables.
+
+# Constructors
+```julia
+SimulationResults(soln, var_list; save_variables=nothing, decimation=1)
+SimulationResults(net::Dict{String,Any}, soln; save_variables=nothing, decimation=1)
+```
+`soln` is a `DAESolution` or a vector of the `DAESolution`s of each stage. Only the variables named in `save_variables` are kept (all variables if `nothing`), and only every `decimation`th time step is kept.
+"""
+struct SimulationResults
+    t::Vector{Float64}
+    u::Matrix{Float64}
+    du::Matrix{Float64}
+    variables::VariableRegistry
+end
+
+"""
+    OutputSpecification
+
+A struct specifying the outputs recorded during an RMS simulation, and containing the recorded results.
+
+Passing an `OutputSpecification` to `run_RMS_simulation` with the `outputs` keyword records only the specified outputs, into the preallocated buffers of the specification, at every `decimation`th step of the solver. The full solution is then not saved at each step. Each simulation overwrites the outputs recorded by the previous one. The buffers are allocated for `capacity` recorded steps, and their capacity is doubled if they are full, so the capacity only needs to be an estimate.
+
+# Fields
+- `names::Vector{String}`: The name of each output.
+- `var_inds::Vector{Int64}`: The index of each output in the u vector (0 for derived outputs).
+- `derived::Vector{Any}`: The function `f(u, t)` of each derived output (`nothing` for variables).
+- `decimation::Int64`: The number of solver steps between recorded steps.
+- `n_steps::Int64`: The number of solver steps taken since recording started.
+- `n_recorded::Int64`: The number of recorded steps.
+- `t_buffer::Vector{Float64}`: The buffer of the recorded time steps.
+- `buffer::Matrix{Float64}`: The buffer of the recorded values, `buffer[k, i]` is the value of output `i` at recorded step `k`.
+
+# Constructors
+```julia
+OutputSpecification(var_list, variables; derived=[], decimation=1, capacity=10000)
+OutputSpecification(power_system_simulation::PowerSystemSimulation, variables; kwargs...)
+```
+`variables` contains variable names (e.g. `"V_31"`), or pairs of a variable and element indexes (e.g. `"Pg" => [2, 9]`). `derived` contains pairs of the name and function `f(u, t)` of each derived output (e.g. `"ω_coi" => coi_frequency(power_system_simulation)`). Buffers are initially allocated for `capacity` recorded steps.
+
+Recorded outputs are accessed by name as views of the buffer, e.g. `outputs["V_31"]`, and the recorded time steps as `outputs.t`.
+"""
+mutable struct OutputSpecification
+    names::Vector{String}
+    var_inds::Vector{Int64}
+    derived::Vector{Any}
+    decimation::Int64
+    n_steps::Int64
+    n_recorded::Int64
+    t_buffer::Vector{Float64}
+    buffer::Matrix{Float64}
+end
+
+"""
+    StateRecalculation
+
+A struct containing the data used to recalculate the state of the power system after a disturbance that restarts the simulation.
+
+It is built once per `PowerSystemModel` by `state_recalculation`, and kept in its `auxiliary_data` so that the index maps and sparsity patterns are reused by every stage.
+
+# Fields
+- `state_inds::Vector{Int64}`: The indices of the state variables, which are held constant.
+- `algebraic_inds::Vector{Int64}`: The indices of the algebraic variables, which are recalculated.
+- `jacobian::SparseMatrixCSC{Float64,Int64}`: The Jacobian of the power system equations, with the pattern returned by `jacobian_sparsity`.
+- `algebraic_jacobian::SparseMatrixCSC{Float64,Int64}`: The Jacobian of the algebraic equations with respect to the algebraic variables.
+- `algebraic_entries::Vector{Int64}`: The index in `nonzeros(algebraic_jacobian)` of each stored entry of `jacobian` (0 if the entry is outside the algebraic block).
+- `factorisation`: The LU factorisation of `algebraic_jacobian`, reused between Newton iterations (`nothing` before the first iteration).
+- `out::Vector{Float64}`, `du::Vector{Float64}`, `Δ::Vector{Float64}`: Buffers for the residuals, derivatives and Newton steps.
+- `ftol::Float64`: The tolerance on the largest residual of the algebraic equations.
+- `max_iterations::Int64`: The maximum number of Newton iterations.
+- `timings::DataFrame`: The time of each recalculation, the number of Newton iterations, the largest residual, whether the Newton solve converged, and the time spent (s) solving the algebraic variables and calculating the derivatives.
+"""
+mutable struct StateRecalculation
+    state_inds::Vector{Int64}
+    algebraic_inds::Vector{Int64}
+    jacobian::SparseMatrixCSC{Float64,Int64}
+    algebraic_jacobian::SparseMatrixCSC{Float64,Int64}
+    algebraic_entries::Vector{Int64}
+    factorisation
+    out::Vector{Float64}
+    du::Vector{Float64}
+    Δ::Vector{Float64}
+    ftol::Float64
+    max_iterations::Int64
+    timings::DataFrame
+end
+
+"""
+    KronReduction
+
+The Kron reduction of the passive buses (buses without generators or loads) of a network, used by a `NetworkModel` of the retained buses.
+
+The eliminated buses are split into clusters of connected passive buses. The reduced admittance matrix is the admittance matrix of the retained buses, plus the contribution of each cluster to the admittances between the retained buses adjacent to it
+
+`` Y_{red} = Y_{RR} - \\sum_{C} Y_{NC} Y_{CC}^{-1} Y_{CN} ``
+
+where `C` are the buses of a cluster and `N` the retained buses adjacent to it. The stored entries of the reduced matrix include all pairs of the adjacent buses of each cluster, so the sparsity pattern of the `NetworkModel` does not change when a fault at an eliminated bus changes the contribution of its cluster.
+
+# Fields
+- `Y::SparseMatrixCSC{ComplexF64,Int64}`: The admittance matrix of the network.
+- `retained_buses::Vector{Int64}`: The bus index of each row of the reduced admittance matrix.
+- `bus_position::Vector{Int64}`: The row of each bus in the reduced admittance matrix (0 for eliminated buses).
+- `clusters::Vector{Vector{Int64}}`: The eliminated buses of each cluster.
+- `neighbours::Vector{Vector{Int64}}`: The retained buses adjacent to each cluster.
+- `cluster_of::Vector{Int64}`: The cluster of each bus (0 for retained buses).
+- `row_ptr::Vector{Int64}`, `connected_bus::Vector{Int64}`: The row storage of the reduced matrix, as in `NetworkModel`.
+- `entries::Vector{Matrix{Int64}}`: The stored entry of the reduced matrix (in the row storage of the `NetworkModel`) of each pair of adjacent buses of each cluster.
+- `Y_values::Vector{ComplexF64}`: The values of the stored entries of the reduced matrix.
+- `contributions::Vector{Matrix{ComplexF64}}`: The current contribution of each cluster to the admittances between its adjacent buses.
+- `faulted::Vector{Bool}`: Indicates whether each bus is short-circuited by a `BusFault` (only used for eliminated buses).
+
+# Constructor
+```julia
+KronReduction(net::Dict{String,Any})
+```
+Eliminates the buses listed in `net["eliminated_buses"]` (see `add_network_reduction!`).
+"""
+struct KronReduction
+    Y::SparseMatrixCSC{ComplexF64,Int64}
+    retained_buses::Vector{Int64}
+    bus_position::Vector{Int64}
+    clusters::Vector{Vector{Int64}}
+    neighbours::Vector{Vector{Int64}}
+    cluster_of::Vector{Int64}
+    row_ptr::Vector{Int64}
+    connected_bus::Vector{Int64}
+    entries::Vector{Matrix{Int64}}
+    Y_values::Vector{ComplexF64}
+    contributions::Vector{Matrix{ComplexF64}}
+    faulted::Vector{Bool}
+end
+
+"""
+    CompiledResidual
+
+The residual and Jacobian functions generated for a power system model by `compile_residual!`.
+
+# Fields
+- `key::String`: The key of the component models that the functions were generated for (see `residual_cache_key`).
+- `residual::R`: The generated residual function, `residual(out, du, u, t, interpreted)`.
+- `jacobian::J`: The generated Jacobian function, `jacobian(J, du, u, gamma, t, interpreted)`, for Jacobians with the sparsity pattern `jacobian_pattern`.
+- `jacobian_pattern::SparseMatrixCSC{Float64,Int64}`: The sparsity pattern of the Jacobian when the functions were generated (see `jacobian_sparsity`).
+- `interpreted::I`: The `ComponentModelData` and model of each component whose equations could not be traced. Their equations are evaluated by their `update!` methods within the generated functions.
+- `active::Bool`: Whether the generated functions are evaluated, i.e. whether no disturbance is applied to the model. Any applied disturbance deactivates the generated functions, and the equations of the component models are evaluated instead until the disturbances are undone by `reset_model!`.
+"""
+mutable struct CompiledResidual{R,J,I<:Tuple}
+    key::String
+    residual::R
+    jacobian::J
+    jacobian_pattern::SparseMatrixCSC{Float64,Int64}
+    interpreted::I
+    active::Bool
+end
+
+"""
+    SimulationProfile
+
+A struct recording the phase timings, solver statistics and component timings of the preparation and RMS simulation of a power system, when passed to `prepare_simulation` or `run_RMS_simulation` with the `profile` keyword.
+
+Without a profile, no timings are recorded and the equations of the component models are evaluated without instrumentation. A profile can be passed to several calls, and accumulates their records. See `component_timings` and `save_profile`.
+
+# Fields
+- `phases::DataFrame`: The elapsed time of each phase (s). Columns `phase`, `stage` (0 for phases before the first stage), `t` (simulation time of the phase, `NaN` for the preparation) and `time`.
+- `solver_statistics::DataFrame`: The statistics of the solver for each stage. Columns `stage`, `retcode`, `residual_calls`, `jacobian_evaluations`, `linear_solves`, `accepted_steps`, `rejected_steps`, `nonlinear_iterations` and `nonlinear_convergence_failures`.
+- `model_types::Vector{String}`: The component model types with recorded timings.
+- `components::Vector{Int64}`: The number of components of each model type.
+- `residual_calls::Vector{Int64}`, `residual_time::Vector{Float64}`: The number of evaluations of the equations of the components of each model type, and their total time (s).
+- `jacobian_calls::Vector{Int64}`, `jacobian_time::Vector{Float64}`: The number of evaluations of the Jacobian blocks of the components of each model type, and their total time (s).
+- `group_inds::Vector{Int64}`: The model type of each component group of the profiled power system model.
+
+# Constructor
+```julia
+SimulationProfile()
+```
+"""
+mutable struct SimulationProfile
+    phases::DataFrame
+    solver_statistics::DataFrame
+    model_types::Vector{String}
+    components::Vector{Int64}
+    residual_calls::Vector{Int64}
+    residual_time::Vector{Float64}
+    jacobian_calls::Vector{Int64}
+    jacobian_time::Vector{Float64}
+    group_inds::Vector{Int64}
+end
+
+"""
+    SimulationCache
+
+An on-disk cache of prepared power system simulations, used by `prepare_simulation`.
+
+Each entry holds the network data after the load flow and initial condition calculation, the initial conditions and the built component list of a network, and is keyed by a hash of the network data and the preparation options (see `simulation_cache_key`). Entries are stored as files in `folder_path`, and the least recently used entries are removed when the cache exceeds `max_entries` or `max_size`.
+
+# Fields
+- `folder_path::String`: The folder containing the cache entries.
+- `max_entries::Int64`: The maximum number of entries.
+- `max_size::Int64`: The maximum total size of the entries (bytes).
+
+# Constructor
+```julia
+SimulationCache(folder_path; max_entries=100, max_size=1_000_000_000)
+```
+"""
+struct SimulationCache
+    folder_path::String
+    max_entries::Int64
+    max_size::Int64
+
+    SimulationCache(folder_path; max_entries=100, max_size=1_000_000_000) = new(folder_path, max_entries, max_size)
 end
 
 """
@@ -71,7 +429,7 @@ A struct containing the data that will be passed to the differential equation so
 - `u0::Vector{Float64}`: The initial values of the state/algebraic variables.
 - `du0::Vector{Float64}`: The initial values of the derivatives of the state variables.
 - `disturbances::Vector{Disturbance}`: A vector of disturbances that will be applied to the system.
-- `solver`: The differential equation solver that will be used to solve the system.
+- `solver`: The differential equation solver that will be used to solve the system. The default, IDA with the KLU sparse linear solver, factorises the sparse Jacobian of the system (see `make_dae_function`).
 - `auxiliary_data`: Any additional data that needs to be passed to the solver.
 
 # Constructor
@@ -81,7 +439,7 @@ PowerSystemSimulation(
     u0,
     du0;
     disturbances=Disturbance[],
-    solver=IDA(),
+    solver=IDA(linear_solver=:KLU),
     auxiliary_data=nothing,
 ) = new(power_system_model, u0, du0, disturbances, solver, auxiliary_data)
 ```
@@ -100,11 +458,70 @@ mutable struct PowerSystemSimulation
         u0,
         du0;
         disturbances=Disturbance[],
-        solver=IDA(),
+        solver=IDA(linear_solver=:KLU),
         auxiliary_data=nothing,
     ) = new(power_system_model, u0, du0, disturbances, solver, auxiliary_data)
 end
 
+"""
+    EnsembleScenario
+
+A scenario of an ensemble simulated by `run_ensemble`, which differs from the prepared power system simulation in the parameters of its component models and its disturbances.
+
+# Fields
+- `parameters::Vector{Pair{Tuple{Type,Int64},NamedTuple}}`: The modified parameters of each component, identified by its model type and index in the network data dictionary, e.g. `(ZIPLoad, 3) => (Kpz=0.5, Kpc=0.5)` or `(SixthOrderModel, 1) => (H=4.0,)`.
+- `disturbances::Vector{Disturbance}`: The disturbances applied in the scenario.
+
+# Constructor
+```julia
+EnsembleScenario(; parameters=[], disturbances=Disturbance[])
+```
+"""
+struct EnsembleScenario
+    parameters::Vector{Pair{Tuple{Type,Int64},NamedTuple}}
+    disturbances::Vector{Disturbance}
+
+    EnsembleScenario(; parameters=[], disturbances=Disturbance[]) = new(parameters, disturbances)
+end
+
+"""
+    EnsembleModel
+
+The power system models of the scenarios of an ensemble, evaluated together in one batched state vector by `run_ensemble` with `ensemble=:batched`.
+
+The variables of scenario `k` are stored at `(k-1)*n_variables+1:k*n_variables` of the batched vectors, and the Jacobian of the ensemble is block diagonal.
+
+# Fields
+- `models::Vector{PowerSystemModel}`: The power system model of each scenario.
+- `n_variables::Int64`: The number of variables of each scenario.
+- `jacobians::Vector{SparseMatrixCSC{Float64,Int64}}`: The Jacobian of each scenario, with the sparsity pattern of its block of the Jacobian of the ensemble.
+"""
+struct EnsembleModel
+    models::Vector{PowerSystemModel}
+    n_variables::Int64
+    jacobians::Vector{SparseMatrixCSC{Float64,Int64}}
+end
+
+"""
+    EnsembleResults
+
+A struct containing the results of the scenarios of an ensemble simulated by `run_ensemble`, saved at the same time steps for every scenario.
+
+Results are accessed by variable name (e.g. `results["V_3"]`), which returns a view with one row per saved time step and one column per scenario.
+
+# Fields
+- `t::Vector{Float64}`: The saved time steps.
+- `u::Array{Float64,3}`: The values of the saved variables, `u[k, j, s]` is the value of variable `j` at time step `k` in scenario `s`. Time steps that a failed scenario did not reach are `NaN`.
+- `retcodes::Vector{String}`: The return code of the simulation of each scenario.
+- `variables::VariableRegistry`: The names of the saved variables.
+"""
+struct EnsembleResults
+    t::Vector{Float64}
+    u::Array{Float64,3}
+    retcodes::Vector{String}
+    variables::VariableRegistry
+end
+
 mutable struct SimulationStage
     stage_index::Int64
     t_start::Float64
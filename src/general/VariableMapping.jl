@@ -1,17 +1,126 @@
+###########################################################################
+# Variable registry
+###########################################################################
+function VariableRegistry(names, classes, elements, base_names)
+    index = Dict{String,Int64}()
+    element_index = Dict{Tuple{Symbol,Int64,String},Int64}()
+    base_index = Dict{String,Vector{Int64}}()
+    class_ranges = Dict{Symbol,UnitRange{Int64}}()
+    for (i, name) in enumerate(names)
+        haskey(index, name) && error("Variable $name is defined more than once")
+        index[name] = i
+        element_index[(classes[i], elements[i], base_names[i])] = i
+        push!(get!(base_index, base_names[i], Int64[]), i)
+        if !haskey(class_ranges, classes[i])
+            class_ranges[classes[i]] = i:i
+        elseif last(class_ranges[classes[i]]) == i - 1
+            class_ranges[classes[i]] = first(class_ranges[classes[i]]):i
+        else
+            error("Variables of class $(classes[i]) are not contiguous")
+        end
+    end
+    return VariableRegistry(
+        collect(String, names), collect(Symbol, classes), collect(Int64, elements), collect(String, base_names),
+        index, element_index, base_index, class_ranges,
+    )
+end
+
+# infers classes and elements from variable names
+function VariableRegistry(names::AbstractVector{<:AbstractString})
+    classes = Symbol[]
+    elements = Int64[]
+    base_names = String[]
+    for name in names
+        if name == "ω_coi"
+            (class, element, base_name) = (:system, 0, name)
+        else
+            (base_name, element) = split_variable_name(name)
+            class = base_name in ("V", "θ") ? :bus : base_name in ("Pd", "Qd") ? :load : :gen
+        end
+        push!(classes, class)
+        push!(elements, element)
+        push!(base_names, base_name)
+    end
+    return VariableRegistry(names, classes, elements, base_names)
+end
+
+VariableRegistry(registry::VariableRegistry) = registry
+Base.convert(::Type{VariableRegistry}, names::AbstractVector{<:AbstractString}) = VariableRegistry(names)
+
+Base.size(registry::VariableRegistry) = size(registry.names)
+Base.getindex(registry::VariableRegistry, i::Int) = registry.names[i]
+Base.IndexStyle(::Type{VariableRegistry}) = IndexLinear()
+
+# "Efd_12" -> ("Efd", 12)
+function split_variable_name(name)
+    i = findlast('_', name)
+    return String(name[1:prevind(name, i)]), parse(Int64, name[nextind(name, i):end])
+end
+
+"""
+    variable_index(registry::VariableRegistry, class::Symbol, element, base_name)
+
+Returns the index of a variable, e.g. `variable_index(registry, :bus, 3, "V")`, or `nothing` if it is not defined.
+"""
+variable_index(registry::VariableRegistry, class::Symbol, element, base_name) =
+    get(registry.element_index, (class, Int64(element), base_name), nothing)
+
+"""
+    class_range(registry::VariableRegistry, class::Symbol)
+
+Returns the index range of the variables of an element class (`:gen`, `:bus`, `:load` or `:system`).
+"""
+class_range(registry::VariableRegistry, class::Symbol) = get(registry.class_ranges, class, 1:0)
+
+"""
+    save_variable_registry(fp, registry::VariableRegistry)
+
+Saves a variable registry to a JSON file, so that it can be loaded with `load_variable_registry` instead of being built from the network data dictionary.
+"""
+function save_variable_registry(fp, registry::VariableRegistry)
+    open(fp, "w") do io
+        JSON.print(io, OrderedDict(
+            "names" => registry.names,
+            "classes" => string.(registry.classes),
+            "elements" => registry.elements,
+            "base_names" => registry.base_names,
+        ))
+    end
+end
+
+"""
+    load_variable_registry(fp)
+
+Loads a variable registry saved by `save_variable_registry`.
+"""
+function load_variable_registry(fp)
+    data = JSON.parsefile(fp)
+    return VariableRegistry(
+        String.(data["names"]),
+        Symbol.(data["classes"]),
+        Int64.(data["elements"]),
+        String.(data["base_names"]),
+    )
+end
+
 ###########################################################################
 # Get var_list 
 ###########################################################################
+# Returns the VariableRegistry of the simulation variables of the network
 function get_var_list(net::Dict{String,Any})
     # Get network dimensions
-    num_buses = length(keys(net["bus"]))
     num_gens = length(keys(net["gen"]))
     num_loads = length(keys(net["load"]))
 
     #Initialise var_list
     var_list = String[]
+    classes = Symbol[]
 
     # Reference frequency (if centre of inertia reference is selected)
-    net["dynamic_model_parameters"]["ω_ref"] == "coi" ? push!(var_list, "ω_coi") : nothing
+    if net["dynamic_model_parameters"]["ω_ref"] == "coi"
+        push!(var_list, "ω_coi")
+        push!(classes, :system)
+    end
 
     # Generator variables
     for gen_ind = 1:num_gens
@@ -31,16 +140,30 @@ function get_var_list(net::Dict{String,Any})
         end
 
     end
+    append!(classes, fill(:gen, length(var_list) - length(classes)))
 
-    # Add bus voltage magnitudes and angles to var_list
-    append!(var_list, ["V_$bus_ind" for bus_ind = 1:num_buses])
-    append!(var_list, ["θ_$bus_ind" for bus_ind = 1:num_buses])
+    # Add bus voltage magnitudes and angles to var_list (buses eliminated by network reduction
+    #   have no variables)
+    bus_inds = retained_buses(net)
+    append!(var_list, ["V_$bus_ind" for bus_ind in bus_inds])
+    append!(var_list, ["θ_$bus_ind" for bus_ind in bus_inds])
+    append!(classes, fill(:bus, 2 * length(bus_inds)))
 
     # Add load powers to var_list
     append!(var_list, ["Pd_$load_ind" for load_ind = 1:num_loads])
     append!(var_list, ["Qd_$load_ind" for load_ind = 1:num_loads])
+    append!(classes, fill(:load, 2 * num_loads))
+
+    # Split names into base names and element indexes
+    elements = Int64[]
+    base_names = String[]
+    for (name, class) in zip(var_list, classes)
+        (base_name, element) = class == :system ? (name, 0) : split_variable_name(name)
+        push!(base_names, base_name)
+        push!(elements, element)
+    end
 
-    return var_list
+    return VariableRegistry(var_list, classes, elements, base_names)
 end
 
 function add_model_to_var_list!(var_list::Vector{String}, element_index, model_type)
@@ -56,18 +179,30 @@ get_reference_gen_index(net::Dict{String,Any}) =
 ###########################################################################
 
 # Find index of single var. i.e. "V_1"
-function find_variable_index(var_list::Vector{String}, var::String)
+function find_variable_index(var_list::AbstractVector{String}, var::AbstractString)
     return findfirst(isequal(var), var_list)
 end
+find_variable_index(var_list::VariableRegistry, var::AbstractString) = get(var_list.index, var, nothing)
 
 # Find index of a collection of variables. i.e. ["V_1", "θ_1", "δ_3"]
-function find_variable_indexes(var_list::Vector{String}, vars::Vector)
+function find_variable_indexes(var_list::AbstractVector{String}, vars::AbstractVector)
     return [find_variable_index(var_list, var) for var in vars]
 end
 
 # Find index of all instances of a variables. i.e. "θ" will return ["θ_1", "θ_2", ..., "θ_n"]
-function find_all_variable_indexes(var_list::Vector{String}, var::String)
-    return findall(n -> occursin("$(var)_", n), var_list)
+#   only exact base names match, i.e. "V" does not match "ΔV_1" or "ω_coi" for "ω"
+#   a vector of names is searched directly, without building a registry for each search
+function find_all_variable_indexes(var_list::AbstractVector{String}, var::String)
+    prefix = var * "_"
+    return findall(name -> name == "ω_coi" ? name == var : has_variable_prefix(name, prefix), var_list)
+end
+find_all_variable_indexes(var_list::VariableRegistry, var::String) = copy(get(var_list.base_index, var, Int64[]))
+
+# Whether name is a base name prefix followed by an element index, i.e. "V_12" for "V_"
+function has_variable_prefix(name, prefix)
+    startswith(name, prefix) || return false
+    element = SubString(name, ncodeunits(prefix) + 1)
+    return !isempty(element) && all(isdigit, element)
 end
 
 
@@ -1,5 +1,55 @@
 using RMSPowerSims
 using Test
+using SparseArrays
+
+const IEEE39_FILE = joinpath(dirname(@__DIR__), "data", "example_test_systems", "ieee39.json")
+
+const SOLVER_SETTINGS = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01, saveat=0.01)
+
+# Prepares and simulates the IEEE 39 bus system, returning the network data with the simulation results
+function simulate_ieee39(disturbances; tspan=(0.0, 2.0), event_handling=:stages, options...)
+    net = parse_network_json(IEEE39_FILE)
+    power_system_simulation = prepare_simulation(net; options...)
+    power_system_simulation.disturbances = disturbances
+    soln = run_RMS_simulation(power_system_simulation, tspan; event_handling=event_handling, SOLVER_SETTINGS...)
+    add_simulation_results!(net, soln; disturbances=power_system_simulation.disturbances)
+    return net
+end
+
+# Largest difference of a result variable of all components of a class between two simulations
+max_difference(net_a, net_b, class, var) = maximum(
+    maximum(abs.(net_a[class][ind]["sol"][var] .- net_b[class][ind]["sol"][var])) for ind in keys(net_a[class])
+)
+
+# Linear interpolation of a result variable at the times t_new
+function interpolate(t, x, t_new)
+    return map(t_new) do τ
+        k = clamp(searchsortedlast(t, τ), 1, length(t) - 1)
+        x[k] + (x[k+1] - x[k]) * (τ - t[k]) / (t[k+1] - t[k])
+    end
+end
+
+# Allocations of the equations of a component model, evaluated on the component buffers
+#   separated from component_allocations so that the model type is known when compiling
+function kernel_allocations(out_buf, du_buf, u_buf, model, t)
+    RMSPowerSims.update!(out_buf, du_buf, u_buf, model, t)
+    return @allocated RMSPowerSims.update!(out_buf, du_buf, u_buf, model, t)
+end
+component_allocations(component_model, t) = kernel_allocations(
+    component_model.out_buf, component_model.du_buf, component_model.u_buf, component_model.model, t
+)
+
+# Allocations of a full residual evaluation, including gathering and scattering variables
+function residual_allocations(out, du, u, p, t)
+    RMSPowerSims.power_system_equations!(out, du, u, p, t)
+    return @allocated RMSPowerSims.power_system_equations!(out, du, u, p, t)
+end
+
+# Perturbed state of a prepared simulation, so that the equations are not evaluated at equilibrium
+perturbed_state(power_system_simulation) = (
+    power_system_simulation.u0 .* (1 .+ 1e-3 .* sin.(1:length(power_system_simulation.u0))),
+    power_system_simulation.du0 .+ 1e-3 .* cos.(1:length(power_system_simulation.du0)),
+)
 
 @testset "RMSPowerSims.jl" begin
     # Write your tests here.
@@ -39,3 +89,648 @@ using Test
     @test isapprox.(df.Pv, df_test.Pv)
     @test isapprox.(df.dPv, df_test.dPv)
 end
+
+@testset "Compiled residual" begin
+    power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE))
+    power_system_model = power_system_simulation.power_system_model
+    (u, du) = perturbed_state(power_system_simulation)
+    (t, gamma) = (0.5, 10.0)
+
+    compiled = compile_residual!(power_system_model)
+
+    # Residual
+    (out, out_compiled) = (zeros(length(u)), zeros(length(u)))
+    RMSPowerSims.power_system_equations!(out, du, u, power_system_model, t)
+    Base.invokelatest(compiled.residual, out_compiled, du, u, t, compiled.interpreted)
+    @test isapprox(out_compiled, out; rtol=1e-12, atol=1e-12)
+
+    # Jacobian
+    J = RMSPowerSims.jacobian_sparsity(power_system_model)
+    RMSPowerSims.power_system_jacobian!(J, du, u, power_system_model, gamma, t)
+    J_compiled = copy(compiled.jacobian_pattern)
+    Base.invokelatest(compiled.jacobian, J_compiled, du, u, gamma, t, compiled.interpreted)
+    @test isapprox(Matrix(J_compiled), Matrix(J); rtol=1e-10, atol=1e-10)
+
+    # The preallocated differentiation buffers of the components are reused between evaluations
+    J_reused = copy(J)
+    RMSPowerSims.power_system_jacobian!(J_reused, power_system_simulation.du0, power_system_simulation.u0, power_system_model, 1.0, 0.0)
+    RMSPowerSims.power_system_jacobian!(J_reused, du, u, power_system_model, gamma, t)
+    @test J_reused == J
+
+    # Disturbances switch to the equations of the component models until they are undone
+    RMSPowerSims.apply_disturbance!(power_system_model, LoadStep(1, 0.1, 0.1))
+    @test !compiled.active
+    RMSPowerSims.reset_model!(power_system_model)
+    @test compiled.active
+
+    # The generated functions are kept for the session until they are cleared
+    @test haskey(RMSPowerSims.GENERATED_RESIDUALS, compiled.key)
+    clear_compiled_residuals!()
+    @test isempty(RMSPowerSims.GENERATED_RESIDUALS)
+    Base.invokelatest(compiled.residual, out_compiled, du, u, t, compiled.interpreted)
+    @test isapprox(out_compiled, out; rtol=1e-12, atol=1e-12)
+    delete!(power_system_model.auxiliary_data, "compiled_residual")
+end
+
+@testset "Load flow" begin
+    # Reference solution of the PowerModels load flow with Ipopt
+    net_ipopt = parse_network_json(IEEE39_FILE)
+    ldf_result = RMSPowerSims.solve_pf(net_ipopt, RMSPowerSims.ACPPowerModel, RMSPowerSims.Ipopt.Optimizer)
+    RMSPowerSims.update_data!(net_ipopt, ldf_result["solution"])
+
+    for method in (:newton_raphson, :fast_decoupled)
+        net = parse_network_json(IEEE39_FILE)
+        @test solve_load_flow!(net; method=method, warm_start=false)
+        for (bus_ind, bus) in net["bus"]
+            @test isapprox(bus["vm"], net_ipopt["bus"][bus_ind]["vm"]; atol=1e-6)
+            @test isapprox(bus["va"], net_ipopt["bus"][bus_ind]["va"]; atol=1e-6)
+        end
+        for (gen_ind, gen) in net["gen"]
+            @test isapprox(gen["pg"], net_ipopt["gen"][gen_ind]["pg"]; atol=1e-5)
+            @test isapprox(gen["qg"], net_ipopt["gen"][gen_ind]["qg"]; atol=1e-5)
+        end
+    end
+end
+
+@testset "Network model" begin
+    power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE); network_model=NetworkModel)
+    power_system_model = power_system_simulation.power_system_model
+    (u, du) = perturbed_state(power_system_simulation)
+    (t, gamma) = (0.5, 10.0)
+
+    # Analytic Jacobian of the NetworkModel matches automatic differentiation of its equations
+    network = power_system_model.component_list[findfirst(c -> c.model isa NetworkModel, power_system_model.component_list)]
+    (J_analytic, J_ad) = (RMSPowerSims.jacobian_sparsity(power_system_model), RMSPowerSims.jacobian_sparsity(power_system_model))
+    RMSPowerSims.add_component_jacobian!(J_analytic, du, u, network, network.model, gamma, t)
+    invoke(
+        RMSPowerSims.add_component_jacobian!,
+        Tuple{Any,Any,Any,RMSPowerSims.ComponentModelData,ComponentModel,Any,Any},
+        J_ad, du, u, network, network.model, gamma, t,
+    )
+    @test isapprox(Matrix(J_analytic), Matrix(J_ad); rtol=1e-10, atol=1e-10)
+
+    # Sparse Jacobian matches the dense Jacobian
+    J_sparse = RMSPowerSims.jacobian_sparsity(power_system_model)
+    J_dense = zeros(length(u), length(u))
+    RMSPowerSims.power_system_jacobian!(J_sparse, du, u, power_system_model, gamma, t)
+    RMSPowerSims.power_system_jacobian!(J_dense, du, u, power_system_model, gamma, t)
+    @test isapprox(Matrix(J_sparse), J_dense; rtol=1e-12, atol=1e-12)
+
+    # NetworkModel and NodeModel give the same trajectory
+    disturbances = Disturbance[
+        BusFault(16, 0.1, restart_simulation=true),
+        ClearBusFault(16, 0.2, restart_simulation=true),
+    ]
+    net_node = simulate_ieee39(disturbances; network_model=NodeModel)
+    net_network = simulate_ieee39(disturbances; network_model=NetworkModel)
+    @test net_node["t_vec"] ≈ net_network["t_vec"]
+    @test max_difference(net_node, net_network, "gen", "ω") < 1e-5
+    @test max_difference(net_node, net_network, "bus", "V") < 1e-5
+end
+
+@testset "Variable registry" begin
+    net = parse_network_json(IEEE39_FILE)
+    registry = RMSPowerSims.get_var_list(net)
+    names = Vector{String}(registry.names)
+
+    # Lookups match searches of the vector of variable names
+    for (i, name) in enumerate(names)
+        @test RMSPowerSims.find_variable_index(registry, name) == RMSPowerSims.find_variable_index(names, name) == i
+        @test RMSPowerSims.variable_index(registry, registry.classes[i], registry.elements[i], registry.base_names[i]) == i
+    end
+    @test isnothing(RMSPowerSims.find_variable_index(registry, "V_1000"))
+    @test RMSPowerSims.find_variable_indexes(registry, ["V_1", "θ_3", "ω_2"]) == RMSPowerSims.find_variable_indexes(names, ["V_1", "θ_3", "ω_2"])
+    for base_name in unique(registry.base_names)
+        @test RMSPowerSims.find_all_variable_indexes(registry, base_name) == findall(n -> occursin(Regex("^$(base_name)_\\d+\$"), n), names)
+        @test RMSPowerSims.find_all_variable_indexes(names, base_name) == RMSPowerSims.find_all_variable_indexes(registry, base_name)
+    end
+    @test all(registry.classes[RMSPowerSims.class_range(registry, :bus)] .== :bus)
+
+    # Saved registries are loaded unchanged
+    fp = tempname() * ".json"
+    save_variable_registry(fp, registry)
+    @test load_variable_registry(fp).names == names
+    rm(fp)
+end
+
+@testset "State recalculation" begin
+    power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE))
+    power_system_simulation.disturbances = Disturbance[BusFault(16, 0.1, restart_simulation=true)]
+    power_system_model = RMSPowerSims.group_disturbance_models!(power_system_simulation)
+    RMSPowerSims.apply_disturbance!(power_system_model, power_system_simulation.disturbances[1])
+    (u0, _) = perturbed_state(power_system_simulation)
+    t = 0.1
+
+    (u, du) = RMSPowerSims.recalculate_system_state(power_system_model, u0, t)
+
+    # Reference solution of the algebraic equations by NLsolve, with the state variables held at u0
+    differential_vars = power_system_model.differential_vars
+    algebraic_inds = findall(.!differential_vars)
+    function algebraic_equations!(F, x)
+        (v, out) = (copy(u0), zeros(length(u0)))
+        v[algebraic_inds] = x
+        RMSPowerSims.power_system_equations!(out, zeros(length(u0)), v, power_system_model, t)
+        F .= out[algebraic_inds]
+    end
+    reference = RMSPowerSims.nlsolve(algebraic_equations!, u0[algebraic_inds]; ftol=1e-10)
+    @test reference.f_converged
+    @test u[differential_vars] == u0[differential_vars]
+    @test isapprox(u[algebraic_inds], reference.zero; atol=1e-7)
+
+    # The recalculated state is consistent
+    out = zeros(length(u))
+    RMSPowerSims.power_system_equations!(out, du, u, power_system_model, t)
+    @test maximum(abs.(out)) < 1e-7
+
+    # A recalculation that does not converge is reported
+    recalculation = RMSPowerSims.state_recalculation(power_system_model)
+    recalculation.max_iterations = 0
+    (u, du, converged) = @test_logs (:warn, r"Recalculation of system state failed") RMSPowerSims.recalculate_system_state(power_system_model, u0, t)
+    @test !converged
+    @test !recalculation.timings.converged[end]
+    RMSPowerSims.reset_model!(power_system_model)
+
+    # and terminates a simulation that applies disturbances within the integrator
+    power_system_simulation.disturbances = Disturbance[LoadStep(4, 0.1, 0.5)]
+    soln = @test_logs (:warn, r"Recalculation of system state failed") match_mode = :any run_RMS_simulation(
+        power_system_simulation, (0.0, 0.5); event_handling=:integrator, verbose=false, SOLVER_SETTINGS...
+    )
+    @test soln.retcode == RMSPowerSims.ReturnCode.ConvergenceFailure
+    @test soln.t[end] ≈ 0.1
+    @test isempty(power_system_simulation.power_system_model.applied_disturbances)
+end
+
+@testset "Allocation free residual evaluation" begin
+    for network_model in (NodeModel, NetworkModel)
+        power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE); network_model=network_model)
+        power_system_model = power_system_simulation.power_system_model
+        (u0, du0) = (power_system_simulation.u0, power_system_simulation.du0)
+        out = zeros(length(u0))
+
+        # gather the initial state into the component buffers
+        RMSPowerSims.power_system_equations!(out, du0, u0, power_system_model, 0.0)
+
+        for component_model in power_system_model.component_list
+            @test component_allocations(component_model, 0.0) == 0
+        end
+
+        # The network power flows keep the number type of the variables (e.g. dual numbers)
+        for component_model in power_system_model.component_list
+            if component_model.model isa NodeModel
+                @test (@inferred RMSPowerSims.network_power_flows(big.(component_model.u_buf), component_model.model)) isa Tuple{BigFloat,BigFloat}
+            end
+        end
+        @test residual_allocations(out, du0, u0, power_system_model, 0.0) == 0
+    end
+end
+
+@testset "Model reset" begin
+    disturbances = Disturbance[
+        BusFault(16, 0.1),
+        ClearBusFault(16, 0.2, restart_simulation=true),
+        LoadStep(1, 0.3, 0.5),
+    ]
+    for network_model in (NodeModel, NetworkModel)
+        power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE); network_model=network_model)
+        power_system_simulation.disturbances = disturbances
+        power_system_model = RMSPowerSims.group_disturbance_models!(power_system_simulation)
+        (u, du) = perturbed_state(power_system_simulation)
+        component_models() = [sprint(RMSPowerSims.write_canonical, component_model.model) for component_model in power_system_model.component_list]
+        function residual()
+            out = zeros(length(u))
+            RMSPowerSims.power_system_equations!(out, du, u, power_system_model, 0.5)
+            return out
+        end
+        (models_prepared, out_prepared) = (component_models(), residual())
+
+        # Fault, clearance and load step, undone by reset_model!
+        RMSPowerSims.apply_disturbance!(power_system_model, disturbances[1])
+        @test !isapprox(residual(), out_prepared)
+        RMSPowerSims.apply_disturbance!(power_system_model, disturbances[2])
+        RMSPowerSims.apply_disturbance!(power_system_model, disturbances[3])
+        @test component_models() != models_prepared
+        RMSPowerSims.reset_model!(power_system_model)
+        @test isempty(power_system_model.applied_disturbances)
+        @test component_models() == models_prepared
+        @test residual() ≈ out_prepared
+
+        # Repeated simulations of the same PowerSystemSimulation give the same result
+        solns = [run_RMS_simulation(power_system_simulation, (0.0, 1.0); verbose=false, SOLVER_SETTINGS...) for run = 1:2]
+        @test solns[1][end].u[end] ≈ solns[2][end].u[end]
+        @test component_models() == models_prepared
+    end
+end
+
+@testset "Integrator event handling" begin
+    disturbances = Disturbance[
+        BusFault(16, 0.1, restart_simulation=true),
+        ClearBusFault(16, 0.2, restart_simulation=true),
+        LoadStep(1, 0.5, 0.5),
+    ]
+    net_stages = simulate_ieee39(disturbances; event_handling=:stages)
+    net_integrator = simulate_ieee39(disturbances; event_handling=:integrator)
+
+    # The state variables are continuous at the disturbances, so are compared on a common time grid
+    t_common = 0.0:0.05:2.0
+    for (g, gen) in net_stages["gen"], var in ("ω", "δ")
+        x_stages = interpolate(net_stages["t_vec"], gen["sol"][var], t_common)
+        x_integrator = interpolate(net_integrator["t_vec"], net_integrator["gen"][g]["sol"][var], t_common)
+        @test maximum(abs.(x_stages .- x_integrator)) < 1e-4
+    end
+end
+
+@testset "Ensembles" begin
+    disturbances = Disturbance[LoadStep(4, 0.5, 0.5)]
+    tspan = (0.0, 2.0)
+    solver_settings = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+
+    net = parse_network_json(IEEE39_FILE)
+    power_system_simulation = prepare_simulation(net)
+    scenarios = [EnsembleScenario(disturbances=disturbances)]
+    results = Dict(
+        ensemble => run_ensemble(power_system_simulation, scenarios, tspan; ensemble=ensemble, verbose=false, solver_settings...)
+        for ensemble in (:batched, :serial)
+    )
+
+    # An ensemble of one scenario gives the results of a plain simulation of the scenario
+    power_system_simulation.disturbances = disturbances
+    soln = run_RMS_simulation(power_system_simulation, tspan; event_handling=:integrator, verbose=false, solver_settings..., saveat=0.01)
+    add_simulation_results!(net, soln)
+    for ensemble in (:batched, :serial)
+        @test results[ensemble].retcodes == ["Success"]
+        for (class, ind, var) in (("gen", "1", "ω"), ("gen", "5", "ω"), ("bus", "4", "V"), ("bus", "16", "V"))
+            x_plain = interpolate(net["t_vec"], net[class][ind]["sol"][var], results[ensemble].t)
+            @test maximum(abs.(results[ensemble]["$(var)_$(ind)"][:, 1] .- x_plain)) < 1e-5
+        end
+    end
+end
+
+@testset "Network reduction" begin
+    for bus_ind in (16, 14)
+        disturbances = Disturbance[BusFault(bus_ind, 0.1), ClearBusFault(bus_ind, 0.2)]
+        net_full = simulate_ieee39(disturbances; event_handling=:integrator, network_model=NetworkModel)
+        net_reduced = simulate_ieee39(disturbances; event_handling=:integrator, network_model=NetworkModel, reduce_network=true)
+        @test 14 in net_reduced["eliminated_buses"]
+        @test net_full["t_vec"] ≈ net_reduced["t_vec"]
+
+        # The results are saved both before and after the fault and its clearance, so are compared at the other steps
+        steps = findall(t -> !(t in (0.1, 0.2)), net_full["t_vec"])
+        for (class, var) in (("gen", "ω"), ("gen", "δ"), ("bus", "V"), ("bus", "θ"))
+            @test maximum(
+                maximum(abs.(net_full[class][ind]["sol"][var][steps] .- net_reduced[class][ind]["sol"][var][steps]))
+                for ind in keys(net_full[class])
+            ) < 1e-4
+        end
+    end
+end
+
+@testset "Output recording" begin
+    net = parse_network_json(IEEE39_FILE)
+    power_system_simulation = prepare_simulation(net)
+    power_system_simulation.disturbances = Disturbance[LoadStep(4, 0.5, 0.5)]
+    tspan = (0.0, 1.0)
+    solver_settings = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+    soln = run_RMS_simulation(power_system_simulation, tspan; verbose=false, solver_settings...)
+    var_list = power_system_simulation.power_system_model.variables
+
+    # Centre of inertia frequency from the inertia constants of the network data (ωs = 1)
+    ω_inds = [RMSPowerSims.find_variable_index(var_list, "ω_$g") for g in 1:10]
+    H = [net["gen"]["$g"]["dynamic_model"]["parameters"]["H"] for g in 1:10]
+    recorded = ["Pg_2", "Pg_9", "V_31"]
+
+    for decimation in (1, 3)
+        # The capacity is smaller than the number of recorded steps, so the buffers are grown
+        outputs = OutputSpecification(
+            power_system_simulation,
+            ["Pg" => [2, 9], "V_31"];
+            derived=["ω_coi" => coi_frequency(power_system_simulation)],
+            decimation=decimation,
+            capacity=16,
+        )
+        run_RMS_simulation(power_system_simulation, tspan; outputs=outputs, verbose=false, solver_settings...)
+        @test length(outputs.t) > 16
+        @test length(outputs.t) == 1 + outputs.n_steps ÷ decimation
+        @test outputs.t[1] == tspan[1]
+
+        # The outputs are recorded at the steps of the solver, which are saved in the full solution
+        steps = [findfirst(==(t), soln.t) for t in outputs.t]
+        @test !any(isnothing, steps)
+        for var in recorded
+            var_ind = RMSPowerSims.find_variable_index(var_list, var)
+            @test outputs[var] ≈ [soln.u[step][var_ind] for step in steps] atol = 1e-10
+        end
+        @test outputs["ω_coi"] ≈ [sum(H .* soln.u[step][ω_inds]) / sum(H) for step in steps] atol = 1e-10
+    end
+end
+
+@testset "Results stream writer" begin
+    net = parse_network_json(IEEE39_FILE)
+    power_system_simulation = prepare_simulation(net)
+    power_system_simulation.disturbances = Disturbance[LoadStep(4, 0.5, 0.5)]
+    tspan = (0.0, 1.0)
+    solver_settings = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+    soln = run_RMS_simulation(power_system_simulation, tspan; verbose=false, solver_settings...)
+    var_list = power_system_simulation.power_system_model.variables
+
+    mktempdir() do folder_path
+        # A small chunk size, so that the rows are written to disk in several chunks
+        variables = ["V_31", "ω_1", "Pd_4", "θ_16"]
+        writer = ResultsStreamWriter(folder_path, "stream", var_list; variables=variables, decimation=2, chunk_size=7)
+        run_RMS_simulation(power_system_simulation, tspan; outputs=writer, verbose=false, solver_settings...)
+        @test !isfile(joinpath(folder_path, "stream.rows"))
+
+        # Header in PowerFactory format, with the variables in the order of the u vector
+        header = read_pf_header(folder_path, "stream")
+        var_inds = sort([RMSPowerSims.find_variable_index(var_list, var) for var in variables])
+        @test header.names == ["time"; [
+            "$(var_list.classes[i]) $(var_list.elements[i])_$(var_list.base_names[i])" for i in var_inds
+        ]]
+        @test "bus 31_V" in header.names && "gen 1_ω" in header.names
+
+        # Columns match the full solution at the recorded steps of the solver
+        results = open_pf_binary(folder_path, "stream")
+        @test size(results.data) == (1 + writer.n_steps ÷ 2, length(variables) + 1)
+        steps = [findfirst(==(t), soln.t) for t in results["time"]]
+        @test !any(isnothing, steps)
+        for (j, var_ind) in enumerate(var_inds)
+            @test results[j+1] ≈ [soln.u[step][var_ind] for step in steps] atol = 1e-10
+        end
+    end
+end
+
+@testset "Simulation cache" begin
+    fresh = prepare_simulation(parse_network_json(IEEE39_FILE))
+    n_entries(cache) = length(RMSPowerSims.cache_entry_paths(cache))
+    cache_hit(cache, net) = !isnothing(RMSPowerSims.load_cache_entry(cache, RMSPowerSims.simulation_cache_key(net)))
+
+    mktempdir() do folder_path
+        cache = SimulationCache(folder_path; max_entries=3)
+
+        # Preparing a network adds its entry, and the alias of the prepared network data
+        net = parse_network_json(IEEE39_FILE)
+        @test !cache_hit(cache, net)
+        prepare_simulation(net; cache=cache)
+        @test n_entries(cache) == 2
+
+        # A cache hit gives the prepared simulation
+        net_cached = parse_network_json(IEEE39_FILE)
+        @test cache_hit(cache, net_cached)
+        cached = prepare_simulation(net_cached; cache=cache)
+        @test cached.u0 ≈ fresh.u0
+        @test cached.du0 ≈ fresh.du0
+        @test cached.power_system_model.variables.names == fresh.power_system_model.variables.names
+        @test cached.power_system_model.differential_vars == fresh.power_system_model.differential_vars
+        @test n_entries(cache) == 2
+
+        # The prepared network data hits the same entry
+        @test cache_hit(cache, net)
+        @test prepare_simulation(net; cache=cache).u0 ≈ fresh.u0
+        @test n_entries(cache) == 2
+
+        # Changing a parameter misses, and the least recently used entries are evicted
+        net_modified = parse_network_json(IEEE39_FILE)
+        net_modified["gen"]["1"]["dynamic_model"]["parameters"]["H"] *= 2
+        @test !cache_hit(cache, net_modified)
+        prepare_simulation(net_modified; cache=cache)
+        @test n_entries(cache) <= 3
+
+        # Invalidating with the prepared network data removes the entry and its alias
+        invalidate_cache!(cache, net_modified)
+        @test !cache_hit(cache, net_modified)
+        net_modified = parse_network_json(IEEE39_FILE)
+        net_modified["gen"]["1"]["dynamic_model"]["parameters"]["H"] *= 2
+        @test !cache_hit(cache, net_modified)
+
+        # Unreadable entries are removed
+        net_unreadable = parse_network_json(IEEE39_FILE)
+        path = RMSPowerSims.cache_entry_path(cache, RMSPowerSims.simulation_cache_key(net_unreadable))
+        write(path, "not a cache entry")
+        @test !cache_hit(cache, net_unreadable)
+        @test !isfile(path)
+
+        clear_cache!(cache)
+        @test n_entries(cache) == 0
+    end
+end
+
+@testset "Scenario sweeps" begin
+    power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE))
+    power_system_model = power_system_simulation.power_system_model
+    solver_settings = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+
+    # Scenario copies share no buffers or disturbance state with the original
+    scenario_simulation = scenario_copy(power_system_simulation)
+    scenario_model = scenario_simulation.power_system_model
+    for (original, copied) in zip(power_system_model.component_list, scenario_model.component_list)
+        @test copied.out_buf !== original.out_buf
+        @test copied.du_buf !== original.du_buf
+        @test copied.u_buf !== original.u_buf
+        @test copied.jacobian !== original.jacobian
+        @test !ismutable(copied.model) || copied.model !== original.model
+    end
+    @test scenario_model.applied_disturbances !== power_system_model.applied_disturbances
+    @test scenario_simulation.u0 !== power_system_simulation.u0
+    @test scenario_simulation.du0 !== power_system_simulation.du0
+
+    # Disturbances applied to a copy do not modify the original
+    scenario_simulation.disturbances = Disturbance[BusFault(16, 0.1), LoadStep(4, 0.1, 0.5)]
+    scenario_model = RMSPowerSims.group_disturbance_models!(scenario_simulation)
+    foreach(disturbance -> RMSPowerSims.apply_disturbance!(scenario_model, disturbance), scenario_simulation.disturbances)
+    @test isempty(power_system_model.applied_disturbances)
+    (u, du) = perturbed_state(power_system_simulation)
+    (out_original, out_copy) = (zeros(length(u)), zeros(length(u)))
+    RMSPowerSims.power_system_equations!(out_original, du, u, power_system_model, 0.0)
+    RMSPowerSims.power_system_equations!(out_copy, du, u, scenario_model, 0.0)
+    @test out_original != out_copy
+    RMSPowerSims.power_system_equations!(out_copy, du, u, scenario_copy(power_system_simulation).power_system_model, 0.0)
+    @test out_original == out_copy
+
+    # Threaded sweeps give the results of serial sweeps and of plain simulations of each scenario
+    scenarios = [
+        "fault bus $bus_ind" => Disturbance[
+            BusFault(bus_ind, 0.1, restart_simulation=true),
+            ClearBusFault(bus_ind, 0.2, restart_simulation=true),
+        ]
+        for bus_ind in (4, 16, 21, 26)
+    ]
+    summaries = Dict(
+        parallel => run_scenarios(power_system_simulation, scenarios, (0.0, 1.0); parallel=parallel, solver_settings...)
+        for parallel in (:threads, :serial)
+    )
+    for parallel in (:threads, :serial)
+        @test summaries[parallel].scenario == first.(scenarios)
+        for (i, (name, disturbances)) in enumerate(scenarios)
+            power_system_simulation.disturbances = disturbances
+            soln = run_RMS_simulation(power_system_simulation, (0.0, 1.0); verbose=false, solver_settings...)
+            expected = RMSPowerSims.scenario_summary(soln, power_system_simulation.power_system_model)
+            @test summaries[parallel][i, :retcode] == expected.retcode
+            for field in (:t_final, :V_min, :δ_spread_max)
+                @test summaries[parallel][i, field] ≈ expected[field] rtol = 1e-10
+            end
+        end
+    end
+    @test isempty(power_system_simulation.power_system_model.applied_disturbances)
+end
+
+@testset "Simulation profile" begin
+    profile = SimulationProfile()
+    power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE); profile=profile)
+    power_system_simulation.disturbances = Disturbance[LoadStep(4, 0.5, 0.5)]
+    tspan = (0.0, 1.0)
+    solver_settings = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+
+    # Profiling does not change the solution
+    soln = run_RMS_simulation(power_system_simulation, tspan; verbose=false, solver_settings...)
+    soln_profiled = run_RMS_simulation(power_system_simulation, tspan; profile=profile, verbose=false, solver_settings...)
+    @test soln_profiled.retcode == soln.retcode
+    @test soln_profiled.t ≈ soln.t
+    @test maximum(maximum(abs.(u_profiled .- u)) for (u_profiled, u) in zip(soln_profiled.u, soln.u)) < 1e-10
+
+    # Phases of the preparation and the simulation
+    for phase in ("load flow", "admittance matrix", "model build", "solve")
+        @test phase in profile.phases.phase
+    end
+    @test all(profile.phases.time .>= 0.0)
+
+    # Solver statistics of the single stage
+    @test size(profile.solver_statistics, 1) == 1
+    @test profile.solver_statistics.retcode[1] == string(soln.retcode)
+    @test profile.solver_statistics.residual_calls[1] > 0
+    @test profile.solver_statistics.accepted_steps[1] > 0
+
+    # Component timings of every component model type
+    timings = component_timings(profile)
+    for group in power_system_simulation.power_system_model.component_groups
+        row = findfirst(isequal(string(eltype(group.models))), timings.model_type)
+        @test !isnothing(row)
+        @test timings.components[row] == length(group.models)
+        @test timings.residual_calls[row] > 0
+        @test timings.jacobian_calls[row] > 0
+    end
+end
+
+@testset "Simulation results" begin
+    net = parse_network_json(IEEE39_FILE)
+    power_system_simulation = prepare_simulation(net)
+    power_system_simulation.disturbances = Disturbance[
+        BusFault(16, 0.1, restart_simulation=true),
+        ClearBusFault(16, 0.2, restart_simulation=true),
+    ]
+    soln = run_RMS_simulation(power_system_simulation, (0.0, 0.5); verbose=false, SOLVER_SETTINGS...)
+    var_list = power_system_simulation.power_system_model.variables
+
+    # Raw results of all stages
+    t_raw = reduce(vcat, [soln_instance.t for soln_instance in soln])
+    raw(var) = reduce(vcat, [[u[RMSPowerSims.find_variable_index(var_list, var)] for u in soln_instance.u] for soln_instance in soln])
+    raw_du(var) = reduce(vcat, [[du[RMSPowerSims.find_variable_index(var_list, var)] for du in soln_instance.du] for soln_instance in soln])
+
+    results = add_simulation_results!(net, soln)
+    @test results.t == t_raw
+    @test net["t_vec"] == t_raw
+    for var in ("V_31", "θ_16", "ω_1", "δ_5", "Pd_4")
+        @test results[var] == raw(var)
+    end
+    @test results["dδ_5"] == raw_du("δ_5")
+    @test result_variable(results, :bus, 31, "V") == raw("V_31")
+    @test isnothing(result_variable(results, "V_100"))
+    @test_throws KeyError results["V_100"]
+
+    # Results added to the network data
+    @test net["bus"]["31"]["sol"]["V"] == raw("V_31")
+    @test net["gen"]["1"]["sol"]["ω"] == raw("ω_1")
+
+    # DataFrames of the results
+    df_u = RMSPowerSims.get_res_u(net, soln)
+    df_du = RMSPowerSims.get_res_du(net, soln)
+    @test df_u.t == t_raw
+    @test df_u[!, "V_31"] == raw("V_31")
+    @test df_du[!, "dδ_5"] == raw_du("δ_5")
+
+    # Saved variables and decimation
+    decimated = SimulationResults(soln, var_list; save_variables=["V_31", "ω_1"], decimation=3)
+    offsets = cumsum([0; [length(soln_instance.t) for soln_instance in soln[1:end-1]]])
+    steps = reduce(vcat, [offset .+ (1:3:length(soln_instance.t)) for (offset, soln_instance) in zip(offsets, soln)])
+    @test decimated.variables.names == sort(["V_31", "ω_1"]; by=var -> RMSPowerSims.find_variable_index(var_list, var))
+    @test decimated.t == t_raw[steps]
+    @test decimated["V_31"] == raw("V_31")[steps]
+    @test decimated["ω_1"] == raw("ω_1")[steps]
+end
+
+@testset "PowerFactory results" begin
+    # Written by scripts/generate_pf_test_results.py: a ComRes csv export and the binary results
+    # of write_binary of the same simulation
+    folder_path = joinpath(@__DIR__, "data", "powerfactory_results")
+    header = read_pf_header(folder_path, "pf_results")
+    @test header.names[1:5] == ["time", "G 01_speed", "G 01_phi", "G 01_speed_dt", "G 02_speed"]
+    @test header.names[14] == "Load 01_Psum_bus1"
+    @test header.elements[18] == "AVR 02" && header.classes[18] == "ElmDsl"
+    @test length(header.names) == 19
+
+    # Chunked reads match a read in a single chunk
+    full = read_pf_results(folder_path, "pf_results")
+    @test size(full) == (51, 19)
+    @test full.time ≈ 0.0:0.01:0.5
+    @test read_pf_results(folder_path, "pf_results"; chunk_size=7) == full
+    columns = ["Bus 02_u1", "time", "AVR 02_xr"]
+    @test read_pf_results(folder_path, "pf_results"; columns=columns, chunk_size=5) == full[:, columns]
+    row_offsets = Int64[]
+    n_rows = foreach_pf_chunk(joinpath(folder_path, "pf_results.csv"), header; chunk_size=20) do chunk, row_offset
+        push!(row_offsets, row_offset)
+        @test chunk == Matrix(full[row_offset+1:row_offset+size(chunk, 1), :])
+    end
+    @test n_rows == 51
+    @test row_offsets == [0, 20, 40]
+
+    # The binary results of the Python side have the columns of the export, in the same order
+    binary = open_pf_binary(folder_path, "pf_results_bin")
+    @test names(binary) == header.names
+    @test binary.data == Matrix(full)
+    for (i, name) in enumerate(header.names)
+        @test binary[name] == binary[i] == full[!, name]
+    end
+
+    # Converting the export in chunks gives the same binary results
+    mktempdir() do out_folder_path
+        converted = convert_pf_results(folder_path, "pf_results", out_folder_path; chunk_size=7)
+        @test names(converted) == header.names
+        @test converted.data == binary.data
+        selected = convert_pf_results(folder_path, "pf_results", out_folder_path; out_file_name="selected", columns=columns, chunk_size=7)
+        @test names(selected) == ["time", "Bus 02_u1", "AVR 02_xr"]
+        @test selected.data == Matrix(full[:, ["time", "Bus 02_u1", "AVR 02_xr"]])
+    end
+end
+
+@testset "Disturbances at the start of the simulation" begin
+    power_system_simulation = prepare_simulation(parse_network_json(IEEE39_FILE))
+    variables = power_system_simulation.power_system_model.variables
+    tspan = (0.0, 1.0)
+    solver_settings = (reltol=1e-9, abstol=1e-8, maxiters=10000, dtmax=0.01)
+    t_common = 0.05:0.05:1.0
+
+    # A disturbance at tspan[1] is applied, as one shortly after the start
+    solns = Dict(
+        t_disturbance => begin
+            power_system_simulation.disturbances = Disturbance[LoadStep(4, t_disturbance, 0.5)]
+            run_RMS_simulation(power_system_simulation, tspan; event_handling=:integrator, verbose=false, solver_settings...)
+        end
+        for t_disturbance in (0.0, 1e-4)
+    )
+    @test solns[0.0].retcode == RMSPowerSims.ReturnCode.Success
+    for var in ("ω_1", "ω_5", "V_4", "Pd_4")
+        i = RMSPowerSims.find_variable_index(variables, var)
+        x = Dict(t_disturbance => interpolate(soln.t, [u[i] for u in soln.u], t_common) for (t_disturbance, soln) in solns)
+        @test maximum(abs.(x[0.0] .- x[1e-4])) < 1e-4
+    end
+    i = RMSPowerSims.find_variable_index(variables, "Pd_4")
+    @test solns[0.0].u[1][i] > power_system_simulation.u0[i] + 0.1
+
+    # and is applied to the scenarios of an ensemble
+    scenarios = [EnsembleScenario(disturbances=Disturbance[LoadStep(4, 0.0, 0.5)])]
+    results = run_ensemble(power_system_simulation, scenarios, tspan; ensemble=:serial, verbose=false, solver_settings...)
+    @test results.retcodes == ["Success"]
+    for var in ("ω_1", "V_4")
+        i = RMSPowerSims.find_variable_index(variables, var)
+        x_plain = interpolate(solns[0.0].t, [u[i] for u in solns[0.0].u], results.t)
+        @test maximum(abs.(results[var][:, 1] .- x_plain)) < 1e-5
+    end
+end